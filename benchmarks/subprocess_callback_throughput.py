@@ -0,0 +1,115 @@
+#
+# Benchmark the callback message transport of run_subprocess_with_callback
+# against a plain multiprocessing.Queue, which was the transport before the
+# batched Pipe transport.
+#
+#     python benchmarks/subprocess_callback_throughput.py
+#
+# Throughput: the subprocess calls the callback with a small message
+# as fast as it can. Reports messages per second received by the main process.
+#
+# Latency: the subprocess calls the callback with a timestamp every few
+# milliseconds. Reports the delay until the main process receives it.
+#
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import multiprocessing.queues
+import statistics
+import time
+import typing
+
+from edifice import run_subprocess_with_callback
+
+THROUGHPUT_MESSAGES = 200_000
+LATENCY_MESSAGES = 200
+LATENCY_INTERVAL = 0.005
+
+
+def subprocess_throughput(callback: typing.Callable[[int], None]) -> None:
+    for i in range(THROUGHPUT_MESSAGES):
+        callback(i)
+
+
+def subprocess_latency(callback: typing.Callable[[float], None]) -> None:
+    for _ in range(LATENCY_MESSAGES):
+        callback(time.time())
+        time.sleep(LATENCY_INTERVAL)
+
+
+def queue_subprocess(
+    subprocess: typing.Callable[[typing.Callable[..., None]], None],
+    callback_send: multiprocessing.queues.Queue,
+) -> None:
+    subprocess(lambda *args: callback_send.put((args, {})))
+    callback_send.put(None)
+
+
+def run_queue_baseline(
+    subprocess: typing.Callable[[typing.Callable[..., None]], None],
+    callback: typing.Callable[..., None],
+) -> None:
+    """
+    One multiprocessing.Queue put and get per callback message.
+    """
+    spawncontext = multiprocessing.get_context("spawn")
+    callback_send = spawncontext.Queue()
+    proc = spawncontext.Process(target=queue_subprocess, args=(subprocess, callback_send))
+    proc.start()
+    while (message := callback_send.get()) is not None:
+        args, kwargs = message
+        callback(*args, **kwargs)
+    proc.join()
+
+
+def report_throughput(name: str, elapsed: float, count: int) -> None:
+    assert count == THROUGHPUT_MESSAGES
+    print(f"{name:<30} {count / elapsed:>12,.0f} messages/s  ({elapsed:.2f}s including process start)")
+
+
+def report_latency(name: str, latencies: list[float]) -> None:
+    assert len(latencies) == LATENCY_MESSAGES
+    latencies_ms = sorted(x * 1000 for x in latencies)
+    p99 = latencies_ms[int(len(latencies_ms) * 0.99) - 1]
+    print(f"{name:<30} median {statistics.median(latencies_ms):.3f}ms  p99 {p99:.3f}ms")
+
+
+async def main() -> None:
+    count = 0
+
+    def count_callback(_: int) -> None:
+        nonlocal count
+        count += 1
+
+    latencies: list[float] = []
+
+    def latency_callback(sent: float) -> None:
+        latencies.append(time.time() - sent)
+
+    print("Throughput")
+
+    count = 0
+    start = time.perf_counter()
+    run_queue_baseline(subprocess_throughput, count_callback)
+    report_throughput("multiprocessing.Queue", time.perf_counter() - start, count)
+
+    count = 0
+    start = time.perf_counter()
+    await run_subprocess_with_callback(subprocess_throughput, count_callback)
+    report_throughput("run_subprocess_with_callback", time.perf_counter() - start, count)
+
+    print("Latency")
+
+    latencies = []
+    run_queue_baseline(subprocess_latency, latency_callback)
+    report_latency("multiprocessing.Queue", latencies)
+
+    latencies = []
+    await run_subprocess_with_callback(subprocess_latency, latency_callback)
+    report_latency("run_subprocess_with_callback", latencies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,10 +6,9 @@
 
 from __future__ import annotations  # noqa: I001
 
-import asyncio
+import functools
 import typing as tp
 from collections import OrderedDict
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
 import logging
 
@@ -187,21 +186,23 @@ def PlotDescriptor(
                                     )
 
 
-async def fetch_from_yahoo(fetch_executor: ThreadPoolExecutor, ticker: str) -> Failed | Received | NoData:
-    def fetcher():
-        t = yf.Ticker(ticker)
-        try:
-            longName = t.info["longName"]
-            history = t.history("1y")
-            if history.empty:
-                return NoData()
-            return Received(longName, history)
-        except KeyError:
+def fetch_from_yahoo(
+    ticker: str,
+    _callback: tp.Callable[[], None],
+    _cancel: ed.CancelToken,
+) -> Failed | Received | NoData:
+    # This function will run in a worker thread of the App thread pool.
+    t = yf.Ticker(ticker)
+    try:
+        longName = t.info["longName"]
+        history = t.history("1y")
+        if history.empty:
             return NoData()
-        except Exception as e:  # noqa: BLE001
-            return Failed(e)
-
-    return await asyncio.get_event_loop().run_in_executor(fetch_executor, fetcher)
+        return Received(longName, history)
+    except KeyError:
+        return NoData()
+    except Exception as e:  # noqa: BLE001
+        return Failed(e)
 
 
 # Finally, we create a component that contains the plot descriptions
@@ -251,14 +252,14 @@ def App(self, plot_colors: list[str], plot_color_background: str):
 
     tickers_fetched, tickers_fetched_set = ed.use_state(tp.cast(list[str], []))
 
-    fetch_executor = ed.use_memo(ThreadPoolExecutor)
+    run_thread = ed.use_thread()
 
     async def check_fetch_data():
         # If we need some ticker data and we haven't fetched it yet, then
         # fetch it.
         for ticker in [t for t in tickers_needed if t not in tickers_fetched]:
             tickers_fetched_set(lambda tr_old, ticker=ticker: [*tr_old, ticker])
-            result = await fetch_from_yahoo(fetch_executor, ticker)
+            result = await run_thread(functools.partial(fetch_from_yahoo, ticker), lambda: None)
             plot_data_set(lambda pltd, ticker=ticker, result=result: pltd | {ticker: result})
 
     ed.use_async(check_fetch_data, tickers_needed, max_concurrent=None)
@@ -37,6 +37,9 @@ from edifice.base_components import (
     TabView,
     TextInput,
     TextInputMultiline,
+    TiledImageFile,
+    TiledImageSource,
+    TiledImageView,
     VBoxView,
     VScrollView,
     Window,
@@ -46,24 +49,48 @@ from edifice.hooks import (
     provide_context,
     use_async,
     use_async_call,
+    use_async_iter,
     use_effect,
     use_effect_final,
     use_hover,
     use_memo,
+    use_memo_shared,
     use_ref,
     use_state,
     use_context,
     use_context_select,
+    use_disk_memo,
     use_palette_edifice,
+    use_subprocess_pool,
+    use_thread,
+    use_query,
+    use_sync_external_store,
+)
+from edifice.utilities import (
+    palette_edifice_dark,
+    palette_edifice_light,
+    set_trace,
+    theme_is_light,
+    run_subprocess_with_callback,
+    disk_memo,
+    SubprocessPool,
+    iterate_subprocess,
+    run_thread_with_callback,
+    CancelToken,
+    DiskMemoCache,
+    MemoCache,
+    QueryCache,
+    QueryResult,
 )
-from edifice.utilities import palette_edifice_dark, palette_edifice_light, set_trace, theme_is_light, run_subprocess_with_callback
 
 __all__ = [
     "App",
     "Button",
     "ButtonView",
+    "CancelToken",
     "CheckBox",
     "CustomWidget",
+    "DiskMemoCache",
     "Dropdown",
     "Element",
     "ExportList",
@@ -77,44 +104,61 @@ __all__ = [
     "Image",
     "ImageSvg",
     "Label",
+    "MemoCache",
     "ProgressBar",
     "PropsDict",
     "PropsDiff",
     "QtWidgetElement",
+    "QueryCache",
+    "QueryResult",
     "RadioButton",
     "Reference",
     "ScrollBar",
     "Slider",
     "SpinInput",
     "StackedView",
+    "SubprocessPool",
     "TabView",
     "TableGridRow",
     "TableGridView",
     "TextInput",
     "TextInputMultiline",
+    "TiledImageFile",
+    "TiledImageSource",
+    "TiledImageView",
     "VBoxView",
     "VScrollView",
     "Window",
     "WindowPopView",
     "child_place",
     "component",
+    "disk_memo",
+    "iterate_subprocess",
     "palette_edifice_dark",
     "palette_edifice_light",
     "provide_context",
     "qt_component",
     "run_subprocess_with_callback",
+    "run_thread_with_callback",
     "set_trace",
     "theme_is_light",
     "use_async",
     "use_async_call",
+    "use_async_iter",
     "use_context",
     "use_context_select",
+    "use_disk_memo",
     "use_effect",
     "use_effect_final",
     "use_hover",
     "use_memo",
+    "use_memo_shared",
     "use_palette_edifice",
+    "use_query",
     "use_ref",
     "use_state",
     "use_stop",
+    "use_subprocess_pool",
+    "use_sync_external_store",
+    "use_thread",
 ]
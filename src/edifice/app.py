@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import contextlib
 import os
 import queue
@@ -28,6 +29,7 @@ from qasync import QEventLoop
 from edifice.base_components import ExportList, Window
 from edifice.engine import Element, QtWidgetElement, RenderEngine, get_render_context_maybe
 from edifice.inspector import inspector as inspector_module
+from edifice.query_cache import QueryCache
 
 logger = _logger_module.logger
 
@@ -171,6 +173,12 @@ class App:
             (Default :code:`None`)
             The `QtWidgets.QApplication <https://doc.qt.io/qtforpython-6/PySide6/QtWidgets/QApplication.html>`_.
             If you do not provide one, it will be created for you.
+        max_thread_workers:
+            (Default :code:`None`)
+            The maximum number of threads in the :func:`App.thread_executor`
+            thread pool. The default is the
+            `ThreadPoolExecutor <https://docs.python.org/3/library/concurrent.futures.html#threadpoolexecutor>`_
+            default.
     """
 
     def __init__(
@@ -179,6 +187,7 @@ class App:
         inspector: bool = False,
         create_application: bool = True,
         qapplication: QtWidgets.QApplication | None = None,
+        max_thread_workers: int | None = None,
     ):
         if qapplication is None:
             if create_application:
@@ -258,6 +267,39 @@ class App:
         self._is_rerendering = False
         self._rerender_wanted: bool = False
 
+        self._max_thread_workers = max_thread_workers
+        self._thread_executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._query_cache: QueryCache | None = None
+
+    @property
+    def thread_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        The bounded thread pool of the :class:`App`, shared by all of the
+        :func:`use_thread` Hooks.
+
+        The thread pool is created when it is first used and shut down when
+        the :class:`App` stops.
+        """
+        if self._thread_executor is None:
+            self._thread_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_thread_workers,
+                thread_name_prefix="edifice_thread",
+            )
+        return self._thread_executor
+
+    @property
+    def query_cache(self) -> QueryCache:
+        """
+        The :class:`QueryCache` of the :class:`App`, shared by all of the
+        :func:`use_query` Hooks.
+
+        Use it to :func:`QueryCache.invalidate` or :func:`QueryCache.set_data`
+        from outside of a :func:`@component<edifice.component>`.
+        """
+        if self._query_cache is None:
+            self._query_cache = QueryCache()
+        return self._query_cache
+
     def __hash__(self):
         return id(self)
 
@@ -417,6 +459,12 @@ class App:
                 for component in to_delete:
                     del engine._hook_async[component]
                 await asyncio.sleep(0.0)
+            if self._query_cache is not None:
+                await self._query_cache.aclose()
+            if self._thread_executor is not None:
+                # The use_thread CancelTokens have been cancelled. Don't wait
+                # for threads which do not check their CancelToken.
+                self._thread_executor.shutdown(wait=False, cancel_futures=True)
 
         loop.run_until_complete(app_run())
 
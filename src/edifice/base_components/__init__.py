@@ -31,6 +31,7 @@ from .radio_button import RadioButton
 from .scroll_bar import ScrollBar
 from .spin_input import SpinInput
 from .table_grid_view import TableGridRow, TableGridView
+from .tiled_image_view import TiledImageFile, TiledImageSource, TiledImageView
 
 __all__ = [
     "Button",
@@ -61,6 +62,9 @@ __all__ = [
     "TableGridView",
     "TextInput",
     "TextInputMultiline",
+    "TiledImageFile",
+    "TiledImageSource",
+    "TiledImageView",
     "VBoxView",
     "VScrollView",
     "Window",
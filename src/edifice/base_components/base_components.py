@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import functools
 import importlib.resources
 import logging
 import re
 import typing as tp
 
 import edifice.icons
+from edifice.base_components.image_cache import _image_cache, _svg_raster, _svg_renderer, _svg_source_key
 from edifice.engine import (
     _CURSORS,
     CommandType,
@@ -23,9 +23,12 @@ from edifice.qt import QT_VERSION
 ICONS = importlib.resources.files(edifice.icons)
 
 if QT_VERSION == "PyQt6" and not tp.TYPE_CHECKING:
-    from PyQt6 import QtCore, QtGui, QtSvg, QtSvgWidgets, QtWidgets
+    from PyQt6 import QtCore, QtGui, QtWidgets
 else:
-    from PySide6 import QtCore, QtGui, QtSvg, QtSvgWidgets, QtWidgets
+    from PySide6 import QtCore, QtGui, QtWidgets
+
+if tp.TYPE_CHECKING:
+    from PySide6 import QtSvg
 
 logger = logging.getLogger("Edifice")
 
@@ -37,9 +40,8 @@ RGBAType = tuple[int, int, int, int]
 _T_boxlayout = tp.TypeVar("_T_boxlayout", bound=QtWidgets.QBoxLayout)
 
 
-@functools.lru_cache(30)
 def _get_image(path) -> QtGui.QPixmap:
-    return QtGui.QPixmap(path)
+    return _image_cache.get(path)
 
 
 def _image_descriptor_to_pixmap(inp: str | QtGui.QImage | QtGui.QPixmap) -> QtGui.QPixmap:
@@ -51,31 +53,76 @@ def _image_descriptor_to_pixmap(inp: str | QtGui.QImage | QtGui.QPixmap) -> QtGu
     return _get_image(inp)
 
 
-@functools.lru_cache(100)
-def _get_svg_image_raw(icon_path, size: int) -> QtGui.QPixmap:
-    svg_renderer = QtSvg.QSvgRenderer(icon_path)
-    image = QtGui.QImage(size, size, QtGui.QImage.Format.Format_ARGB32)
-    image.fill(0x00000000)
-    svg_renderer.render(QtGui.QPainter(image))
-    return QtGui.QPixmap.fromImage(image)
+def _get_svg_image(icon_path, size: int, rotation=0, color=(0, 0, 0, 255)) -> QtGui.QPixmap:
+    return _svg_raster(
+        _svg_source_key(icon_path),
+        size,
+        size,
+        color=None if color == (0, 0, 0, 255) else QtGui.QColor(*color),
+        rotation=rotation,
+    )
 
 
-@functools.lru_cache(100)
-def _get_svg_image(icon_path, size: int, rotation=0, color=(0, 0, 0, 255)) -> QtGui.QPixmap:
-    pixmap = _get_svg_image_raw(icon_path, size)
-    if color == (0, 0, 0, 255) and rotation == 0:
-        return pixmap
-    pixmap = pixmap.copy()
-    if color != (0, 0, 0, 255):
-        mask = pixmap.mask()
-        pixmap.fill(QtGui.QColor(*color))  # TODO this messes up the alpha channel edges
-        pixmap.setMask(mask)
-    if rotation != 0:
-        w, h = pixmap.width(), pixmap.height()
-        pixmap = pixmap.transformed(QtGui.QTransform().rotate(rotation))
-        new_w, new_h = pixmap.width(), pixmap.height()
-        pixmap = pixmap.copy((new_w - w) // 2, (new_h - h) // 2, w, h)
-    return pixmap
+class _SvgWidget(QtWidgets.QWidget):
+    """
+    Paints an SVG from the shared raster cache instead of owning a QSvgRenderer.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._src: str | bytes | None = None
+        self._color: QtGui.QColor | None = None
+        self._rotation: float = 0.0
+        self._renderer: QtSvg.QSvgRenderer | None = None
+        """
+        The renderer of an animated SVG, connected to update().
+        """
+
+    def _setSvg(self, src: str | bytes, color: QtGui.QColor | None, rotation: float):
+        if self._renderer is not None:
+            # Disconnect from the renderer which we connected to, because the
+            # shared renderer cache may have evicted it.
+            self._renderer.repaintNeeded.disconnect(self.update)
+            self._renderer = None
+        self._src = src
+        self._color = color
+        self._rotation = rotation
+        renderer = _svg_renderer(src)
+        if renderer.animated():
+            renderer.repaintNeeded.connect(self.update)
+            self._renderer = renderer
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self) -> QtCore.QSize:
+        if self._src is None:
+            return super().sizeHint()
+        return _svg_renderer(self._src).defaultSize()
+
+    def paintEvent(self, event: QtGui.QPaintEvent):  # noqa: ARG002
+        painter = QtGui.QPainter(self)
+        # Paint the style sheet background and border.
+        option = QtWidgets.QStyleOption()
+        option.initFrom(self)
+        self.style().drawPrimitive(QtWidgets.QStyle.PrimitiveElement.PE_Widget, option, painter, self)
+        if self._src is not None and self.width() > 0 and self.height() > 0:
+            if self._renderer is not None:
+                # Animated frames change, so do not cache them.
+                self._renderer.render(painter, QtCore.QRectF(self.rect()))
+            else:
+                painter.drawPixmap(
+                    0,
+                    0,
+                    _svg_raster(
+                        self._src,
+                        self.width(),
+                        self.height(),
+                        self.devicePixelRatioF(),
+                        self._color,
+                        self._rotation,
+                    ),
+                )
+        painter.end()
 
 
 class Button(QtWidgetElement[QtWidgets.QPushButton]):
@@ -339,12 +386,12 @@ class Label(QtWidgetElement[QtWidgets.QLabel]):
         return commands
 
 
-class ImageSvg(QtWidgetElement[QtSvgWidgets.QSvgWidget]):
+class ImageSvg(QtWidgetElement[_SvgWidget]):
     """Render an SVG image.
 
     .. highlights::
 
-        - Underlying Qt Widget `QSvgWidget <https://doc.qt.io/qtforpython-6/PySide6/QtSvgWidgets/QSvgWidget.html>`_
+        - Underlying Qt Widget `QWidget <https://doc.qt.io/qtforpython-6/PySide6/QtWidgets/QWidget.html>`_
 
     .. rubric:: Props
 
@@ -355,6 +402,18 @@ class ImageSvg(QtWidgetElement[QtSvgWidgets.QSvgWidget]):
             Either a path to an SVG image file, or a
             `QByteArray <https://doc.qt.io/qtforpython-6/PySide6/QtCore/QByteArray.html>`_
             containing the XML string of an SVG file.
+        color:
+            Tint every painted pixel of the SVG with this color, preserving
+            the alpha channel. Useful for monochrome icons.
+        rotation:
+            Rotate the SVG about its center by this many degrees.
+
+    Each SVG source is parsed once by a
+    `QSvgRenderer <https://doc.qt.io/qtforpython-6/PySide6/QtSvg/QSvgRenderer.html>`_
+    which is shared by all :class:`ImageSvg` with the same :code:`src`.
+    The rasterized image is cached for each size, device pixel ratio,
+    color, and rotation, so an icon which is shown many times
+    is only rasterized once.
 
     .. rubric:: Usage
 
@@ -388,6 +447,11 @@ class ImageSvg(QtWidgetElement[QtSvgWidgets.QSvgWidget]):
     There is also a copy of some Font Awesome icons
     `in the Edifice package <https://github.com/pyedifice/pyedifice/tree/master/src/edifice/icons/font-awesome>`_,
     for convenience.
+    The rasterized images of these bundled icons at the usual icon sizes are
+    also cached on disk in the user cache directory, so they are not
+    rasterized again on the next run.
+    Set the environment variable :code:`EDIFICE_ICON_CACHE_DIR` to choose another
+    cache directory, or to the empty string to disable the disk cache.
 
     .. code-block:: python
         :caption: Example Font Awesome Share Icon
@@ -400,17 +464,25 @@ class ImageSvg(QtWidgetElement[QtSvgWidgets.QSvgWidget]):
     .. figure:: /image/button_view.png
     """
 
-    def __init__(self, src: str | QtCore.QByteArray, **kwargs):
+    def __init__(
+        self,
+        src: str | QtCore.QByteArray,
+        color: QtGui.QColor | None = None,
+        rotation: float = 0.0,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._register_props(
             {
                 "src": src,
+                "color": color,
+                "rotation": rotation,
             },
         )
         self._register_props(kwargs)
 
     def _initialize(self):
-        self.underlying = QtSvgWidgets.QSvgWidget()
+        self.underlying = _SvgWidget()
         self.underlying.setObjectName(str(id(self)))
 
     def _qt_update_commands(
@@ -422,9 +494,15 @@ class ImageSvg(QtWidgetElement[QtSvgWidgets.QSvgWidget]):
             self._initialize()
         assert self.underlying is not None
         commands = super()._qt_update_commands_super(widget_trees, diff_props, self.underlying, None)
-        match diff_props.get("src"):
-            case _, propsnew:
-                commands.append(CommandType(self.underlying.load, propsnew))
+        if "src" in diff_props or "color" in diff_props or "rotation" in diff_props:
+            commands.append(
+                CommandType(
+                    self.underlying._setSvg,
+                    _svg_source_key(self.props["src"]),
+                    self.props["color"],
+                    self.props["rotation"],
+                ),
+            )
         return commands
 
 
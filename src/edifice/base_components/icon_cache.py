@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import collections
+import hashlib
+import importlib.metadata
+import importlib.resources
+import logging
+import os
+import shutil
+import tempfile
+import time
+import typing as tp
+
+import edifice.icons
+from edifice.qt import QT_VERSION
+
+if QT_VERSION == "PyQt6" and not tp.TYPE_CHECKING:
+    from PyQt6 import QtCore, QtGui
+else:
+    from PySide6 import QtCore, QtGui
+
+logger = logging.getLogger("Edifice")
+
+ICONS_DIR = os.path.realpath(str(importlib.resources.files(edifice.icons)))
+
+_CACHE_DIR_PREFIX = "icons-"
+_FILE_SUFFIX = ".argb32"
+
+ICON_CACHE_MAX_FILES_DEFAULT = 2048
+ICON_CACHE_MAX_AGE_DEFAULT = 30 * 24 * 60 * 60
+"""
+Seconds after which an unused cache directory of another version is deleted.
+"""
+
+ICON_CACHE_SIZES = frozenset((12, 16, 18, 20, 24, 32, 48, 64))
+"""
+Only rasters of these logical sizes are persisted, so that resizing a
+widget does not write a new file for every size.
+"""
+
+
+def _cache_version() -> str:
+    """
+    Rasters are only valid for the same bundled icons and the same SVG renderer,
+    so the cache is versioned by the Edifice version and the Qt version.
+    """
+    try:
+        edifice_version = importlib.metadata.version("pyedifice")
+    except importlib.metadata.PackageNotFoundError:
+        edifice_version = "unknown"
+    return f"{edifice_version}-{QT_VERSION}-{QtCore.qVersion()}"
+
+
+def _default_cache_dir() -> str | None:
+    """
+    The directory of the icon cache, or None if the cache is disabled.
+
+    Set the environment variable :code:`EDIFICE_ICON_CACHE_DIR` to
+    choose another directory, or to the empty string to disable the cache.
+    """
+    directory = os.environ.get("EDIFICE_ICON_CACHE_DIR")
+    if directory is None:
+        location = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.GenericCacheLocation)
+        if not location:
+            return None
+        directory = os.path.join(location, "edifice")
+    if directory == "":
+        return None
+    return directory
+
+
+def _bundled_icon_path(src: str | bytes) -> str | None:
+    """
+    If src is the path of an icon bundled in the edifice.icons package,
+    return the path relative to the package. Otherwise None.
+    """
+    if not isinstance(src, str):
+        return None
+    path = os.path.realpath(src)
+    if os.path.commonpath([path, ICONS_DIR]) != ICONS_DIR:
+        return None
+    return os.path.relpath(path, ICONS_DIR).replace(os.sep, "/")
+
+
+def _image_bytes(image: QtGui.QImage) -> bytes:
+    bits = image.constBits()
+    if hasattr(bits, "setsize"):
+        # PyQt6 sip.voidptr
+        bits.setsize(image.sizeInBytes())
+    return bytes(bits)
+
+
+class _IconDiskCache:
+    """
+    Persistent cache of rasterized bundled icons.
+
+    Each raster is one file of raw premultiplied ARGB32 pixels, named
+    :code:`<sha1 of key>_<width>x<height>.argb32`, in a directory for the
+    current :func:`_cache_version`.
+
+    Directories for other versions may belong to another Qt binding or
+    another Edifice installation which shares the user cache, so they are
+    only deleted after they have not been used for :code:`max_age` seconds.
+
+    On first use only the file names are listed. The pixels of each raster
+    are read when the raster is first requested. When there are more than
+    :code:`max_files` rasters, the least recently written are deleted.
+    """
+
+    def __init__(
+        self,
+        directory: str | None,
+        max_files: int = ICON_CACHE_MAX_FILES_DEFAULT,
+        max_age: float = ICON_CACHE_MAX_AGE_DEFAULT,
+    ):
+        self._parent_directory = directory
+        self._max_files = max_files
+        self._max_age = max_age
+        self._directory: str | None = None
+        self._index: collections.OrderedDict[str, str] | None = None
+        """
+        digest → file name, ordered from least to most recently written.
+        """
+
+    def _load(self) -> collections.OrderedDict[str, str]:
+        if self._index is not None:
+            return self._index
+        self._index = collections.OrderedDict()
+        if self._parent_directory is None:
+            return self._index
+        version_dir = _CACHE_DIR_PREFIX + _cache_version()
+        try:
+            os.makedirs(self._parent_directory, exist_ok=True)
+            self._directory = os.path.join(self._parent_directory, version_dir)
+            os.makedirs(self._directory, exist_ok=True)
+            # Mark this version directory as used.
+            os.utime(self._directory)
+            now = time.time()
+            for entry in os.scandir(self._parent_directory):
+                if (
+                    entry.name.startswith(_CACHE_DIR_PREFIX)
+                    and entry.name != version_dir
+                    and now - entry.stat().st_mtime > self._max_age
+                ):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            files = [
+                (entry.stat().st_mtime, entry.name)
+                for entry in os.scandir(self._directory)
+                if entry.name.endswith(_FILE_SUFFIX)
+            ]
+        except OSError:
+            logger.debug("Icon cache unavailable in %s", self._parent_directory, exc_info=True)
+            self._directory = None
+            return self._index
+        for _, name in sorted(files):
+            digest, _, _ = name.partition("_")
+            self._index[digest] = name
+        self._evict()
+        return self._index
+
+    def _evict(self):
+        assert self._index is not None
+        while len(self._index) > self._max_files:
+            _, name = self._index.popitem(last=False)
+            if self._directory is not None:
+                try:
+                    os.remove(os.path.join(self._directory, name))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha1(key.encode()).hexdigest()  # noqa: S324
+
+    def get(self, key: str) -> QtGui.QImage | None:
+        index = self._load()
+        digest = self._digest(key)
+        name = index.get(digest)
+        if name is None or self._directory is None:
+            return None
+        try:
+            width, height = (int(n) for n in name.removesuffix(_FILE_SUFFIX).partition("_")[2].split("x"))
+            with open(os.path.join(self._directory, name), "rb") as f:
+                pixels = f.read()
+        except (OSError, ValueError):
+            logger.debug("Failed to read icon cache %s", name, exc_info=True)
+            index.pop(digest, None)
+            return None
+        if len(pixels) != width * height * 4:
+            index.pop(digest, None)
+            return None
+        return QtGui.QImage(pixels, width, height, width * 4, QtGui.QImage.Format.Format_ARGB32_Premultiplied).copy()
+
+    def put(self, key: str, image: QtGui.QImage):
+        index = self._load()
+        if self._directory is None:
+            return
+        image = image.convertToFormat(QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+        digest = self._digest(key)
+        name = f"{digest}_{image.width()}x{image.height()}{_FILE_SUFFIX}"
+        try:
+            # Write to a temporary file and rename, so that another process
+            # never reads a partial file.
+            fd, temp_path = tempfile.mkstemp(dir=self._directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(_image_bytes(image))
+            os.replace(temp_path, os.path.join(self._directory, name))
+        except OSError:
+            logger.debug("Failed to write icon cache %s", name, exc_info=True)
+            return
+        index.pop(digest, None)
+        index[digest] = name
+        self._evict()
+
+
+_icon_disk_cache: _IconDiskCache | None = None
+
+
+def _get_icon_disk_cache() -> _IconDiskCache:
+    global _icon_disk_cache  # noqa: PLW0603
+    if _icon_disk_cache is None:
+        _icon_disk_cache = _IconDiskCache(_default_cache_dir())
+    return _icon_disk_cache
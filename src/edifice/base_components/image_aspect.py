@@ -11,6 +11,12 @@ else:
 
 
 from .base_components import CommandType, Element, QtWidgetElement, _image_descriptor_to_pixmap, _WidgetTree
+from .image_cache import _image_cache, _scaled_cache
+
+_RESIZE_SETTLE_MS = 150
+"""
+After an interactive resize has been quiet for this long, rescale smoothly.
+"""
 
 if tp.TYPE_CHECKING:
     from edifice.engine import PropsDiff
@@ -25,24 +31,56 @@ class _ScaledLabel(QtWidgets.QLabel):
         QtWidgets.QLabel.__init__(self)
         self._pixmap: QtGui.QPixmap | None = None
         self._aspect_ratio_mode: QtCore.Qt.AspectRatioMode | None = None
+        self._source: str | QtGui.QImage | QtGui.QPixmap | None = None
+        self._loaded: bool = False
+        """
+        True if the pixmap of the _source is shown, False while showing the placeholder.
+        """
+        self._settle_timer = QtCore.QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.timeout.connect(self._rescale)
         self._rescale()
 
     def resizeEvent(self, event):  # noqa: ARG002
-        self._rescale()
+        if self._aspect_ratio_mode is None:
+            return
+        # During an interactive resize, rescale with the fast transformation,
+        # then rescale smoothly when the resizing stops.
+        self._rescale(fast=True)
+        self._settle_timer.start(_RESIZE_SETTLE_MS)
+
+    def _scaled(self, aspect_ratio_mode: QtCore.Qt.AspectRatioMode, fast: bool) -> QtGui.QPixmap:
+        """
+        Scale the pixmap to the frame size in device pixels.
+
+        Smoothly scaled pixmaps are shared with other labels through _scaled_cache.
+        """
+        assert self._pixmap is not None
+        ratio = self.devicePixelRatioF()
+        size = self.frameSize()
+        key = (self._pixmap.cacheKey(), size.width(), size.height(), aspect_ratio_mode, ratio)
+        entry = _scaled_cache.get(key)
+        if entry is not None:
+            return entry[0]
+        scaled = self._pixmap.scaled(
+            size * ratio,
+            aspect_ratio_mode,
+            QtCore.Qt.TransformationMode.FastTransformation
+            if fast
+            else QtCore.Qt.TransformationMode.SmoothTransformation,
+        )
+        scaled.setDevicePixelRatio(ratio)
+        if not fast:
+            _scaled_cache.put(key, scaled)
+        return scaled
 
-    def _rescale(self):
+    def _rescale(self, fast: bool = False):
         if self._pixmap is not None:
             match self._aspect_ratio_mode:
                 case None:
                     self.setPixmap(self._pixmap)
                 case aspect_ratio_mode:
-                    self.setPixmap(
-                        self._pixmap.scaled(
-                            self.frameSize(),
-                            aspect_ratio_mode,
-                            QtCore.Qt.TransformationMode.SmoothTransformation,
-                        ),
-                    )
+                    self.setPixmap(self._scaled(aspect_ratio_mode, fast))
 
     def _setPixmap(self, pixmap: QtGui.QPixmap):
         if not pixmap:
@@ -50,6 +88,45 @@ class _ScaledLabel(QtWidgets.QLabel):
         self._pixmap = pixmap
         self._rescale()
 
+    def _setSource(
+        self,
+        src: str | QtGui.QImage | QtGui.QPixmap,
+        placeholder: str | QtGui.QImage | QtGui.QPixmap | None,
+    ):
+        self._source = src
+        if not isinstance(src, str):
+            self._loaded = True
+            self._setPixmap(_image_descriptor_to_pixmap(src))
+            return
+        pixmap = _image_cache.get_async(src, lambda pixmap: self._onLoaded(src, pixmap))
+        if pixmap is not None:
+            self._loaded = True
+            self._setPixmap(pixmap)
+        else:
+            self._loaded = False
+            self._setPlaceholder(placeholder)
+
+    def _setPlaceholder(self, placeholder: str | QtGui.QImage | QtGui.QPixmap | None):
+        if self._loaded:
+            return
+        if placeholder is not None:
+            self._setPixmap(_image_descriptor_to_pixmap(placeholder))
+        else:
+            self._pixmap = None
+            self.clear()
+
+    def _onLoaded(self, src: str, pixmap: QtGui.QPixmap):
+        if self._source is not src:
+            # The src changed while this image was loading.
+            return
+        try:
+            if pixmap:
+                self._loaded = True
+            self._setPixmap(pixmap)
+        except RuntimeError:
+            # The widget was deleted while this image was loading.
+            pass
+
     def _setAspectRatioMode(self, aspect_ratio_mode: QtCore.Qt.AspectRatioMode | None):
         self._aspect_ratio_mode = aspect_ratio_mode
         self._rescale()
@@ -70,7 +147,8 @@ class Image(QtWidgetElement):
         src:
             One of:
 
-            * A path to an image file.
+            * A path to an image file. The file is decoded in a worker thread
+              and cached, see below.
             * A `QImage <https://doc.qt.io/qtforpython-6/PySide6/QtGui/QImage.html>`_.
             * A `QPixmap <https://doc.qt.io/qtforpython-6/PySide6/QtGui/QPixmap.html>`_.
         aspect_ratio_mode:
@@ -80,6 +158,19 @@ class Image(QtWidgetElement):
             * An
               `AspectRatioMode <https://doc.qt.io/qtforpython-6/PySide6/QtCore/Qt.html#PySide6.QtCore.Qt.AspectRatioMode>`_
               to specify how the image should scale.
+        placeholder:
+            An image to show while the :code:`src` image file is loading.
+            Same types as :code:`src`. If :code:`None`, nothing is shown while loading.
+
+    .. rubric:: Image file cache
+
+    Image files are decoded by
+    `QImageReader <https://doc.qt.io/qtforpython-6/PySide6/QtGui/QImageReader.html>`_
+    in a thread pool, so large images do not block the app.
+
+    Decoded images are cached by path, with least-recently-used eviction
+    when the total size of the cache exceeds 256 MB. A cached image is
+    reloaded if the modification time of its file changes.
 
     .. rubric:: Usage
 
@@ -91,6 +182,7 @@ class Image(QtWidgetElement):
         self,
         src: str | QtGui.QImage | QtGui.QPixmap,
         aspect_ratio_mode: None | QtCore.Qt.AspectRatioMode = None,
+        placeholder: str | QtGui.QImage | QtGui.QPixmap | None = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -98,6 +190,7 @@ class Image(QtWidgetElement):
             {
                 "src": src,
                 "aspect_ratio_mode": aspect_ratio_mode,
+                "placeholder": placeholder,
             },
         )
         self.underlying: _ScaledLabel | None = None
@@ -118,7 +211,11 @@ class Image(QtWidgetElement):
         commands = super()._qt_update_commands_super(widget_trees, diff_props, self.underlying, None)
         match diff_props.get("src"):
             case _, propnew:
-                commands.append(CommandType(self.underlying._setPixmap, _image_descriptor_to_pixmap(propnew)))
+                commands.append(CommandType(self.underlying._setSource, propnew, self.props["placeholder"]))
+        match diff_props.get("placeholder"):
+            case _, propnew if "src" not in diff_props:
+                # The src image may still be loading.
+                commands.append(CommandType(self.underlying._setPlaceholder, propnew))
         match diff_props.get("aspect_ratio_mode"):
             case _, propnew:
                 commands.append(CommandType(self.underlying._setAspectRatioMode, propnew))
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import functools
+import logging
+import os
+import typing as tp
+
+from edifice.base_components.icon_cache import ICON_CACHE_SIZES, _bundled_icon_path, _get_icon_disk_cache
+from edifice.qt import QT_VERSION
+
+if QT_VERSION == "PyQt6" and not tp.TYPE_CHECKING:
+    from PyQt6 import QtCore, QtGui, QtSvg
+else:
+    from PySide6 import QtCore, QtGui, QtSvg
+
+logger = logging.getLogger("Edifice")
+
+IMAGE_CACHE_MAX_BYTES_DEFAULT = 256 * 1024 * 1024
+SCALED_CACHE_MAX_BYTES_DEFAULT = 64 * 1024 * 1024
+SVG_CACHE_MAX_BYTES_DEFAULT = 32 * 1024 * 1024
+
+_K = tp.TypeVar("_K", bound=tp.Hashable)
+
+
+def _file_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        # For example a Qt resource path like ":/icon.png".
+        return None
+
+
+def _decode_image(path: str) -> QtGui.QImage:
+    """
+    Decode an image file. Safe to call from a worker thread, because
+    QImage, unlike QPixmap, is not tied to the GUI thread.
+    """
+    reader = QtGui.QImageReader(path)
+    reader.setAutoTransform(True)
+    image = reader.read()
+    if image.isNull():
+        logger.warning("Failed to load image %s: %s", path, reader.errorString())
+    return image
+
+
+def _pixmap_bytes(pixmap: QtGui.QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+
+class _ImageLoadedEvent(QtCore.QEvent):
+    event_type = QtCore.QEvent.Type(QtCore.QEvent.registerEventType())
+
+    def __init__(self, path: str, mtime: int | None, image: QtGui.QImage):
+        super().__init__(self.event_type)
+        self.path = path
+        self.mtime = mtime
+        self.image = image
+
+
+class _ImageLoadedReceiver(QtCore.QObject):
+    """
+    Lives in the GUI thread and receives the images decoded by the worker threads.
+    """
+
+    def __init__(self, cache: _ImageCache):
+        super().__init__()
+        self._cache = cache
+
+    def event(self, event: QtCore.QEvent) -> bool:
+        if isinstance(event, _ImageLoadedEvent):
+            self._cache._on_loaded(event.path, event.mtime, event.image)
+            return True
+        return super().event(event)
+
+
+class _PixmapLRU(tp.Generic[_K]):
+    """
+    LRU cache of pixmaps which evicts the least recently used pixmaps when
+    the total size of the cached pixmaps exceeds :code:`max_bytes`, so one
+    huge image counts the same as many thumbnails of the same total size.
+
+    Each entry also stores a :code:`tag` which the caller can use to
+    validate the entry.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: collections.OrderedDict[_K, tuple[QtGui.QPixmap, tp.Any, int]] = collections.OrderedDict()
+        """
+        key → (pixmap, tag, bytes). Ordered from least to most recently used.
+        """
+        self._total_bytes: int = 0
+
+    def get(self, key: _K) -> tuple[QtGui.QPixmap, tp.Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0], entry[1]
+
+    def put(self, key: _K, pixmap: QtGui.QPixmap, tag: tp.Any = None):
+        self.remove(key)
+        nbytes = _pixmap_bytes(pixmap)
+        if nbytes > self.max_bytes or pixmap.isNull():
+            return
+        self._entries[key] = (pixmap, tag, nbytes)
+        self._total_bytes += nbytes
+        while self._total_bytes > self.max_bytes:
+            self.remove(next(iter(self._entries)))
+
+    def remove(self, key: _K):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def clear(self):
+        self._entries.clear()
+        self._total_bytes = 0
+
+
+class _ImageCache:
+    """
+    :class:`_PixmapLRU` of decoded image files, keyed by path.
+
+    An entry is invalidated when the modification time of its file changes.
+
+    All methods must be called from the GUI thread.
+    """
+
+    def __init__(self, max_bytes: int = IMAGE_CACHE_MAX_BYTES_DEFAULT, max_workers: int = 4):
+        self._lru: _PixmapLRU[str] = _PixmapLRU(max_bytes)
+        self._max_workers = max_workers
+        self._pending: dict[str, list[tp.Callable[[QtGui.QPixmap], None]]] = {}
+        """
+        path → callbacks waiting for the decode of that path in a worker thread.
+        """
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._receiver: _ImageLoadedReceiver | None = None
+
+    def _get_fresh(self, path: str, mtime: int | None) -> QtGui.QPixmap | None:
+        entry = self._lru.get(path)
+        if entry is None:
+            return None
+        pixmap, mtime_cached = entry
+        if mtime_cached != mtime:
+            self._lru.remove(path)
+            return None
+        return pixmap
+
+    def get(self, path: str) -> QtGui.QPixmap:
+        """
+        Get the image synchronously, decoding it on this thread if it is not cached.
+        """
+        mtime = _file_mtime(path)
+        pixmap = self._get_fresh(path, mtime)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap.fromImage(_decode_image(path))
+            self._lru.put(path, pixmap, mtime)
+        return pixmap
+
+    def get_async(self, path: str, callback: tp.Callable[[QtGui.QPixmap], None]) -> QtGui.QPixmap | None:
+        """
+        If the image is cached, return it.
+
+        Otherwise return :code:`None`, decode the image in a worker thread,
+        and later call :code:`callback` with the image in the GUI thread.
+        Concurrent requests for the same path share one decode.
+        """
+        mtime = _file_mtime(path)
+        pixmap = self._get_fresh(path, mtime)
+        if pixmap is not None:
+            return pixmap
+        if path in self._pending:
+            self._pending[path].append(callback)
+            return None
+        self._pending[path] = [callback]
+        if self._receiver is None:
+            self._receiver = _ImageLoadedReceiver(self)
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="edifice_image",
+            )
+        receiver = self._receiver
+
+        def _load():
+            QtCore.QCoreApplication.postEvent(receiver, _ImageLoadedEvent(path, mtime, _decode_image(path)))
+
+        self._executor.submit(_load)
+        return None
+
+    def _on_loaded(self, path: str, mtime: int | None, image: QtGui.QImage):
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self._lru.put(path, pixmap, mtime)
+        for callback in self._pending.pop(path, []):
+            callback(pixmap)
+
+    def clear(self):
+        self._lru.clear()
+
+
+_image_cache = _ImageCache()
+"""
+The process-wide cache of image files for :class:`edifice.Image` and window icons.
+"""
+
+_scaled_cache: _PixmapLRU[tuple[int, int, int, QtCore.Qt.AspectRatioMode, float]] = _PixmapLRU(
+    SCALED_CACHE_MAX_BYTES_DEFAULT,
+)
+"""
+The process-wide cache of smoothly scaled pixmaps for :class:`edifice.Image`,
+keyed by (source pixmap cacheKey, width, height, aspect ratio mode, device pixel ratio).
+"""
+
+
+SvgSourceKey = str | bytes
+"""
+A path to an SVG file, or the bytes of an SVG file.
+"""
+
+
+def _svg_source_key(src: str | QtCore.QByteArray) -> SvgSourceKey:
+    return src if isinstance(src, str) else bytes(src.data())
+
+
+@functools.lru_cache(256)
+def _svg_renderer(src: SvgSourceKey) -> QtSvg.QSvgRenderer:
+    """
+    The shared QSvgRenderer for an SVG source, so that each source is parsed once.
+    """
+    return QtSvg.QSvgRenderer(src if isinstance(src, str) else QtCore.QByteArray(src))
+
+
+_svg_cache: _PixmapLRU[tuple[SvgSourceKey, int, int, float, int | None, float]] = _PixmapLRU(
+    SVG_CACHE_MAX_BYTES_DEFAULT,
+)
+"""
+The process-wide cache of rasterized SVG images,
+keyed by (source, width, height, device pixel ratio, color rgba, rotation).
+"""
+
+
+def _svg_raster(
+    src: SvgSourceKey,
+    width: int,
+    height: int,
+    device_pixel_ratio: float = 1.0,
+    color: QtGui.QColor | None = None,
+    rotation: float = 0.0,
+) -> QtGui.QPixmap:
+    """
+    Rasterize an SVG at (width, height) logical pixels for the device_pixel_ratio.
+
+    If color is not None, then every painted pixel is tinted to color,
+    preserving the alpha channel, so antialiased edges stay smooth.
+
+    The rotation in degrees is about the center.
+
+    Rasters of the icons bundled in edifice.icons at the usual icon sizes
+    are also persisted in the on-disk _IconDiskCache, so they are not
+    rasterized again on the next run. Other sizes and rotations, like the
+    sizes of a widget which is being resized, are only cached in memory.
+    """
+    color_key = None if color is None else color.rgba()
+    key = (src, width, height, device_pixel_ratio, color_key, rotation)
+    entry = _svg_cache.get(key)
+    if entry is not None:
+        return entry[0]
+    # Bundled icons are also cached on disk between runs.
+    icon_path = (
+        _bundled_icon_path(src)
+        if width == height and width in ICON_CACHE_SIZES and rotation % 90.0 == 0.0
+        else None
+    )
+    if icon_path is not None:
+        disk_key = f"{icon_path}|{width}|{height}|{device_pixel_ratio}|{color_key}|{rotation}"
+        image = _get_icon_disk_cache().get(disk_key)
+        if image is None:
+            image = _svg_rasterize(src, width, height, device_pixel_ratio, color, rotation)
+            _get_icon_disk_cache().put(disk_key, image)
+    else:
+        image = _svg_rasterize(src, width, height, device_pixel_ratio, color, rotation)
+    pixmap = QtGui.QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    _svg_cache.put(key, pixmap)
+    return pixmap
+
+
+def _svg_rasterize(
+    src: SvgSourceKey,
+    width: int,
+    height: int,
+    device_pixel_ratio: float,
+    color: QtGui.QColor | None,
+    rotation: float,
+) -> QtGui.QImage:
+    device_width = max(1, round(width * device_pixel_ratio))
+    device_height = max(1, round(height * device_pixel_ratio))
+    image = QtGui.QImage(device_width, device_height, QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.GlobalColor.transparent)
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+    if rotation != 0.0:
+        painter.translate(device_width / 2.0, device_height / 2.0)
+        painter.rotate(rotation)
+        painter.translate(-device_width / 2.0, -device_height / 2.0)
+    _svg_renderer(src).render(painter, QtCore.QRectF(0.0, 0.0, device_width, device_height))
+    if color is not None:
+        painter.resetTransform()
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode.CompositionMode_SourceIn)
+        painter.fillRect(image.rect(), color)
+    painter.end()
+    return image
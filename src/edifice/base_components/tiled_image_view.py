@@ -0,0 +1,518 @@
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import math
+import threading
+import typing as tp
+
+from edifice.qt import QT_VERSION
+
+if QT_VERSION == "PyQt6" and not tp.TYPE_CHECKING:
+    from PyQt6 import QtCore, QtGui, QtWidgets
+else:
+    from PySide6 import QtCore, QtGui, QtWidgets
+
+from .base_components import CommandType, Element, QtWidgetElement, _WidgetTree
+from .image_cache import _PixmapLRU, _file_mtime
+
+if tp.TYPE_CHECKING:
+    from edifice.engine import PropsDiff
+
+logger = logging.getLogger("Edifice")
+
+TILE_CACHE_MAX_BYTES_DEFAULT = 128 * 1024 * 1024
+
+
+class TiledImageSource:
+    """
+    Base class for an image which can be read one region at a time,
+    for :class:`TiledImageView`.
+
+    Subclasses implement :func:`image_size` and :func:`read_region`.
+    :func:`read_region` is called from worker threads, so it must not
+    touch Qt widgets.
+
+    A source is used as part of the key for the shared tile cache, so
+    two sources which are :code:`__eq__` must read the same image.
+    """
+
+    def image_size(self) -> tuple[int, int]:
+        """
+        Returns:
+            The :code:`(width, height)` of the full-resolution image.
+        """
+        raise NotImplementedError
+
+    def read_region(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        scaled_width: int,
+        scaled_height: int,
+    ) -> QtGui.QImage:
+        """
+        Read a rectangular region of the full-resolution image, downscaled.
+
+        Args:
+            x, y, width, height:
+                The region of the full-resolution image.
+            scaled_width, scaled_height:
+                The size of the returned image.
+        """
+        raise NotImplementedError
+
+
+class TiledImageFile(TiledImageSource):
+    """
+    A :class:`TiledImageSource` for an image file.
+
+    For image formats which support it, like JPEG, regions are read with
+    `QImageReader <https://doc.qt.io/qtforpython-6/PySide6/QtGui/QImageReader.html>`_
+    :code:`setClipRect` and :code:`setScaledSize`, so only the requested
+    region is decoded.
+
+    For other image formats, like PNG, the whole image is decoded once and
+    kept in memory with the mipmap pyramid, in which each level is
+    downscaled from the level below.
+
+    The modification time of the file is part of the identity of the
+    source, so a file which has been changed is read again.
+
+    Args:
+        path:
+            The path to the image file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = _file_mtime(path)
+        self._size: tuple[int, int] | None = None
+        self._clip_rect: bool | None = None
+        self._pyramid: list[QtGui.QImage] = []
+        self._pyramid_lock = threading.Lock()
+
+    def image_size(self) -> tuple[int, int]:
+        if self._size is None:
+            size = QtGui.QImageReader(self.path).size()
+            self._size = (size.width(), size.height())
+        return self._size
+
+    def read_region(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        scaled_width: int,
+        scaled_height: int,
+    ) -> QtGui.QImage:
+        # A QImageReader can only read once, so make a new one for each region.
+        reader = QtGui.QImageReader(self.path)
+        if self._clip_rect is None:
+            self._clip_rect = reader.supportsOption(QtGui.QImageIOHandler.ImageOption.ClipRect)
+        if not self._clip_rect:
+            return self._read_region_pyramid(x, y, width, height, scaled_width, scaled_height)
+        reader.setClipRect(QtCore.QRect(x, y, width, height))
+        reader.setScaledSize(QtCore.QSize(scaled_width, scaled_height))
+        return reader.read()
+
+    def _pyramid_level(self, level: int) -> QtGui.QImage:
+        """
+        The decoded image downscaled by 2^level, decoding the file and
+        building the levels below on first use.
+        """
+        with self._pyramid_lock:
+            if len(self._pyramid) == 0:
+                image = QtGui.QImageReader(self.path).read()
+                if image.isNull():
+                    return image
+                self._pyramid.append(image)
+            while len(self._pyramid) <= level:
+                below = self._pyramid[-1]
+                self._pyramid.append(
+                    below.scaled(
+                        max(1, math.ceil(below.width() / 2)),
+                        max(1, math.ceil(below.height() / 2)),
+                        QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+                        QtCore.Qt.TransformationMode.SmoothTransformation,
+                    ),
+                )
+            return self._pyramid[level]
+
+    def _read_region_pyramid(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        scaled_width: int,
+        scaled_height: int,
+    ) -> QtGui.QImage:
+        # The finest level which is at least as large as the requested size.
+        ratio = min(width / scaled_width, height / scaled_height)
+        level = max(0, math.floor(math.log2(ratio))) if ratio >= 1.0 else 0
+        image = self._pyramid_level(level)
+        if image.isNull():
+            return image
+        region = image.copy(
+            x >> level,
+            y >> level,
+            max(1, math.ceil(width / (1 << level))),
+            max(1, math.ceil(height / (1 << level))),
+        )
+        if region.width() == scaled_width and region.height() == scaled_height:
+            return region
+        return region.scaled(
+            scaled_width,
+            scaled_height,
+            QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+            QtCore.Qt.TransformationMode.SmoothTransformation,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, TiledImageFile) and self.path == other.path and self.mtime == other.mtime
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.mtime))
+
+
+_TileKey = tuple[TiledImageSource, int, int, int, int]
+"""
+(source, tile size, level, tile column, tile row)
+
+For a :class:`TiledImageFile` the source includes the file modification time.
+"""
+
+_tile_cache: _PixmapLRU[_TileKey] = _PixmapLRU(TILE_CACHE_MAX_BYTES_DEFAULT)
+"""
+The process-wide cache of tiles for :class:`TiledImageView`,
+keyed by (source, tile size, level, tile column, tile row).
+"""
+
+_tile_executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+
+def _get_tile_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _tile_executor  # noqa: PLW0603
+    if _tile_executor is None:
+        _tile_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="edifice_tile")
+    return _tile_executor
+
+
+class _TileLoadedEvent(QtCore.QEvent):
+    event_type = QtCore.QEvent.Type(QtCore.QEvent.registerEventType())
+
+    def __init__(self, key: _TileKey, image: QtGui.QImage | BaseException):
+        super().__init__(self.event_type)
+        self.key = key
+        self.image = image
+
+
+class _TiledImageWidget(QtWidgets.QWidget):
+    """
+    Paints the visible tiles of a TiledImageSource at the level of the
+    mipmap pyramid which matches the current zoom.
+
+    Level 0 is full resolution, and each level above is half the resolution
+    of the level below. A tile at level L covers tile_size × 2^L source pixels
+    and is only read when it is first painted.
+
+    The view is (_scale, _origin): a source point p is painted at
+    (p - _origin) * _scale in widget coordinates.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
+        self._source: TiledImageSource | None = None
+        self._image_size: tuple[int, int] = (0, 0)
+        self._tile_size: int = 256
+        self._scale: float = 1.0
+        self._origin = QtCore.QPointF(0.0, 0.0)
+        self._fit_pending: bool = True
+        self._drag_last: QtCore.QPointF | None = None
+        self._futures: dict[_TileKey, concurrent.futures.Future] = {}
+
+    def sizeHint(self) -> QtCore.QSize:
+        return QtCore.QSize(640, 480)
+
+    def minimumSizeHint(self) -> QtCore.QSize:
+        return QtCore.QSize(10, 10)
+
+    def _setSource(self, source: TiledImageSource | None, tile_size: int):
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._source = source
+        self._tile_size = tile_size
+        self._image_size = source.image_size() if source is not None else (0, 0)
+        self._fit_pending = True
+        self.update()
+
+    def _fit(self):
+        width, height = self._image_size
+        if width <= 0 or height <= 0 or self.width() <= 0 or self.height() <= 0:
+            return
+        self._scale = min(self.width() / width, self.height() / height)
+        self._origin = QtCore.QPointF(
+            (width - self.width() / self._scale) / 2.0,
+            (height - self.height() / self._scale) / 2.0,
+        )
+        self._fit_pending = False
+
+    def _max_level(self) -> int:
+        longest = max(self._image_size)
+        if longest <= self._tile_size:
+            return 0
+        return math.ceil(math.log2(longest / self._tile_size))
+
+    def _level(self) -> int:
+        # Device pixels per source pixel.
+        device_scale = self._scale * self.devicePixelRatioF()
+        if device_scale >= 1.0:
+            return 0
+        return min(self._max_level(), math.floor(math.log2(1.0 / device_scale)))
+
+    def _tile_rect(self, level: int, column: int, row: int) -> QtCore.QRect:
+        """
+        The region of the full-resolution image covered by a tile.
+        """
+        span = self._tile_size << level
+        x, y = column * span, row * span
+        return QtCore.QRect(x, y, min(span, self._image_size[0] - x), min(span, self._image_size[1] - y))
+
+    def _visible_tiles(self, level: int) -> list[tuple[int, int]]:
+        span = self._tile_size << level
+        left = max(0.0, self._origin.x())
+        top = max(0.0, self._origin.y())
+        right = min(float(self._image_size[0]), self._origin.x() + self.width() / self._scale)
+        bottom = min(float(self._image_size[1]), self._origin.y() + self.height() / self._scale)
+        if right <= left or bottom <= top:
+            return []
+        return [
+            (column, row)
+            for row in range(int(top // span), math.ceil(bottom / span))
+            for column in range(int(left // span), math.ceil(right / span))
+        ]
+
+    def _request_tile(self, key: _TileKey):
+        if key in self._futures:
+            return
+        source, _tile_size, level, column, row = key
+        rect = self._tile_rect(level, column, row)
+        scaled_width = max(1, math.ceil(rect.width() / (1 << level)))
+        scaled_height = max(1, math.ceil(rect.height() / (1 << level)))
+
+        def _read():
+            try:
+                image: QtGui.QImage | BaseException = source.read_region(
+                    rect.x(),
+                    rect.y(),
+                    rect.width(),
+                    rect.height(),
+                    scaled_width,
+                    scaled_height,
+                )
+            except Exception as e:  # noqa: BLE001
+                image = e
+            try:
+                QtCore.QCoreApplication.postEvent(self, _TileLoadedEvent(key, image))
+            except RuntimeError:
+                # The widget was deleted while reading.
+                pass
+
+        self._futures[key] = _get_tile_executor().submit(_read)
+
+    def event(self, event: QtCore.QEvent) -> bool:
+        if isinstance(event, _TileLoadedEvent):
+            self._futures.pop(event.key, None)
+            if isinstance(event.image, BaseException):
+                logger.error("Exception while reading TiledImageView tile %s", event.key, exc_info=event.image)
+                return True
+            _tile_cache.put(event.key, QtGui.QPixmap.fromImage(event.image))
+            self.update()
+            return True
+        return super().event(event)
+
+    def _cached_ancestor(
+        self,
+        level: int,
+        column: int,
+        row: int,
+    ) -> tuple[QtGui.QPixmap, QtCore.QRectF] | None:
+        """
+        Find a cached coarser tile which covers this tile, and the part of
+        that coarser tile's pixmap which covers this tile.
+        """
+        assert self._source is not None
+        rect = QtCore.QRectF(self._tile_rect(level, column, row))
+        for ancestor_level in range(level + 1, self._max_level() + 1):
+            shift = ancestor_level - level
+            ancestor_column, ancestor_row = column >> shift, row >> shift
+            entry = _tile_cache.get((self._source, self._tile_size, ancestor_level, ancestor_column, ancestor_row))
+            if entry is not None:
+                ancestor_rect = self._tile_rect(ancestor_level, ancestor_column, ancestor_row)
+                factor = 1.0 / (1 << ancestor_level)
+                return entry[0], QtCore.QRectF(
+                    (rect.x() - ancestor_rect.x()) * factor,
+                    (rect.y() - ancestor_rect.y()) * factor,
+                    rect.width() * factor,
+                    rect.height() * factor,
+                )
+        return None
+
+    def _to_widget(self, rect: QtCore.QRect) -> QtCore.QRectF:
+        return QtCore.QRectF(
+            (rect.x() - self._origin.x()) * self._scale,
+            (rect.y() - self._origin.y()) * self._scale,
+            rect.width() * self._scale,
+            rect.height() * self._scale,
+        )
+
+    def paintEvent(self, event: QtGui.QPaintEvent):  # noqa: ARG002
+        if self._source is None:
+            return
+        if self._fit_pending:
+            self._fit()
+        level = self._level()
+        visible = {(self._source, self._tile_size, level, column, row) for column, row in self._visible_tiles(level)}
+
+        # Cancel the reads for tiles which are no longer visible.
+        for key in [key for key in self._futures if key not in visible]:
+            if self._futures[key].cancel():
+                del self._futures[key]
+
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+        for key in sorted(visible, key=lambda key: (key[4], key[3])):
+            _source, _tile_size, _level, column, row = key
+            target = self._to_widget(self._tile_rect(level, column, row))
+            entry = _tile_cache.get(key)
+            if entry is not None:
+                painter.drawPixmap(target, entry[0], QtCore.QRectF(entry[0].rect()))
+                continue
+            self._request_tile(key)
+            # Until the tile is loaded, paint a coarser tile if there is one.
+            ancestor = self._cached_ancestor(level, column, row)
+            if ancestor is not None:
+                painter.drawPixmap(target, ancestor[0], ancestor[1])
+        painter.end()
+
+    def _zoom(self, factor: float, anchor: QtCore.QPointF):
+        """
+        Zoom by factor, keeping the source point under anchor fixed.
+        """
+        source_point = self._origin + anchor / self._scale
+        self._scale *= factor
+        self._origin = source_point - anchor / self._scale
+        self._fit_pending = False
+        self.update()
+
+    def wheelEvent(self, event: QtGui.QWheelEvent):
+        self._zoom(math.pow(2.0, event.angleDelta().y() / 480.0), event.position())
+        event.accept()
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent):
+        if event.button() == QtCore.Qt.MouseButton.LeftButton:
+            self._drag_last = event.position()
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent):
+        if self._drag_last is not None:
+            self._origin -= (event.position() - self._drag_last) / self._scale
+            self._drag_last = event.position()
+            self._fit_pending = False
+            self.update()
+
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent):  # noqa: ARG002
+        self._drag_last = None
+
+    def mouseDoubleClickEvent(self, event: QtGui.QMouseEvent):  # noqa: ARG002
+        self._fit_pending = True
+        self.update()
+
+    def resizeEvent(self, event: QtGui.QResizeEvent):
+        super().resizeEvent(event)
+        self.update()
+
+
+class TiledImageView(QtWidgetElement[_TiledImageWidget]):
+    """
+    A pannable, zoomable view of a very large image.
+
+    .. highlights::
+
+        - Underlying Qt Widget `QWidget <https://doc.qt.io/qtforpython-6/PySide6/QtWidgets/QWidget.html>`_
+
+    Unlike :class:`Image`, the image is not loaded all at once
+    (except for image file formats which cannot read regions, see :class:`TiledImageFile`).
+    Only the tiles which are visible at the current zoom are read,
+    in a thread pool, from a lazily computed mipmap pyramid in which
+    each level has half the resolution of the level below.
+    While a tile is loading, a coarser tile is shown in its place.
+
+    Tiles are kept in a least-recently-used cache of 128 MB which is shared
+    by all :class:`TiledImageView`, so memory use stays constant no matter how
+    large the image is.
+
+    Scroll the mouse wheel to zoom, drag to pan, and double-click to fit the
+    whole image in the view.
+
+    .. rubric:: Props
+
+    All **props** from :class:`QtWidgetElement`, plus:
+
+    Args:
+        src:
+            One of:
+
+            * A path to an image file.
+            * A :class:`TiledImageSource`, for example
+              :class:`edifice.extra.numpy_image.NumpyTiledImageSource`
+              for a :code:`numpy.memmap`.
+        tile_size:
+            The width and height in pixels of one tile of the mipmap pyramid.
+
+    .. rubric:: Usage
+
+    .. code-block:: python
+
+        TiledImageView(src="satellite.tif")
+    """
+
+    def __init__(
+        self,
+        src: str | TiledImageSource,
+        tile_size: int = 256,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._register_props(
+            {
+                "src": src,
+                "tile_size": tile_size,
+            },
+        )
+        self.underlying: _TiledImageWidget | None = None
+
+    def _initialize(self):
+        self.underlying = _TiledImageWidget()
+        self.underlying.setObjectName(str(id(self)))
+
+    def _qt_update_commands(
+        self,
+        widget_trees: dict[Element, _WidgetTree],
+        diff_props: PropsDiff,
+    ):
+        if self.underlying is None:
+            self._initialize()
+        assert self.underlying is not None
+
+        commands = super()._qt_update_commands_super(widget_trees, diff_props, self.underlying, None)
+        if "src" in diff_props or "tile_size" in diff_props:
+            src = self.props["src"]
+            source = TiledImageFile(src) if isinstance(src, str) else src
+            commands.append(CommandType(self.underlying._setSource, source, self.props["tile_size"]))
+        return commands
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import types
+import typing as tp
+from collections.abc import Callable
+
+from edifice.qt import QT_VERSION
+
+if QT_VERSION == "PyQt6" and not tp.TYPE_CHECKING:
+    from PyQt6 import QtCore
+else:
+    from PySide6 import QtCore
+
+logger = logging.getLogger("Edifice")
+
+DISK_MEMO_MAX_BYTES_DEFAULT = 1024 * 1024 * 1024
+
+_T_disk_memo = tp.TypeVar("_T_disk_memo")
+_P_disk_memo = tp.ParamSpec("_P_disk_memo")
+
+_FILE_SUFFIX = ".memo"
+_MAGIC = b"EDFMEMO1"
+_HEADER = struct.Struct("<8sQQ")
+"""
+magic, pickle length, number of buffers
+"""
+_BUFFER_ENTRY = struct.Struct("<QQ")
+"""
+buffer offset, buffer length
+"""
+_BUFFER_ALIGN = 64
+
+
+def _default_cache_dir() -> str | None:
+    """
+    The directory of the disk memo cache, or None if the cache is disabled.
+
+    Set the environment variable :code:`EDIFICE_MEMO_CACHE_DIR` to
+    choose another directory, or to the empty string to disable the cache.
+    """
+    directory = os.environ.get("EDIFICE_MEMO_CACHE_DIR")
+    if directory is None:
+        location = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.GenericCacheLocation)
+        if not location:
+            return None
+        directory = os.path.join(location, "edifice", "memo")
+    if directory == "":
+        return None
+    return directory
+
+
+def _code_digest(code: types.CodeType, h: hashlib._Hash):
+    """
+    Hash the bytecode and constants of a function, so that the cache is
+    invalidated when the code changes, but not when only line numbers change.
+    """
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_digest(const, h)
+        else:
+            h.update(repr(const).encode())
+
+
+def _align(n: int) -> int:
+    return (n + _BUFFER_ALIGN - 1) // _BUFFER_ALIGN * _BUFFER_ALIGN
+
+
+class DiskMemoCache:
+    """
+    Persistent cache of computed values in a directory, for
+    :func:`edifice.use_disk_memo` and :func:`edifice.disk_memo`.
+
+    Args:
+        directory:
+            The cache directory. Default is the :code:`edifice/memo` directory
+            in the user cache location, or the environment variable
+            :code:`EDIFICE_MEMO_CACHE_DIR`. Set the environment variable to
+            the empty string to disable the cache.
+        max_bytes:
+            Maximum total size of the cache files. When this is exceeded,
+            the least recently used files are deleted.
+
+    Values are keyed by a SHA-256 hash of the function code, the pickled
+    dependencies, and a :code:`version` string.
+
+    Values are stored with
+    `pickle protocol 5 <https://docs.python.org/3/library/pickle.html#out-of-band-buffers>`_
+    with the out-of-band buffers in the same file. On load the file is
+    memory-mapped, so large arrays, like :code:`numpy.ndarray`, are read-only
+    views of the file which are paged in on access instead of being read
+    all at once.
+
+    The methods may be called from any thread.
+    """
+
+    def __init__(self, directory: str | None = None, max_bytes: int = DISK_MEMO_MAX_BYTES_DEFAULT):
+        self.directory = _default_cache_dir() if directory is None else directory
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+
+    def _path(self, digest: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, digest + _FILE_SUFFIX)
+
+    @staticmethod
+    def digest(fn: Callable[..., tp.Any], dependencies: tp.Any, version: str = "") -> str:
+        """
+        The cache key for :code:`fn` called with :code:`dependencies`.
+
+        Raises an exception if the :code:`dependencies` cannot be pickled.
+        """
+        h = hashlib.sha256()
+        fn_inner = tp.cast(tp.Any, fn)
+        while isinstance(fn_inner, functools.partial):
+            h.update(pickle.dumps((fn_inner.args, fn_inner.keywords), protocol=5))
+            fn_inner = fn_inner.func
+        fn_inner = getattr(fn_inner, "__wrapped__", fn_inner)
+        h.update(f"{getattr(fn_inner, '__module__', '')}.{getattr(fn_inner, '__qualname__', '')}".encode())
+        code = getattr(fn_inner, "__code__", None)
+        if code is not None:
+            _code_digest(code, h)
+        h.update(version.encode())
+        h.update(pickle.dumps(dependencies, protocol=5))
+        return h.hexdigest()
+
+    def load(self, digest: str) -> tuple[bool, tp.Any]:
+        """
+        Return :code:`(True, value)` if the :code:`digest` is cached, otherwise
+        :code:`(False, None)`.
+        """
+        if self.directory is None:
+            return False, None
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # ValueError for an empty file.
+            return False, None
+        try:
+            view = memoryview(mapping)
+            magic, pickle_len, nbuffers = _HEADER.unpack_from(view, 0)
+            if magic != _MAGIC:
+                return False, None
+            offset = _HEADER.size
+            buffers: list[memoryview] = []
+            for _ in range(nbuffers):
+                buffer_offset, buffer_len = _BUFFER_ENTRY.unpack_from(view, offset)
+                buffers.append(view[buffer_offset : buffer_offset + buffer_len])
+                offset += _BUFFER_ENTRY.size
+            value = pickle.loads(view[offset : offset + pickle_len], buffers=buffers)  # noqa: S301
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to load disk memo %s", path, exc_info=True)
+            return False, None
+        try:
+            # Touch the file for least-recently-used eviction.
+            os.utime(path)
+        except OSError:
+            pass
+        return True, value
+
+    def store(self, digest: str, value: tp.Any):
+        """
+        Store the :code:`value` for the :code:`digest`.
+
+        Raises an exception if the :code:`value` cannot be pickled.
+        """
+        if self.directory is None:
+            return
+        buffers: list[pickle.PickleBuffer] = []
+        data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        raws = [buffer.raw() for buffer in buffers]
+        offset = _align(_HEADER.size + _BUFFER_ENTRY.size * len(raws) + len(data))
+        table: list[bytes] = []
+        for raw in raws:
+            table.append(_BUFFER_ENTRY.pack(offset, raw.nbytes))
+            offset = _align(offset + raw.nbytes)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file and rename, so that another process
+            # never reads a partial file.
+            fd, temp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, len(data), len(raws)))
+                f.writelines(table)
+                f.write(data)
+                for raw in raws:
+                    f.write(b"\0" * (_align(f.tell()) - f.tell()))
+                    f.write(raw)
+            os.replace(temp_path, self._path(digest))
+        except OSError:
+            logger.debug("Failed to write disk memo %s", digest, exc_info=True)
+            return
+        self._evict()
+
+    def _evict(self):
+        assert self.directory is not None
+        with self._evict_lock:
+            try:
+                entries: list[tuple[float, int, str]] = []
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(_FILE_SUFFIX):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                return
+            total = sum(size for _, size, _ in entries)
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    # On Windows a memory-mapped file cannot be removed.
+                    pass
+
+    def get(self, fn: Callable[[], _T_disk_memo], dependencies: tp.Any, version: str = "") -> _T_disk_memo:
+        """
+        Return the cached value of :code:`fn()` for the :code:`dependencies`,
+        or call :code:`fn` and store the value.
+
+        If the :code:`dependencies` or the value cannot be pickled, then
+        :code:`fn` is called every time.
+        """
+        try:
+            digest = self.digest(fn, dependencies, version)
+        except Exception:  # noqa: BLE001
+            logger.debug("Disk memo dependencies cannot be pickled", exc_info=True)
+            return fn()
+        found, value = self.load(digest)
+        if found:
+            return value
+        value = fn()
+        try:
+            self.store(digest, value)
+        except Exception:  # noqa: BLE001
+            logger.debug("Disk memo value cannot be pickled", exc_info=True)
+        return value
+
+    def clear(self):
+        """
+        Delete all of the cache files.
+        """
+        if self.directory is None:
+            return
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(_FILE_SUFFIX):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+
+
+_disk_memo_cache: DiskMemoCache | None = None
+
+
+def _get_disk_memo_cache() -> DiskMemoCache:
+    global _disk_memo_cache  # noqa: PLW0603
+    if _disk_memo_cache is None:
+        _disk_memo_cache = DiskMemoCache()
+    return _disk_memo_cache
+
+
+def disk_memo(
+    version: str = "",
+    cache: DiskMemoCache | None = None,
+) -> Callable[[Callable[_P_disk_memo, _T_disk_memo]], Callable[_P_disk_memo, _T_disk_memo]]:
+    """
+    Decorator to memoize a function in a :class:`DiskMemoCache`, so that the
+    result persists across runs.
+
+    Args:
+        version:
+            Change the :code:`version` to invalidate the cached results, for
+            example when data which the function reads has changed.
+            The cache is invalidated automatically when the code of the
+            function changes.
+        cache:
+            The :class:`DiskMemoCache`. Default is the process-wide :class:`DiskMemoCache`.
+
+    The arguments of the function must be picklable, and the cache key is a
+    hash of the pickled arguments. The result must be picklable to be cached.
+
+    The decorated function is synchronous and runs in the calling thread.
+    To compute in a worker thread during a render, use :func:`use_disk_memo`.
+
+    .. code-block:: python
+        :caption: disk_memo
+
+        @disk_memo(version="1")
+        def build_index(path: str) -> numpy.ndarray:
+            ...
+    """
+
+    def decorator(fn: Callable[_P_disk_memo, _T_disk_memo]) -> Callable[_P_disk_memo, _T_disk_memo]:
+        @functools.wraps(fn)
+        def wrapper(*args: _P_disk_memo.args, **kwargs: _P_disk_memo.kwargs) -> _T_disk_memo:
+            memo = _get_disk_memo_cache() if cache is None else cache
+            return memo.get(
+                functools.partial(fn, *args, **kwargs),
+                (),
+                version,
+            )
+
+        return wrapper
+
+    return decorator
@@ -1,21 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import functools
 import inspect
 import logging
 import threading
 import typing as tp
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Callable, Coroutine, Iterable
 from copy import copy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from textwrap import dedent
 from types import MethodType
 
 from typing_extensions import Self
 
+from edifice.memo_cache import _memo_cache
 from edifice.qt import QT_VERSION
+from edifice.query_cache import QueryCache
 
 if QT_VERSION == "PyQt6" and not tp.TYPE_CHECKING:
     from PyQt6 import QtCore, QtGui, QtWidgets
@@ -211,6 +214,12 @@ class AppProtocol(tp.Protocol):
     def stop(self):
         pass
 
+    @property
+    def thread_executor(self) -> concurrent.futures.ThreadPoolExecutor: ...
+
+    @property
+    def query_cache(self) -> QueryCache: ...
+
 
 class _Tracker:
     """
@@ -1755,6 +1764,12 @@ class _HookEffect:
     dependencies: tp.Any
 
 
+AsyncSchedule = tp.Literal["cancel", "debounce", "throttle", "queue", "latest"]
+"""
+Scheduling mode for the Tasks of :func:`use_async` and :func:`use_async_call`.
+"""
+
+
 @dataclass
 class _HookAsync:
     tasks: list[asyncio.Task[tp.Any]]
@@ -1769,16 +1784,130 @@ class _HookAsync:
     """
     The set of tasks for which cancel() has been called.
     """
+    max_concurrent: int | None = 1
+    schedule: AsyncSchedule = "cancel"
+    interval: float = 0.0
+    """
+    The debounce or throttle interval in seconds.
+    """
+    max_queue: int | None = None
+    pending: deque[Callable[[], Coroutine[None, None, None]]] = field(default_factory=deque)
+    """
+    Functions which return the coroutines of requested tasks which have not started yet.
+    """
+    timer: asyncio.TimerHandle | None = None
+    """
+    The debounce or throttle timer.
+    """
+    last_start: float | None = None
+    """
+    The event loop time when the last task started.
+    """
 
     def cancel(self):
         """
-        Cancel all running tasks.
+        Cancel all running tasks, and all requested tasks which have not started yet.
         """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.pending.clear()
         for task in self.tasks:
             if task not in self.tasks_cancelled:
                 task.cancel()
                 self.tasks_cancelled.add(task)
 
+    def request(self, fn_coroutine: Callable[[], Coroutine[None, None, None]]):
+        """
+        Request a new task according to the schedule.
+
+        The debounce and throttle schedules use one event loop timer instead
+        of starting a sleeping task for every request.
+        """
+        match self.schedule:
+            case "cancel":
+                self._start(fn_coroutine, cancel_surplus=True)
+            case "debounce":
+                self.pending.clear()
+                self.pending.append(fn_coroutine)
+                if self.timer is not None:
+                    self.timer.cancel()
+                self.timer = asyncio.get_running_loop().call_later(self.interval, self._on_timer)
+            case "throttle":
+                loop = asyncio.get_running_loop()
+                if self.timer is None and (self.last_start is None or loop.time() - self.last_start >= self.interval):
+                    self._start(fn_coroutine, cancel_surplus=True)
+                else:
+                    # Start the latest request at the end of the interval.
+                    self.pending.clear()
+                    self.pending.append(fn_coroutine)
+                    if self.timer is None:
+                        assert self.last_start is not None
+                        self.timer = loop.call_at(self.last_start + self.interval, self._on_timer)
+            case "queue":
+                if self._has_capacity():
+                    self._start(fn_coroutine, cancel_surplus=False)
+                else:
+                    self.pending.append(fn_coroutine)
+                    while self.max_queue is not None and len(self.pending) > self.max_queue:
+                        # Drop the oldest request.
+                        self.pending.popleft()
+            case "latest":
+                if self._has_capacity():
+                    self._start(fn_coroutine, cancel_surplus=False)
+                else:
+                    self.pending.clear()
+                    self.pending.append(fn_coroutine)
+
+    def _has_capacity(self) -> bool:
+        return self.max_concurrent is None or self.concurrency() < self.max_concurrent
+
+    def _on_timer(self):
+        self.timer = None
+        if len(self.pending) > 0:
+            self._start(self.pending.popleft(), cancel_surplus=True)
+
+    def _start(self, fn_coroutine: Callable[[], Coroutine[None, None, None]], cancel_surplus: bool):
+        if cancel_surplus:
+            task_surplus = self.concurrency() - self.max_concurrent + 1 if self.max_concurrent is not None else 0
+            # task_surplus > 0 means we have too many tasks running so we must
+            # cancel some to start a new task.
+            # Cancel the oldest uncancelled tasks.
+            for task in self.tasks:
+                if task_surplus <= 0:
+                    break
+                if task not in self.tasks_cancelled:
+                    task.cancel()
+                    self.tasks_cancelled.add(task)
+                    task_surplus -= 1
+
+        task = asyncio.create_task(fn_coroutine())
+        task.add_done_callback(self._done_callback)
+        self.tasks.append(task)
+        self.last_start = asyncio.get_running_loop().time()
+
+    def _done_callback(self, task: asyncio.Task[tp.Any]):
+        # When the done_callback is called,
+        # this component might have already unmounted. In that case
+        # this done_callback will still be holding a reference to the
+        # _HookAsync.
+        # After the done_callback is called, the _HookAsync object
+        # should be garbage collected.
+        self.tasks.remove(task)
+        self.tasks_cancelled.discard(task)
+        # Start the next queued request.
+        if self.schedule in ("queue", "latest") and len(self.pending) > 0 and self._has_capacity():
+            self._start(self.pending.popleft(), cancel_surplus=False)
+        try:
+            # https://docs.python.org/3/library/asyncio-task.html#asyncio.Task.result
+            # If there is an exception, retrieve the exception.
+            # Otherwise asyncio complains
+            # “Task exception was never retrieved”
+            _r = task.result()
+        except asyncio.CancelledError:
+            pass
+        # Re-raise every exception except asyncio.CancelledError
+
     def concurrency(self) -> int:
         """
         Return the number of currently running, uncancelled tasks.
@@ -1813,6 +1942,7 @@ class RenderEngine:
         "_component_tree",
         "_hook_async",
         "_hook_effect",
+        "_hook_notify",
         "_hook_state",
         "_hook_state_setted",
         "_root",
@@ -1852,11 +1982,26 @@ class RenderEngine:
         """
         The per-element hooks for use_async().
         """
+        self._hook_notify: set[Callable[[], Iterable[Element]]] = set()
+        """
+        Batched subscription notifications since the last render.
+        Each notification is called once before the next render and returns
+        the elements which must re-render.
+        """
         self.is_stopped: bool = False
         """
         Flag determining if the render engine has been stopped.
         """
 
+    def _notify_batch(self, notify: Callable[[], Iterable[Element]]):
+        """
+        Call :code:`notify` once before the next render, instead of calling a
+        use_state setter for every subscriber. Idempotent for the same :code:`notify`.
+        """
+        self._hook_notify.add(notify)
+        if self._app is not None:
+            self._app._defer_rerender()
+
     def is_hook_async_done(self, element: Element) -> bool:
         """
         True if all of the async hooks for an Element are done.
@@ -1890,6 +2035,9 @@ class RenderEngine:
             del self._hook_effect[component]
         # Clean up use_async for the component
         if component in self._hook_async:
+            for hook in self._hook_async[component]:
+                # Cancel the timers and the requests which have not started.
+                hook.cancel()
             if self.is_hook_async_done(component):
                 # If there are no running tasks, then we can delete this
                 # HookAsync object immediately.
@@ -1929,6 +2077,9 @@ class RenderEngine:
         if self.is_stopped:
             return
 
+        # The use_memo_shared values may have been computed by the old code.
+        _memo_cache.clear()
+
         # Algorithm:
         # 1) Find all old components that's not a child of another component
 
@@ -2283,6 +2434,17 @@ class RenderEngine:
                     if element not in components_:
                         components_.append(element)
                 hook.updaters.clear()
+        # Then run the batched subscription notifications.
+        if len(self._hook_notify) > 0:
+            notifications = self._hook_notify
+            self._hook_notify = set()
+            components_notified = set(components_)
+            for notify in notifications:
+                for element in notify():
+                    if element in self._component_tree and element not in components_notified:
+                        element._state_unrendered = True
+                        components_notified.add(element)
+                        components_.append(element)
 
         all_commands: list[CommandType] = []
 
@@ -2405,69 +2567,40 @@ class RenderEngine:
         fn_coroutine: tp.Callable[[], Coroutine[None, None, None]],
         dependencies: tp.Any,
         max_concurrent: int | None = 1,
+        schedule: AsyncSchedule = "cancel",
+        interval: float = 0.0,
+        max_queue: int | None = None,
     ) -> Callable[[], None]:
         hooks = self._hook_async[element]
         h_index = element._hook_async_index
         element._hook_async_index += 1
 
-        # When the done_callback is called,
-        # this component might have already unmounted. In that case
-        # this done_callback will still be holding a reference to the
-        # _HookAsync.
-        # After the done_callback is called, the _HookAsync object
-        # should be garbage collected.
-
-        def done_callback(hook: _HookAsync, _task: asyncio.Task[tp.Any]):
-            hook.tasks.remove(_task)
-            hook.tasks_cancelled.discard(_task)
-            try:
-                # https://docs.python.org/3/library/asyncio-task.html#asyncio.Task.result
-                # If there is an exception, retrieve the exception and throw it away.
-                # Otherwise asyncio complains
-                # “Task exception was never retrieved”
-                _r = _task.result()
-            except asyncio.CancelledError:
-                pass
-            # Re-raise every exception except asyncio.CancelledError
-
         if len(hooks) <= h_index:
             # then this is the first render.
-            task = asyncio.create_task(fn_coroutine())
             hook = _HookAsync(
-                tasks=[task],
+                tasks=[],
                 dependencies=dependencies,
                 tasks_cancelled=set(),
+                max_concurrent=max_concurrent,
+                schedule=schedule,
+                interval=interval,
+                max_queue=max_queue,
             )
             hooks.append(hook)
-
-            task.add_done_callback(lambda t: done_callback(hook, t))
-
+            hook.request(fn_coroutine)
             return hook.cancel
 
-        if dependencies != (hook := hooks[h_index]).dependencies:
+        hook = hooks[h_index]
+        hook.max_concurrent = max_concurrent
+        hook.schedule = schedule
+        hook.interval = interval
+        hook.max_queue = max_queue
+
+        if dependencies != hook.dependencies:
             # then this is not the first render and deps changed
             hook.dependencies = dependencies
+            hook.request(fn_coroutine)
 
-            task_surplus = hook.concurrency() - max_concurrent + 1 if max_concurrent is not None else 0
-            # task_surplus > 0 means we have too many tasks running so we must
-            # cancel some to start a new task.
-            # Cancel the oldest uncancelled tasks.
-            for task in hook.tasks:
-                if task_surplus <= 0:
-                    break
-                if task not in hook.tasks_cancelled:
-                    task.cancel()
-                    hook.tasks_cancelled.add(task)
-                    task_surplus -= 1
-
-            task = asyncio.create_task(fn_coroutine())
-            task.add_done_callback(lambda t, hook=hook: done_callback(hook, t))
-            hook.tasks.append(task)
-
-            return hook.cancel
-
-        # not first render, dependencies did not change
-        hook = hooks[h_index]
         return hook.cancel
 
     def use_async_call(
@@ -2475,6 +2608,9 @@ class RenderEngine:
         element: Element,
         fn_coroutine: Callable[_P_async, tp.Coroutine[None, None, None]],
         max_concurrent: int | None = 1,
+        schedule: AsyncSchedule = "cancel",
+        interval: float = 0.0,
+        max_queue: int | None = None,
     ) -> tuple[Callable[_P_async, None], Callable[[], None]]:
         hooks = self._hook_async[element]
         h_index = element._hook_async_index
@@ -2482,24 +2618,6 @@ class RenderEngine:
 
         # We can use the _HookAsync type for both use_async and use_async_call.
 
-        # When the done_callback is called,
-        # this component might have already unmounted. In that case
-        # this done_callback will still be holding a reference to the
-        # _HookAsync.
-        # After the done_callback is called, the _HookAsync object
-        # should be garbage collected.
-
-        def done_callback(hook: _HookAsync, _task: asyncio.Task[tp.Any]):
-            hook.tasks.remove(_task)
-            hook.tasks_cancelled.discard(_task)
-            try:
-                # https://docs.python.org/3/library/asyncio-task.html#asyncio.Task.result
-                # Otherwise asyncio complains
-                # “Task exception was never retrieved”
-                _r = _task.result()
-            except asyncio.CancelledError:
-                pass
-
         if len(hooks) <= h_index:
             # then this is the first render.
             hook = _HookAsync(
@@ -2511,22 +2629,12 @@ class RenderEngine:
             hooks.append(hook)
 
         hook = hooks[h_index]
+        hook.max_concurrent = max_concurrent
+        hook.schedule = schedule
+        hook.interval = interval
+        hook.max_queue = max_queue
 
         def callback(*args: _P_async.args, **kwargs: _P_async.kwargs) -> None:
-            task_surplus = hook.concurrency() - max_concurrent + 1 if max_concurrent is not None else 0
-            # task_surplus > 0 means we have too many tasks running so we must
-            # cancel some to start a new task.
-            # Cancel the oldest uncancelled tasks.
-            for task in hook.tasks:
-                if task_surplus <= 0:
-                    break
-                if task not in hook.tasks_cancelled:
-                    task.cancel()
-                    hook.tasks_cancelled.add(task)
-                    task_surplus -= 1
-
-            task = asyncio.create_task(fn_coroutine(*args, **kwargs))
-            task.add_done_callback(lambda t, hook=hook: done_callback(hook, t))
-            hook.tasks.append(task)
+            hook.request(lambda: fn_coroutine(*args, **kwargs))
 
         return callback, hook.cancel
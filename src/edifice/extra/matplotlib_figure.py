@@ -1,24 +1,64 @@
 from __future__ import annotations
 
+import concurrent.futures
+import logging
 import typing as tp
 
 from edifice.base_components.base_components import CommandType, QtWidgetElement
 from edifice.qt import QT_VERSION
 
-if QT_VERSION == "PyQt6":
-    pass
+if QT_VERSION == "PyQt6" and not tp.TYPE_CHECKING:
+    from PyQt6 import QtCore, QtGui, QtWidgets
 else:
-    pass
+    from PySide6 import QtCore, QtGui, QtWidgets
 
 from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 
 if tp.TYPE_CHECKING:
-    from matplotlib.backend_bases import MouseEvent
+    import numpy.typing as npt
+    from matplotlib.backend_bases import DrawEvent, MouseEvent
+    from matplotlib.lines import Line2D
 
     from edifice.engine import PropsDiff
 
+logger = logging.getLogger("Edifice")
+
+
+class MatplotlibLine:
+    """
+    One dynamic line for the :code:`lines` **prop** of :class:`MatplotlibFigure`.
+
+    Args:
+        x:
+            The x values of the line.
+        y:
+            The y values of the line.
+        **options:
+            Keyword arguments for
+            `Axes.plot <https://matplotlib.org/stable/api/_as_gen/matplotlib.axes.Axes.plot.html>`_,
+            for example :code:`color`, :code:`marker`, :code:`linewidth`.
+
+    Two :class:`MatplotlibLine` are :code:`__eq__` if their arrays are the same
+    objects and their options are :code:`__eq__`. Arrays are not compared element-by-element,
+    so do not mutate the arrays, create new arrays instead.
+    """
+
+    def __init__(self, x: npt.ArrayLike, y: npt.ArrayLike, **options: tp.Any):
+        self.x = x
+        self.y = y
+        self.options = options
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MatplotlibLine):
+            return False
+        return self.x is other.x and self.y is other.y and self.options == other.options
+
+    def __hash__(self) -> int:
+        return id(self)
+
 
 class MatplotlibFigure(QtWidgetElement[FigureCanvasQTAgg]):
     """
@@ -39,6 +79,15 @@ class MatplotlibFigure(QtWidgetElement[FigureCanvasQTAgg]):
         on_figure_mouse_move:
             Handler for mouse move
             `MouseEvent <https://matplotlib.org/stable/api/backend_bases_api.html#matplotlib.backend_bases.MouseEvent>`_.
+        lines:
+            Dynamic lines which are redrawn incrementally by
+            `blitting <https://matplotlib.org/stable/users/explain/animations/blitting.html>`_,
+            a mapping from a key to a :class:`MatplotlibLine`.
+
+            Each key gets one animated
+            `Line2D <https://matplotlib.org/stable/api/_as_gen/matplotlib.lines.Line2D.html>`_
+            which persists across renders. When the :class:`MatplotlibLine` for a key changes,
+            the data of the existing :code:`Line2D` is updated in place.
 
     .. rubric:: Usage
 
@@ -54,12 +103,57 @@ class MatplotlibFigure(QtWidgetElement[FigureCanvasQTAgg]):
 
         MatplotlibFigure(plot_fun=plot_fun)
 
+    Every time the :code:`plot_fun` changes, the Axes are cleared and the
+    whole figure is redrawn, which is slow. For a figure which does not need
+    mouse interaction, :class:`MatplotlibFigureImage` will render it in a worker
+    thread instead.
+
+    Incremental redraw
+    ^^^^^^^^^^^^^^^^^^
+
+    For animations, draw the static parts of the figure (axes, grid, labels,
+    and fixed axis limits) in a :code:`plot_fun` which does not change,
+    and draw the parts which change in the :code:`lines` **prop**.
+
+    The static parts are rendered once and cached as a background image.
+    When the :code:`lines` change, the background is restored, only the
+    changed lines are redrawn, and the result is blitted to the screen.
+    Many changes between frames are coalesced into one blit.
+
+    Because the background is cached, the axis limits are not rescaled
+    for the :code:`lines`, so set the axis limits in the :code:`plot_fun`.
+
+    .. code-block:: python
+        :caption: Incremental redraw
+
+        def plot_static(ax: Axes):
+            ax.set_xlim(0, 10)
+            ax.set_ylim(-1, 1)
+            ax.grid(True)
+
+        @component
+        def Oscillator(self):
+            t, t_set = use_state(0.0)
+            xs = use_memo(lambda: np.linspace(0, 10, 500))
+
+            async def tick():
+                await asyncio.sleep(1 / 60)
+                t_set(t + 1 / 60)
+
+            use_async(tick, t)
+
+            MatplotlibFigure(
+                plot_fun=plot_static,
+                lines={"wave": MatplotlibLine(xs, np.sin(xs - t), color="blue")},
+            )
+
     """
 
     def __init__(
         self,
         plot_fun: tp.Callable[[Axes], None],
         on_figure_mouse_move: tp.Callable[[MouseEvent], None] | None = None,
+        lines: tp.Mapping[tp.Hashable, MatplotlibLine] | None = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -67,12 +161,84 @@ class MatplotlibFigure(QtWidgetElement[FigureCanvasQTAgg]):
             {
                 "plot_fun": plot_fun,
                 "on_figure_mouse_move": on_figure_mouse_move,
+                "lines": lines,
             },
         )
         self.underlying: FigureCanvasQTAgg | None = None
         self.subplots: Axes | None = None
         self.current_plot_fun: tp.Callable[[Axes], None] | None = None
         self.on_mouse_move_connect_id: int | None = None
+        self.current_lines: tp.Mapping[tp.Hashable, MatplotlibLine] = {}
+        self.line_artists: dict[tp.Hashable, Line2D] = {}
+        self.background: tp.Any = None
+        """
+        The cached static background from copy_from_bbox().
+        """
+        self.blit_pending: bool = False
+        self.on_draw_connect_id: int | None = None
+        """
+        The draw_event connection, only while there are lines.
+        """
+
+    def _on_draw(self, _event: DrawEvent | None):
+        # After a full draw, cache the static background, then draw the
+        # animated lines on top of it.
+        assert self.underlying is not None
+        assert self.subplots is not None
+        self.background = self.underlying.copy_from_bbox(self.underlying.figure.bbox)
+        for artist in self.line_artists.values():
+            self.subplots.draw_artist(artist)
+
+    def _blit(self):
+        self.blit_pending = False
+        assert self.underlying is not None
+        assert self.subplots is not None
+        if self.background is None:
+            # There has been no full draw yet. _on_draw will draw the lines.
+            self.underlying.draw_idle()
+            return
+        self.underlying.restore_region(self.background)
+        for artist in self.line_artists.values():
+            self.subplots.draw_artist(artist)
+        self.underlying.blit(self.underlying.figure.bbox)
+
+    def _request_blit(self):
+        # Coalesce all of the line changes in this frame into one blit.
+        if not self.blit_pending:
+            self.blit_pending = True
+            QtCore.QTimer.singleShot(0, self._blit)
+
+    def _create_line_artist(self, line: MatplotlibLine) -> Line2D:
+        assert self.subplots is not None
+        (artist,) = self.subplots.plot(line.x, line.y, animated=True, **line.options)
+        return artist
+
+    def _update_lines(self, lines: tp.Mapping[tp.Hashable, MatplotlibLine]):
+        for key in [key for key in self.line_artists if key not in lines]:
+            self.line_artists.pop(key).remove()
+        for key, line in lines.items():
+            artist = self.line_artists.get(key)
+            line_old = self.current_lines.get(key)
+            if artist is None:
+                self.line_artists[key] = self._create_line_artist(line)
+            elif line_old is None or line_old.options != line.options:
+                artist.remove()
+                self.line_artists[key] = self._create_line_artist(line)
+            elif line_old != line:
+                artist.set_data(line.x, line.y)
+        self.current_lines = lines
+        assert self.underlying is not None
+        if len(self.line_artists) > 0:
+            if self.on_draw_connect_id is None:
+                self.on_draw_connect_id = self.underlying.mpl_connect("draw_event", self._on_draw)
+            self._request_blit()
+        elif self.on_draw_connect_id is not None:
+            # Without lines there is no background to cache after a full draw.
+            self.underlying.mpl_disconnect(self.on_draw_connect_id)
+            self.on_draw_connect_id = None
+            self.background = None
+            # Full redraw to erase the removed lines.
+            self.underlying.draw_idle()
 
     def _qt_update_commands(self, widget_trees, diff_props: PropsDiff):
         if self.underlying is None:
@@ -92,11 +258,23 @@ class MatplotlibFigure(QtWidgetElement[FigureCanvasQTAgg]):
                     self.current_plot_fun = tp.cast(tp.Callable[[Axes], None], propnew)
                     self.subplots.clear()
                     self.current_plot_fun(self.subplots)
-                    self.underlying.draw()
-                    # alternately we could do draw_idle() here, but I don't think it's
-                    # any better and it messes up the mouse events.
+                    # clear() removed the line artists, so create them again.
+                    self.line_artists = {
+                        key: self._create_line_artist(line) for key, line in self.current_lines.items()
+                    }
+                    self.background = None
+                    if len(self.line_artists) > 0:
+                        # Incremental mode, coalesce the full redraw.
+                        self.underlying.draw_idle()
+                    else:
+                        self.underlying.draw()
+                        # alternately we could do draw_idle() here, but I don't think it's
+                        # any better and it messes up the mouse events.
 
                 commands.append(CommandType(_command_plot_fun, self))
+        match diff_props.get("lines"):
+            case _, propnew:
+                commands.append(CommandType(self._update_lines, propnew or {}))
         match diff_props.get("on_figure_mouse_move"):
             case _, propnew:
 
@@ -114,3 +292,244 @@ class MatplotlibFigure(QtWidgetElement[FigureCanvasQTAgg]):
 
                 commands.append(CommandType(_command_mouse_move, self))
         return commands
+
+
+_render_executor: concurrent.futures.ThreadPoolExecutor | None = None
+"""
+The executor for a MatplotlibFigureImage which is not rendered by an App.
+Otherwise the App.thread_executor is used, which shuts down when the App stops.
+"""
+
+
+def _get_render_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _render_executor  # noqa: PLW0603
+    if _render_executor is None:
+        _render_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="edifice_matplotlib",
+        )
+    return _render_executor
+
+
+def _render_figure_to_qimage(
+    plot_fun: tp.Callable[[Axes], None],
+    width: int,
+    height: int,
+    dpi: float,
+) -> QtGui.QImage:
+    """
+    Rasterize a new Figure with the Agg backend. Runs in a worker thread.
+
+    The Figure is private to this call and is never attached to pyplot,
+    so it is safe to draw off the GUI thread.
+    """
+    figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    plot_fun(tp.cast(Axes, figure.subplots()))
+    canvas.draw()
+    buffer = canvas.buffer_rgba()
+    buffer_height, buffer_width = buffer.shape[0], buffer.shape[1]
+    # copy() so that the QImage owns its pixels after the Figure is gone.
+    return QtGui.QImage(
+        buffer,
+        buffer_width,
+        buffer_height,
+        buffer_width * 4,
+        QtGui.QImage.Format.Format_RGBA8888,
+    ).copy()
+
+
+class _RenderedEvent(QtCore.QEvent):
+    event_type = QtCore.QEvent.Type(QtCore.QEvent.registerEventType())
+
+    def __init__(self, generation: int, result: QtGui.QImage | BaseException):
+        super().__init__(self.event_type)
+        self.generation = generation
+        self.result = result
+
+
+class _FigureImageWidget(QtWidgets.QWidget):
+    """
+    Paints the most recent rasterized Figure, scaled to the widget size
+    until a render at the new size is ready.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
+        self._pixmap: QtGui.QPixmap | None = None
+        self._plot_fun: tp.Callable[[Axes], None] | None = None
+        self._dpi: float = 100.0
+        self._generation: int = 0
+        """
+        Incremented on every render request. Renders for an older generation are stale.
+        """
+        self._future: concurrent.futures.Future | None = None
+        self._executor: concurrent.futures.Executor | None = None
+
+    def sizeHint(self) -> QtCore.QSize:
+        # The matplotlib default figsize.
+        return QtCore.QSize(640, 480)
+
+    def minimumSizeHint(self) -> QtCore.QSize:
+        return QtCore.QSize(10, 10)
+
+    def _setPlotFun(
+        self,
+        plot_fun: tp.Callable[[Axes], None],
+        dpi: float,
+        executor: concurrent.futures.Executor | None = None,
+    ):
+        self._plot_fun = plot_fun
+        self._dpi = dpi
+        self._executor = executor
+        self._request_render()
+
+    def _request_render(self):
+        self._generation += 1
+        if self._future is not None and self._future.cancel():
+            # The stale render had not started yet.
+            self._future = None
+        if self._future is None:
+            self._start_render()
+        # Otherwise a stale render is running. When it finishes, event()
+        # will discard it and start the render for the current generation.
+
+    def _start_render(self):
+        if self._plot_fun is None:
+            return
+        ratio = self.devicePixelRatioF()
+        width = max(1, round(self.width() * ratio))
+        height = max(1, round(self.height() * ratio))
+        generation = self._generation
+        executor = self._executor if self._executor is not None else _get_render_executor()
+        try:
+            self._future = executor.submit(
+                _render_figure_to_qimage,
+                self._plot_fun,
+                width,
+                height,
+                self._dpi * ratio,
+            )
+        except RuntimeError:
+            # The App has stopped and shut down its executor.
+            return
+
+        def _done(future: concurrent.futures.Future):
+            if future.cancelled():
+                return
+            exception = future.exception()
+            try:
+                QtWidgets.QApplication.postEvent(
+                    self,
+                    _RenderedEvent(generation, exception if exception is not None else future.result()),
+                )
+            except RuntimeError:
+                # The widget was deleted while rendering.
+                pass
+
+        self._future.add_done_callback(_done)
+
+    def event(self, event: QtCore.QEvent) -> bool:
+        if isinstance(event, _RenderedEvent):
+            self._future = None
+            if event.generation != self._generation:
+                self._start_render()
+            elif isinstance(event.result, BaseException):
+                logger.error("Exception while rendering MatplotlibFigureImage", exc_info=event.result)
+            else:
+                pixmap = QtGui.QPixmap.fromImage(event.result)
+                pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+                self._pixmap = pixmap
+                self.update()
+            return True
+        return super().event(event)
+
+    def resizeEvent(self, event: QtGui.QResizeEvent):
+        super().resizeEvent(event)
+        self._request_render()
+
+    def paintEvent(self, event: QtGui.QPaintEvent):  # noqa: ARG002
+        if self._pixmap is not None:
+            painter = QtGui.QPainter(self)
+            painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(self.rect(), self._pixmap)
+            painter.end()
+
+
+class MatplotlibFigureImage(QtWidgetElement[_FigureImageWidget]):
+    """
+    A static image of a **matplotlib** `Figure <https://matplotlib.org/stable/api/figure_api.html#matplotlib.figure.Figure>`_
+    which is rendered in a worker thread.
+
+    Requires `matplotlib <https://matplotlib.org/stable/>`_.
+
+    Like :class:`MatplotlibFigure`, but without the interactive canvas.
+    The :code:`plot_fun` draws a new Figure with the
+    `Agg <https://matplotlib.org/stable/users/explain/figure/backends.html>`_
+    backend in a worker thread of the :func:`App.thread_executor<edifice.App.thread_executor>`,
+    so a slow figure does not block the app.
+    When the rendering is ready it is shown as an image.
+
+    If the :code:`plot_fun` changes or the widget is resized while a
+    rendering is in progress, then the stale rendering is discarded and
+    only the most recent :code:`plot_fun` is rendered.
+
+    Use this for dashboards with many charts which do not need mouse interaction.
+
+    .. rubric:: Props
+
+    All **props** from :class:`edifice.QtWidgetElement` plus:
+
+    Args:
+        plot_fun:
+            Function which takes **matplotlib**
+            `Axes <https://matplotlib.org/stable/api/axes_api.html>`_
+            and calls
+            `Axes.plot <https://matplotlib.org/stable/api/_as_gen/matplotlib.axes.Axes.plot.html>`_.
+
+            This function will be called in a worker thread, so it must not
+            touch Qt widgets or Edifice state.
+        dpi:
+            The dots per inch of the Figure, which scales the text and line widths.
+
+    .. rubric:: Usage
+
+    .. code-block:: python
+
+        def plot_fun(ax:Axes):
+            time_range = np.linspace(-10, 10, num=120)
+            ax.plot(time_range, np.sin(time_range))
+
+        MatplotlibFigureImage(plot_fun=plot_fun)
+    """
+
+    def __init__(
+        self,
+        plot_fun: tp.Callable[[Axes], None],
+        dpi: float = 100.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._register_props(
+            {
+                "plot_fun": plot_fun,
+                "dpi": dpi,
+            },
+        )
+        self.underlying: _FigureImageWidget | None = None
+
+    def _qt_update_commands(self, widget_trees, diff_props: PropsDiff):
+        if self.underlying is None:
+            self.underlying = _FigureImageWidget()
+            self.underlying.setObjectName(str(id(self)))
+        assert self.underlying is not None
+
+        commands = super()._qt_update_commands_super(widget_trees, diff_props, self.underlying, None)
+
+        if "plot_fun" in diff_props or "dpi" in diff_props:
+            executor = None if self._controller is None else self._controller.thread_executor
+            commands.append(
+                CommandType(self.underlying._setPlotFun, self.props["plot_fun"], self.props["dpi"], executor),
+            )
+        return commands
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable, Sequence
 from typing import TYPE_CHECKING, Generic, TypeVar
 
 import numpy as np
@@ -8,11 +10,11 @@ import numpy.typing as npt
 from edifice.qt import QT_VERSION
 
 if QT_VERSION == "PyQt6" and not TYPE_CHECKING:
-    from PyQt6 import QtCore
-    from PyQt6.QtGui import QImage, QPixmap
+    from PyQt6 import QtCore, QtWidgets
+    from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap
 else:
-    from PySide6 import QtCore  # noqa: TC002
-    from PySide6.QtGui import QImage, QPixmap
+    from PySide6 import QtCore, QtWidgets
+    from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
 
 import edifice as ed
 from edifice.base_components.image_aspect import _image_descriptor_to_pixmap, _ScaledLabel
@@ -20,6 +22,37 @@ from edifice.engine import CommandType, _WidgetTree
 
 T_Numpy_Array_co = TypeVar("T_Numpy_Array_co", bound=np.generic, covariant=True)
 
+ColormapType = Sequence[QColor | tuple[int, int, int] | tuple[int, int, int, int]]
+"""
+A colormap is a sequence of colors, evenly spaced from :code:`vmin` to :code:`vmax`.
+"""
+
+COLORMAP_GRAY: ColormapType = ((0, 0, 0), (255, 255, 255))
+"""
+Black to white colormap.
+"""
+
+COLORMAP_VIRIDIS: ColormapType = (
+    (68, 1, 84),
+    (72, 40, 120),
+    (62, 73, 137),
+    (49, 104, 142),
+    (38, 130, 142),
+    (31, 158, 137),
+    (53, 183, 121),
+    (110, 206, 88),
+    (181, 222, 43),
+    (253, 231, 37),
+)
+"""
+Approximation of the **matplotlib** *viridis* colormap.
+"""
+
+_LUT_SIZE = 4096
+"""
+Number of entries in the lookup table for non-uint8 arrays.
+"""
+
 
 class NumpyArray(Generic[T_Numpy_Array_co]):
     """Wrapper for one `numpy.ndarray <https://numpy.org/doc/stable/reference/generated/numpy.ndarray.html>`_.
@@ -46,6 +79,185 @@ class NumpyArray(Generic[T_Numpy_Array_co]):
         return np.array_equal(self.np_array, other.np_array, equal_nan=True)
 
 
+def _colormap_rgba(colormap: ColormapType) -> tuple[tuple[int, int, int, int], ...]:
+    rgba: list[tuple[int, int, int, int]] = []
+    for color in colormap:
+        match color:
+            case QColor():
+                rgba.append((color.red(), color.green(), color.blue(), color.alpha()))
+            case (r, g, b):
+                rgba.append((r, g, b, 255))
+            case (r, g, b, a):
+                rgba.append((r, g, b, a))
+            case _:
+                raise ValueError(f"Colormap color {color} is not a QColor or an RGB or RGBA tuple.")
+    if len(rgba) == 0:
+        raise ValueError("Colormap must have at least one color.")
+    return tuple(rgba)
+
+
+@functools.lru_cache(16)
+def _colormap_lut(colormap: tuple[tuple[int, int, int, int], ...], size: int) -> npt.NDArray[np.uint8]:
+    """
+    Lookup table of shape (size, 4) interpolated linearly between the colormap colors.
+
+    The LUT is cached, so it is only rebuilt when the colormap changes.
+    """
+    stops = np.array(colormap, dtype=np.float64)
+    stop_positions = np.linspace(0.0, 1.0, len(colormap))
+    positions = np.linspace(0.0, 1.0, size)
+    lut = np.empty((size, 4), dtype=np.uint8)
+    for channel in range(4):
+        lut[:, channel] = np.rint(np.interp(positions, stop_positions, stops[:, channel]))
+    lut.setflags(write=False)
+    return lut
+
+
+def _lut_index(
+    arr: npt.NDArray[np.generic],
+    vmin: float,
+    vmax: float,
+    size: int,
+) -> npt.NDArray[np.uint16]:
+    """
+    Vectorized map of arr values from [vmin, vmax] to LUT indices [0, size-1].
+    """
+    index = np.subtract(arr, vmin, dtype=np.float32)
+    if vmax > vmin:
+        np.multiply(index, (size - 1) / (vmax - vmin), out=index)
+    else:
+        index.fill(0.0)
+    np.nan_to_num(index, copy=False, nan=0.0)
+    np.clip(index, 0, size - 1, out=index)
+    return index.astype(np.uint16)
+
+
+def NumpyArray_to_QImage_colormap(
+    arr: npt.NDArray[np.generic] | NumpyArray[np.generic],
+    colormap: ColormapType,
+    vmin: float | None = None,
+    vmax: float | None = None,
+) -> QImage:
+    """Function to convert scalar :code:`numpy` arrays into QImages with a colormap.
+
+    The provided array should be of any real number :code:`dtype` and
+    should have a shape of:
+
+    * (height, width)
+    * (height, width, 1)
+
+    The colormap is interpolated into a lookup table which is cached, so the
+    lookup table is only rebuilt when the :code:`colormap` changes.
+
+    A :code:`uint8` array is converted without copying into an
+    `Indexed8 <https://doc.qt.io/qtforpython-6/PySide6/QtGui/QImage.html#PySide6.QtGui.QImage.Format>`_
+    QImage with a color table. Other arrays are mapped through a
+    4096-entry lookup table.
+
+    NaN values are mapped to the first color of the colormap.
+
+    Args:
+        arr:
+            One of:
+
+            * A `NDArray <https://numpy.org/doc/stable/reference/generated/numpy.ndarray.html>`_.
+            * A `NumpyArray <https://pyedifice.github.io/stubs/edifice.extra.NumpyArray.html>`_.
+        colormap:
+            A sequence of colors, evenly spaced from :code:`vmin` to :code:`vmax`.
+            Each color is a
+            `QColor <https://doc.qt.io/qtforpython-6/PySide6/QtGui/QColor.html>`_
+            or a tuple of :code:`(red, green, blue)` or :code:`(red, green, blue, alpha)`.
+            See :data:`COLORMAP_GRAY` and :data:`COLORMAP_VIRIDIS`.
+        vmin:
+            The array value which maps to the first color.
+            If :code:`None` then the minimum value of the array.
+        vmax:
+            The array value which maps to the last color.
+            If :code:`None` then the maximum value of the array.
+
+    Returns:
+        A `QImage <https://doc.qt.io/qtforpython-6/PySide6/QtGui/QImage.html>`_.
+
+    """
+    if isinstance(arr, NumpyArray):
+        arr = arr.np_array
+    match arr.shape:
+        case (height, width) | (height, width, 1):
+            arr = arr.reshape((height, width))
+        case _:
+            raise ValueError(f"Numpy array with shape {arr.shape} cannot be converted into a QImage with a colormap.")
+    if vmin is None:
+        vmin = float(np.nanmin(arr)) if arr.size > 0 else 0.0
+    if vmax is None:
+        vmax = float(np.nanmax(arr)) if arr.size > 0 else 0.0
+    rgba = _colormap_rgba(colormap)
+
+    if arr.dtype == np.uint8:
+        # Map the 256 possible values instead of the pixels.
+        table = _colormap_lut(rgba, _LUT_SIZE)[_lut_index(np.arange(256), vmin, vmax, _LUT_SIZE)].astype(np.uint32)
+        qrgb = (table[:, 3] << 24) | (table[:, 0] << 16) | (table[:, 1] << 8) | table[:, 2]
+        arr = np.ascontiguousarray(arr)
+        qimage = QImage(arr.data, width, height, width, QImage.Format.Format_Indexed8)
+        qimage.setColorTable(qrgb.tolist())
+        return qimage
+
+    pixels = _colormap_lut(rgba, _LUT_SIZE)[_lut_index(arr, vmin, vmax, _LUT_SIZE)]
+    return QImage(pixels.data, width, height, 4 * width, QImage.Format.Format_RGBA8888)
+
+
+class NumpyArrayDirty(NumpyArray[T_Numpy_Array_co]):
+    """A :class:`NumpyArray` in which only some rectangular regions have changed.
+
+    Pass a :class:`NumpyArrayDirty` as the :code:`src` **prop** of
+    :class:`NumpyImage` to tell the :class:`NumpyImage` that only the
+    :code:`dirty_rects` regions of the array have changed since the previous
+    :code:`src`. The :class:`NumpyImage` will copy only those regions into the
+    displayed image and repaint only those regions.
+
+    The wrapped array may be the same array as the previous :code:`src`,
+    modified in place.
+
+    A :class:`NumpyArrayDirty` is only :code:`__eq__` to itself, so
+    the wrapped arrays are never compared element-by-element.
+    Create a new :class:`NumpyArrayDirty` for every update.
+
+    Args:
+        np_array:
+            A `numpy.ndarray <https://numpy.org/doc/stable/reference/generated/numpy.ndarray.html>`_.
+        dirty_rects:
+            The changed regions of :code:`np_array`, each a tuple of
+            :code:`(x, y, width, height)` in array pixel coordinates.
+
+    .. code-block:: python
+        :caption: Example NumpyArrayDirty
+
+        frame, frame_set = use_state(NumpyArray(np.zeros((2000, 2000, 3), dtype=np.uint8)))
+
+        def draw_cursor(x: int, y: int):
+            frame.np_array[y : y + 10, x : x + 10] = 255
+            frame_set(NumpyArrayDirty(frame.np_array, ((x, y, 10, 10),)))
+
+        NumpyImage(src=frame)
+
+    """
+
+    def __init__(
+        self,
+        np_array: npt.NDArray[T_Numpy_Array_co],
+        dirty_rects: Sequence[tuple[int, int, int, int]],
+    ) -> None:
+        super().__init__(np_array)
+        self.dirty_rects = tuple(dirty_rects)
+
+    def __eq__(self, other: object) -> bool:
+        return self is other
+
+    def __ne__(self, other: object) -> bool:
+        # Must override __ne__ so that this reflected method takes priority
+        # over NumpyArray.__eq__ when compared with a NumpyArray.
+        return self is not other
+
+
 def NumpyArray_to_QImage(arr: npt.NDArray[np.uint8] | NumpyArray[np.uint8]) -> QImage:
     """Function to convert :code:`numpy` arrays into QImages.
 
@@ -90,6 +302,109 @@ def NumpyArray_to_QImage(arr: npt.NDArray[np.uint8] | NumpyArray[np.uint8]) -> Q
             raise ValueError(f"Numpy array with shape {arr.shape} cannot be converted into a QImage.")
 
 
+class _NumpyImageLabel(_ScaledLabel):
+    """
+    A _ScaledLabel which paints its own pixmap instead of calling
+    QLabel.setPixmap(), so that changed regions of the image can be
+    repainted with update(rect).
+
+    _source is the full-resolution pixmap. _display is the pixmap which
+    is painted, it is the same as _source if there is no aspect_ratio_mode.
+    """
+
+    _source_shape: tuple[int, ...] | None = None
+    _display: QPixmap | None = None
+
+    def _rescale(self, fast: bool = False):
+        if self._pixmap is None:
+            return
+        match self._aspect_ratio_mode:
+            case None:
+                self._display = self._pixmap
+            case aspect_ratio_mode:
+                # Not shared through _scaled_cache, because _updateImageRects
+                # paints into the _display pixmap.
+                self._display = self._pixmap.scaled(
+                    self.frameSize(),
+                    aspect_ratio_mode,
+                    QtCore.Qt.TransformationMode.FastTransformation
+                    if fast
+                    else QtCore.Qt.TransformationMode.SmoothTransformation,
+                )
+        self.updateGeometry()
+        self.update()
+
+    def _display_rect(self) -> QtCore.QRect:
+        assert self._display is not None
+        return QtWidgets.QStyle.alignedRect(
+            self.layoutDirection(),
+            self.alignment(),
+            self._display.size(),
+            self.contentsRect(),
+        )
+
+    def sizeHint(self) -> QtCore.QSize:
+        if self._display is None:
+            return super().sizeHint()
+        return self._display.size() + self.size() - self.contentsRect().size()
+
+    def minimumSizeHint(self) -> QtCore.QSize:
+        if self._display is None:
+            return super().minimumSizeHint()
+        return self.sizeHint()
+
+    def paintEvent(self, event):
+        # QLabel with no pixmap and no text paints only the frame and the style.
+        super().paintEvent(event)
+        if self._display is not None:
+            painter = QPainter(self)
+            painter.drawPixmap(self._display_rect().topLeft(), self._display)
+            painter.end()
+
+    def _setImage(self, src: NumpyArray, to_qimage: Callable[[npt.NDArray], QImage]):
+        self._source_shape = src.np_array.shape
+        self._setPixmap(_image_descriptor_to_pixmap(to_qimage(src.np_array)))
+
+    def _updateImageRects(self, src: NumpyArrayDirty, to_qimage: Callable[[npt.NDArray], QImage]):
+        arr = src.np_array
+        if self._pixmap is None or self._display is None or arr.shape != self._source_shape:
+            self._setImage(src, to_qimage)
+            return
+        height, width = arr.shape[0], arr.shape[1]
+        scale_x = self._display.width() / width
+        scale_y = self._display.height() / height
+        display_origin = self._display_rect().topLeft()
+
+        painter_source = QPainter(self._pixmap)
+        painter_source.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter_display = None
+        if self._display is not self._pixmap:
+            painter_display = QPainter(self._display)
+            painter_display.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+            painter_display.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        for x, y, w, h in src.dirty_rects:
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + w, width), min(y + h, height)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            # Convert only the dirty region of the array.
+            region = np.ascontiguousarray(arr[y0:y1, x0:x1])
+            region_image = to_qimage(region)
+            painter_source.drawImage(QtCore.QPoint(x0, y0), region_image)
+            if painter_display is None:
+                self.update(QtCore.QRect(x0, y0, x1 - x0, y1 - y0).translated(display_origin))
+            else:
+                target = QtCore.QRectF(x0 * scale_x, y0 * scale_y, (x1 - x0) * scale_x, (y1 - y0) * scale_y)
+                painter_display.drawImage(target, region_image)
+                # Pad by one pixel for the smooth transformation at the edges.
+                self.update(target.toAlignedRect().adjusted(-1, -1, 1, 1).translated(display_origin))
+
+        painter_source.end()
+        if painter_display is not None:
+            painter_display.end()
+
+
 class NumpyImage(ed.QtWidgetElement):
     """Render a :code:`numpy` array as an image.
 
@@ -113,6 +428,14 @@ class NumpyImage(ed.QtWidgetElement):
             * :code:`(height, width, 1)`
             * :code:`(height, width, 3)`
             * :code:`(height, width, 4)`
+
+            If the :code:`src` is a :class:`NumpyArrayDirty` with the same
+            shape as the previous :code:`src`, then only the
+            :code:`dirty_rects` regions will be copied into the image and repainted.
+
+            If the :code:`colormap` is not :code:`None`, then the :code:`src`
+            may be a scalar array of any real number :code:`dtype` with
+            shape :code:`(height, width)` or :code:`(height, width, 1)`.
         aspect_ratio_mode:
             The aspect ratio mode of the image.
 
@@ -120,13 +443,45 @@ class NumpyImage(ed.QtWidgetElement):
             * An
               `AspectRatioMode <https://doc.qt.io/qtforpython-6/PySide6/QtCore/Qt.html#PySide6.QtCore.Qt.AspectRatioMode>`_
               to specify how the image should scale.
+        colormap:
+            A colormap for rendering a scalar :code:`src` array, see
+            :func:`NumpyArray_to_QImage_colormap`.
+
+            The colormap lookup table is only rebuilt when the :code:`colormap`
+            changes, so the :code:`colormap` should be a constant, for example
+            :data:`COLORMAP_VIRIDIS`.
+        vmin:
+            The :code:`src` value which maps to the first color of the :code:`colormap`.
+            If :code:`None` then the minimum value of the :code:`src`.
+        vmax:
+            The :code:`src` value which maps to the last color of the :code:`colormap`.
+            If :code:`None` then the maximum value of the :code:`src`.
+
+            If :code:`vmin` or :code:`vmax` is :code:`None`, then every
+            :class:`NumpyArrayDirty` update will re-render the whole image,
+            because the value range may have changed.
+
+    .. rubric:: Usage
+
+    .. code-block:: python
+        :caption: Heatmap of a float array
+
+        NumpyImage(
+            src=NumpyArray(np.random.default_rng().normal(size=(480, 640))),
+            colormap=COLORMAP_VIRIDIS,
+            vmin=-3.0,
+            vmax=3.0,
+        )
 
     """
 
     def __init__(
         self,
-        src: NumpyArray[np.uint8],
+        src: NumpyArray[np.generic],
         aspect_ratio_mode: None | QtCore.Qt.AspectRatioMode = None,
+        colormap: ColormapType | None = None,
+        vmin: float | None = None,
+        vmax: float | None = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -134,12 +489,15 @@ class NumpyImage(ed.QtWidgetElement):
             {
                 "src": src,
                 "aspect_ratio_mode": aspect_ratio_mode,
+                "colormap": colormap,
+                "vmin": vmin,
+                "vmax": vmax,
             },
         )
-        self.underlying: _ScaledLabel | None = None
+        self.underlying: _NumpyImageLabel | None = None
 
     def _initialize(self):
-        self.underlying = _ScaledLabel()
+        self.underlying = _NumpyImageLabel()
         self.underlying.setObjectName(str(id(self)))
 
     def _qt_update_commands(
@@ -151,15 +509,101 @@ class NumpyImage(ed.QtWidgetElement):
             self._initialize()
         assert self.underlying is not None
 
-        def _render_image(src: NumpyArray[np.uint8]) -> QPixmap:
-            qimage = NumpyArray_to_QImage(src)
-            return _image_descriptor_to_pixmap(qimage)
-
         commands = super()._qt_update_commands_super(widget_trees, diff_props, self.underlying, None)
-        match diff_props.get("src"):
-            case _, propnew:
-                commands.append(CommandType(self.underlying._setPixmap, _render_image(propnew)))
+
+        colormap_changed = "colormap" in diff_props or "vmin" in diff_props or "vmax" in diff_props
+        if "src" in diff_props or colormap_changed:
+            src = self.props["src"]
+            colormap = self.props["colormap"]
+            vmin = self.props["vmin"]
+            vmax = self.props["vmax"]
+            if colormap is None:
+                to_qimage = NumpyArray_to_QImage
+            else:
+                to_qimage = functools.partial(NumpyArray_to_QImage_colormap, colormap=colormap, vmin=vmin, vmax=vmax)
+            if (
+                isinstance(src, NumpyArrayDirty)
+                and not colormap_changed
+                and (colormap is None or (vmin is not None and vmax is not None))
+            ):
+                commands.append(CommandType(self.underlying._updateImageRects, src, to_qimage))
+            else:
+                commands.append(CommandType(self.underlying._setImage, src, to_qimage))
         match diff_props.get("aspect_ratio_mode"):
             case _, propnew:
                 commands.append(CommandType(self.underlying._setAspectRatioMode, propnew))
         return commands
+
+
+class NumpyTiledImageSource(ed.TiledImageSource):
+    """
+    A :class:`edifice.TiledImageSource` for a :code:`numpy` array, for
+    :class:`edifice.TiledImageView`.
+
+    Regions are read by slicing the array with a stride, so for a
+    `numpy.memmap <https://numpy.org/doc/stable/reference/generated/numpy.memmap.html>`_
+    only the visible part of the array at the current zoom is read from disk.
+
+    Args:
+        np_array:
+            A :code:`uint8` array with a shape allowed by :func:`NumpyArray_to_QImage`,
+            or, if there is a :code:`colormap`, a scalar array with a shape allowed
+            by :func:`NumpyArray_to_QImage_colormap`.
+        colormap:
+            Optional colormap for a scalar array.
+        vmin:
+            The value for the start of the :code:`colormap`. Required if there is
+            a :code:`colormap`, so that all tiles are colored the same.
+        vmax:
+            The value for the end of the :code:`colormap`. Required if there is
+            a :code:`colormap`.
+
+    .. code-block:: python
+
+        arr = np.memmap("scan.raw", dtype=np.uint16, mode="r", shape=(20000, 20000))
+        source = use_memo(lambda: NumpyTiledImageSource(arr, COLORMAP_VIRIDIS, vmin=0, vmax=4095), arr)
+        TiledImageView(src=source)
+
+    Two sources are :code:`__eq__` only if they are the same object, so create
+    the source once with :func:`edifice.use_memo` to keep the cached tiles.
+    """
+
+    def __init__(
+        self,
+        np_array: npt.NDArray,
+        colormap: ColormapType | None = None,
+        vmin: float | None = None,
+        vmax: float | None = None,
+    ):
+        if colormap is not None and (vmin is None or vmax is None):
+            raise ValueError("NumpyTiledImageSource with a colormap requires vmin and vmax.")
+        self.np_array = np_array
+        if colormap is None:
+            self._to_qimage: Callable[[npt.NDArray], QImage] = NumpyArray_to_QImage
+        else:
+            self._to_qimage = functools.partial(NumpyArray_to_QImage_colormap, colormap=colormap, vmin=vmin, vmax=vmax)
+
+    def image_size(self) -> tuple[int, int]:
+        return (self.np_array.shape[1], self.np_array.shape[0])
+
+    def read_region(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        scaled_width: int,
+        scaled_height: int,
+    ) -> QImage:
+        step = max(1, width // scaled_width)
+        region = np.ascontiguousarray(self.np_array[y : y + height : step, x : x + width : step])
+        # copy() so that the QImage owns its pixels after the region is gone.
+        image = self._to_qimage(region).copy()
+        if image.width() != scaled_width or image.height() != scaled_height:
+            image = image.scaled(
+                scaled_width,
+                scaled_height,
+                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+                QtCore.Qt.TransformationMode.SmoothTransformation,
+            )
+        return image
@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 import typing as tp
 
+import numpy as np
+import numpy.typing as npt
+
 from edifice.engine import CommandType, PropsDiff, QtWidgetElement
 
 # Import PySide6 or PyQt6 before importing pyqtgraph so that pyqtgraph detects the same
@@ -13,6 +18,354 @@ else:
 import pyqtgraph as pg
 
 
+class PlotRingBuffer:
+    """
+    Fixed-capacity ring buffer of :code:`(x, y)` samples for streaming plots.
+
+    Use a :class:`PlotRingBuffer` as a **state** for live telemetry plots
+    in which new samples arrive continually and only the most recent
+    :code:`capacity` samples should be plotted. Memory is bounded by
+    :code:`capacity` and appending samples does not allocate.
+
+    Samples are appended with :func:`extend` or :func:`append`, which
+    return a new :class:`PlotRingBuffer` sharing the same memory. Only the newest
+    :class:`PlotRingBuffer` is valid, so always append in a
+    :func:`use_state<edifice.use_state>` **updater function**.
+
+    Two :class:`PlotRingBuffer` are :code:`__eq__` if they share the same memory
+    and contain the same number of appended samples, so comparison is cheap.
+
+    Args:
+        capacity:
+            Maximum number of samples.
+        dtype:
+            The :code:`numpy` dtype of the samples.
+
+    .. code-block:: python
+        :caption: Example PlotRingBuffer
+
+        samples, samples_set = use_state(lambda: PlotRingBuffer(10000))
+
+        def on_telemetry(t: float, value: float):
+            samples_set(lambda buffer: buffer.append(t, value))
+
+        PyQtPlot(curves={"telemetry": PlotCurve(samples)})
+
+    """
+
+    def __init__(self, capacity: int, dtype: npt.DTypeLike = np.float64):
+        if capacity < 1:
+            raise ValueError("PlotRingBuffer capacity must be at least 1.")
+        self._capacity = capacity
+        # Each sample is written twice, at i and i + capacity, so that the
+        # last capacity samples are always a contiguous slice. Then x and y are
+        # views and never need to be copied.
+        self._x_storage = np.zeros(2 * capacity, dtype=dtype)
+        self._y_storage = np.zeros(2 * capacity, dtype=dtype)
+        self._end_shared = [0]
+        """
+        Total number of samples ever appended to the storage.
+        Shared by all PlotRingBuffer which share the same storage.
+        """
+        self._end = 0
+        """
+        Total number of samples ever appended, for this PlotRingBuffer.
+        """
+
+    def __len__(self) -> int:
+        return min(self._end, self._capacity)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PlotRingBuffer):
+            return False
+        return self._x_storage is other._x_storage and self._end == other._end
+
+    def __hash__(self) -> int:
+        return hash((id(self._x_storage), self._end))
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of samples."""
+        return self._capacity
+
+    @property
+    def x(self) -> npt.NDArray[tp.Any]:
+        """The x values of the samples, oldest first. A read-only view."""
+        return self._window(self._x_storage)
+
+    @property
+    def y(self) -> npt.NDArray[tp.Any]:
+        """The y values of the samples, oldest first. A read-only view."""
+        return self._window(self._y_storage)
+
+    def _window(self, storage: npt.NDArray[tp.Any]) -> npt.NDArray[tp.Any]:
+        count = len(self)
+        start = (self._end - count) % self._capacity
+        view = storage[start : start + count]
+        view.flags.writeable = False
+        return view
+
+    def extend(self, x: npt.ArrayLike, y: npt.ArrayLike) -> PlotRingBuffer:
+        """
+        Append samples.
+
+        Args:
+            x: The x values of the new samples.
+            y: The y values of the new samples.
+        Returns:
+            A new :class:`PlotRingBuffer` which shares memory with this one.
+            This :class:`PlotRingBuffer` is no longer valid.
+        """
+        if self._end != self._end_shared[0]:
+            raise ValueError("PlotRingBuffer is stale. Append to the newest PlotRingBuffer.")
+        x_arr = np.asarray(x, dtype=self._x_storage.dtype).ravel()
+        y_arr = np.asarray(y, dtype=self._y_storage.dtype).ravel()
+        if x_arr.shape != y_arr.shape:
+            raise ValueError(f"PlotRingBuffer x shape {x_arr.shape} does not match y shape {y_arr.shape}.")
+        n = len(x_arr)
+        if n > self._capacity:
+            # Only the newest samples fit.
+            x_arr = x_arr[n - self._capacity :]
+            y_arr = y_arr[n - self._capacity :]
+        end = self._end + n
+        positions = np.arange(end - len(x_arr), end) % self._capacity
+        self._x_storage[positions] = x_arr
+        self._x_storage[positions + self._capacity] = x_arr
+        self._y_storage[positions] = y_arr
+        self._y_storage[positions + self._capacity] = y_arr
+
+        new = tp.cast(PlotRingBuffer, object.__new__(PlotRingBuffer))
+        new._capacity = self._capacity
+        new._x_storage = self._x_storage
+        new._y_storage = self._y_storage
+        new._end_shared = self._end_shared
+        new._end = end
+        self._end_shared[0] = end
+        return new
+
+    def append(self, x: float, y: float) -> PlotRingBuffer:
+        """
+        Append one sample.
+
+        Returns:
+            A new :class:`PlotRingBuffer` which shares memory with this one.
+            This :class:`PlotRingBuffer` is no longer valid.
+        """
+        return self.extend((x,), (y,))
+
+
+_DECIMATION_OVERSAMPLE = 4
+"""
+Candidate points per pixel column to keep from the pyramid before the
+final decimation.
+"""
+
+_PYRAMID_BUCKET = 8
+"""
+Each pyramid level keeps the min and max of every _PYRAMID_BUCKET points
+of the level below, so each level is 4× smaller.
+"""
+
+
+def _minmax_select(y: npt.NDArray[tp.Any], bucket_size: int) -> npt.NDArray[np.intp]:
+    """
+    Indices of the minimum and maximum of y in each bucket of bucket_size
+    points, in index order.
+    """
+    n = len(y)
+    full = n // bucket_size
+    selected: list[npt.NDArray[np.intp]] = []
+    if full > 0:
+        # reshape of a contiguous slice is a view, no copy.
+        blocks = y[: full * bucket_size].reshape((full, bucket_size))
+        offsets = np.arange(full) * bucket_size
+        imin = blocks.argmin(axis=1) + offsets
+        imax = blocks.argmax(axis=1) + offsets
+        selected.append(np.stack((np.minimum(imin, imax), np.maximum(imin, imax)), axis=1).ravel())
+    if n > full * bucket_size:
+        tail = y[full * bucket_size :]
+        imin = tail.argmin() + full * bucket_size
+        imax = tail.argmax() + full * bucket_size
+        selected.append(np.array((min(imin, imax), max(imin, imax)), dtype=np.intp))
+    if len(selected) == 0:
+        return np.arange(0, dtype=np.intp)
+    return np.concatenate(selected)
+
+
+def _lttb_select(x: npt.NDArray[tp.Any], y: npt.NDArray[tp.Any], n_out: int) -> npt.NDArray[np.intp]:
+    """
+    Indices of the Largest-Triangle-Three-Buckets downsampling of (x, y) to n_out points.
+
+    https://skemman.is/bitstream/1946/15343/3/SS_MSthesis.pdf
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n, dtype=np.intp)
+    # Boundaries of the n_out - 2 middle buckets. The first and last points are always selected.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    # Averages of every middle bucket, plus the last point, for the "next bucket" vertex.
+    average_x = np.append(np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / counts, x[n - 1])
+    average_y = np.append(np.add.reduceat(y[1 : n - 1], edges[:-1] - 1) / counts, y[n - 1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for j in range(n_out - 2):
+        lo, hi = edges[j], edges[j + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = average_x[j + 1], average_y[j + 1]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(area.argmax())
+        selected[j + 1] = a
+    return selected
+
+
+class _DecimationPyramid:
+    """
+    Lazily computed min-max pyramid of one curve, for decimating the visible
+    range of the curve to the pixel width of the plot.
+
+    Level 0 is the full-resolution data. Each level above is the min-max
+    decimation of the level below. Levels are only computed when a view
+    needs them, and are kept until the curve data changes.
+    """
+
+    def __init__(
+        self,
+        x: npt.NDArray[tp.Any] | None,
+        y: npt.NDArray[tp.Any],
+        method: tp.Literal["minmax", "lttb"],
+    ):
+        self.method = method
+        self._y0 = y
+        self._x0 = x
+        """x of level 0, or None for the implicit sample index."""
+        self._levels: list[tuple[npt.NDArray[tp.Any], npt.NDArray[tp.Any]]] = []
+        """(x, y) of levels 1, 2, ..."""
+
+    def _level(self, level: int) -> tuple[npt.NDArray[tp.Any] | None, npt.NDArray[tp.Any]]:
+        if level == 0:
+            return self._x0, self._y0
+        while len(self._levels) < level:
+            x_below, y_below = self._level(len(self._levels))
+            selected = _minmax_select(y_below, _PYRAMID_BUCKET)
+            x_level = selected.astype(np.float64) if x_below is None else x_below[selected]
+            self._levels.append((x_level, y_below[selected]))
+        return self._levels[level - 1]
+
+    @staticmethod
+    def _visible(x: npt.NDArray[tp.Any] | None, n: int, x_min: float | None, x_max: float | None) -> tuple[int, int]:
+        """Index range of the visible points, plus one point beyond each edge."""
+        if x_min is None or x_max is None:
+            return 0, n
+        if x is None:
+            return max(int(np.floor(x_min)) - 1, 0), min(int(np.ceil(x_max)) + 2, n)
+        i0 = int(np.searchsorted(x, x_min, side="left")) - 1
+        i1 = int(np.searchsorted(x, x_max, side="right")) + 1
+        return max(i0, 0), min(i1, n)
+
+    def decimate(
+        self,
+        x_min: float | None,
+        x_max: float | None,
+        width: int,
+    ) -> tuple[npt.NDArray[tp.Any], npt.NDArray[tp.Any]]:
+        """
+        Decimate the visible range [x_min, x_max] to width pixel columns.
+        None for x_min and x_max means the full range.
+        """
+        i0, i1 = self._visible(self._x0, len(self._y0), x_min, x_max)
+        # Choose the highest level which still has enough points per pixel column.
+        level = 0
+        count = i1 - i0
+        while count // 4 >= _DECIMATION_OVERSAMPLE * width:
+            level += 1
+            count //= 4
+        x, y = self._level(level)
+        if level > 0:
+            i0, i1 = self._visible(x, len(y), x_min, x_max)
+        x = np.arange(i0, i1, dtype=np.float64) if x is None else x[i0:i1]
+        y = y[i0:i1]
+
+        match self.method:
+            case "minmax":
+                if len(y) > 2 * width:
+                    selected = _minmax_select(y, -(-len(y) // width))
+                    return x[selected], y[selected]
+            case "lttb":
+                if len(y) > width:
+                    selected = _lttb_select(x, y, width)
+                    return x[selected], y[selected]
+        return x, y
+
+
+class PlotCurve:
+    """
+    One curve for the :code:`curves` **prop** of :class:`PyQtPlot`.
+
+    Args:
+        y:
+            The y values of the curve as a :code:`numpy` array, or a
+            :class:`PlotRingBuffer` which provides both the x and y values.
+        x:
+            The x values of the curve as a :code:`numpy` array, or
+            :code:`None` to plot against the sample index.
+        decimation:
+            Decimation method for very long curves.
+
+            * :code:`None` to plot every point.
+            * :code:`"minmax"` to plot the minimum and maximum of every pixel column.
+              This preserves every peak.
+            * :code:`"lttb"` to plot one point per pixel column, selected by
+              `Largest-Triangle-Three-Buckets <https://skemman.is/bitstream/1946/15343/3/SS_MSthesis.pdf>`_.
+              This preserves the visual shape of the curve.
+
+            Only the visible x range is decimated, and decimation is only recomputed when the
+            visible x range or the plot width changes. The x values must be sorted ascending.
+        **options:
+            Style options for the
+            `PlotDataItem <https://pyqtgraph.readthedocs.io/en/latest/api_reference/graphicsItems/plotdataitem.html>`_,
+            for example :code:`pen`, :code:`symbol`, :code:`name`.
+
+    Two :class:`PlotCurve` are :code:`__eq__` if their :code:`numpy` arrays are the same
+    objects and their options are :code:`__eq__`. Arrays are not compared element-by-element,
+    so do not mutate the arrays, create new arrays instead.
+    """
+
+    def __init__(
+        self,
+        y: npt.NDArray[tp.Any] | PlotRingBuffer,
+        x: npt.NDArray[tp.Any] | None = None,
+        decimation: tp.Literal["minmax", "lttb"] | None = None,
+        **options: tp.Any,
+    ):
+        self.y = y
+        self.x = x
+        self.decimation = decimation
+        self.options = options
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PlotCurve):
+            return False
+        if isinstance(self.y, PlotRingBuffer):
+            if self.y != other.y:
+                return False
+        elif self.y is not other.y:
+            return False
+        return self.x is other.x and self.decimation == other.decimation and self.options == other.options
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def data(self) -> tuple[npt.NDArray[tp.Any] | None, npt.NDArray[tp.Any]]:
+        """The x and y arrays of the curve."""
+        if isinstance(self.y, PlotRingBuffer):
+            return self.y.x, self.y.y
+        return self.x, self.y
+
+
 class PyQtPlot(QtWidgetElement[pg.PlotWidget]): # type: ignore  # noqa: PGH003
     """
     A **PyQtGraph**
@@ -35,6 +388,16 @@ class PyQtPlot(QtWidgetElement[pg.PlotWidget]): # type: ignore  # noqa: PGH003
             Edifice will call
             `clear() <https://pyqtgraph.readthedocs.io/en/latest/api_reference/graphicsItems/plotitem.html#pyqtgraph.PlotItem.clear>`_
             before calling :code:`plot_fun`.
+        curves:
+            Data-driven curves, a mapping from a key to a :class:`PlotCurve`.
+
+            Each key gets one
+            `PlotDataItem <https://pyqtgraph.readthedocs.io/en/latest/api_reference/graphicsItems/plotdataitem.html>`_
+            which persists across renders.
+            When the :class:`PlotCurve` for a key changes, the existing
+            :code:`PlotDataItem` is updated with
+            `setData() <https://pyqtgraph.readthedocs.io/en/latest/api_reference/graphicsItems/plotdataitem.html#pyqtgraph.PlotDataItem.setData>`_
+            instead of being destroyed and recreated.
 
     .. rubric:: Usage
 
@@ -84,32 +447,125 @@ class PyQtPlot(QtWidgetElement[pg.PlotWidget]): # type: ignore  # noqa: PGH003
                 pg.PlotWidget, plot_item.getViewWidget()
             ).setAttribute(PySide6.QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
 
+    Because a new :code:`plot_fun` function is created on every render,
+    every render will clear and re-plot everything.
+    For plots which update frequently, use the :code:`curves` **prop** instead,
+    so that only the changed curves are updated.
+
+    .. code-block:: python
+        :caption: Data-driven curves
+
+        @component
+        def Component(self):
+            xs = use_memo(lambda: np.linspace(-10, 10, 1000))
+            phase, phase_set = use_state(0.0)
+
+            PyQtPlot(
+                curves={
+                    "sin": PlotCurve(np.sin(xs + phase), xs, pen="y"),
+                    "cos": PlotCurve(np.cos(xs + phase), xs, pen="c"),
+                },
+            )
+
+    For streaming live data with bounded memory, use a :class:`PlotRingBuffer`.
     """
 
-    def __init__(self, plot_fun: tp.Callable[[pg.PlotItem], None], **kwargs):
+    def __init__(
+        self,
+        plot_fun: tp.Callable[[pg.PlotItem], None] | None = None,
+        curves: tp.Mapping[tp.Hashable, PlotCurve] | None = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._register_props(
             {
                 "plot_fun": plot_fun,
+                "curves": curves,
             },
         )
+        self._curve_items: dict[tp.Hashable, pg.PlotDataItem] = {}
+        self._curve_pyramids: dict[tp.Hashable, tuple[_DecimationPyramid, dict[str, tp.Any]]] = {}
+        self._decimation_view: tuple[float | None, float | None, int] | None = None
+
+    def _current_view(self, plot_item: pg.PlotItem) -> tuple[float | None, float | None, int]:
+        view_box = plot_item.getViewBox()
+        width = max(int(view_box.width()), 1)
+        if view_box.autoRangeEnabled()[0]:
+            # The view will fit the data, so decimate the full range.
+            return None, None, width
+        x_min, x_max = view_box.viewRange()[0]
+        return x_min, x_max, width
+
+    def _set_decimated(self, key: tp.Hashable, view: tuple[float | None, float | None, int]):
+        pyramid, options = self._curve_pyramids[key]
+        x, y = pyramid.decimate(*view)
+        self._curve_items[key].setData(x, y, **options)
+
+    def _on_view_change(self, plot_item: pg.PlotItem):
+        view = self._current_view(plot_item)
+        if view == self._decimation_view:
+            return
+        self._decimation_view = view
+        for key in self._curve_pyramids:
+            self._set_decimated(key, view)
+
+    def _update_curves(
+        self,
+        plot_item: pg.PlotItem,
+        curves_old: tp.Mapping[tp.Hashable, PlotCurve],
+        curves_new: tp.Mapping[tp.Hashable, PlotCurve],
+    ):
+        for key in [key for key in self._curve_items if key not in curves_new]:
+            plot_item.removeItem(self._curve_items.pop(key))
+            self._curve_pyramids.pop(key, None)
+        for key, curve in curves_new.items():
+            item = self._curve_items.get(key)
+            if item is None:
+                item = pg.PlotDataItem()
+                self._curve_items[key] = item
+                plot_item.addItem(item)
+            elif curves_old.get(key) == curve:
+                continue
+            x, y = curve.data()
+            if curve.decimation is not None:
+                self._curve_pyramids[key] = (_DecimationPyramid(x, y, curve.decimation), curve.options)
+                self._set_decimated(key, self._current_view(plot_item))
+                continue
+            self._curve_pyramids.pop(key, None)
+            if x is None:
+                item.setData(y, **curve.options)
+            else:
+                item.setData(x, y, **curve.options)
 
     def _qt_update_commands(self, widget_trees, diff_props: PropsDiff):
         if self.underlying is None:
             self.underlying = pg.PlotWidget()
+            plot_item = tp.cast(pg.PlotItem, self.underlying.getPlotItem())
+            view_box = plot_item.getViewBox()
+            view_box.sigXRangeChanged.connect(lambda *_: self._on_view_change(plot_item))
+            view_box.sigResized.connect(lambda *_: self._on_view_change(plot_item))
 
         commands = super()._qt_update_commands_super(widget_trees, diff_props, self.underlying) # type: ignore  # noqa: PGH003
 
+        plot_widget = tp.cast(pg.PlotWidget, self.underlying)
+        plot_item = tp.cast(pg.PlotItem, plot_widget.getPlotItem())
+
         match diff_props.get("plot_fun"):
             case _, propnew:
-                plot_fun = tp.cast(tp.Callable[[pg.PlotItem], None], propnew)
-                plot_widget = tp.cast(pg.PlotWidget, self.underlying)
-                plot_item = tp.cast(pg.PlotItem, plot_widget.getPlotItem())
+                plot_fun = tp.cast(tp.Callable[[pg.PlotItem], None] | None, propnew)
 
                 def _update_plot(plot_item=plot_item, plot_fun=plot_fun):
                     plot_item.clear()
-                    plot_fun(plot_item)
+                    if plot_fun is not None:
+                        plot_fun(plot_item)
+                    # clear() removed the curves items, so put them back.
+                    for item in self._curve_items.values():
+                        plot_item.addItem(item)
 
                 commands.append(CommandType(_update_plot))
 
+        match diff_props.get("curves"):
+            case propold, propnew:
+                commands.append(CommandType(self._update_curves, plot_item, propold or {}, propnew or {}))
+
         return commands
@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 import typing as tp
-from collections.abc import Callable, Coroutine
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Coroutine
+from dataclasses import dataclass, field, replace
 from typing import Any, TypeVar, cast
 
-from edifice.engine import Reference, _P_async, _T_use_state, get_render_context_maybe
+from edifice.disk_memo import DiskMemoCache, _get_disk_memo_cache
+from edifice.engine import (
+    AsyncSchedule,
+    Element,
+    Reference,
+    RenderEngine,
+    _P_async,
+    _T_use_state,
+    get_render_context_maybe,
+)
+from edifice.memo_cache import MemoCache, _memo_cache
 from edifice.qt import QT_VERSION
+from edifice.query_cache import QueryCache, QueryResult
+from edifice.run_subprocess_with_callback import SubprocessPool
+from edifice.run_thread_with_callback import CancelToken, run_thread_with_callback
 from edifice.utilities import palette_edifice_dark, palette_edifice_light, theme_is_light
 
 if QT_VERSION == "PyQt6" and not tp.TYPE_CHECKING:
@@ -344,6 +360,9 @@ def use_async(
     fn_coroutine: tp.Callable[[], Coroutine[None, None, None]],
     dependencies: Any = (),
     max_concurrent: int | None = 1,
+    schedule: AsyncSchedule = "cancel",
+    interval: float = 0.0,
+    max_queue: int | None = None,
 ) -> Callable[[], None]:
     """
     Asynchronous side-effect Hook inside a :func:`@component<edifice.component>` function.
@@ -360,6 +379,16 @@ def use_async(
             :code:`fn_coroutine` Task will be cancelled to make room for the new
             Task. Default is :code:`1`. Set to :code:`None` to allow unlimited
             concurrency.
+        schedule:
+            How to schedule a new :code:`fn_coroutine` Task. See
+            :ref:`Rate control<rate_control>`. Default is :code:`"cancel"`.
+        interval:
+            The interval in seconds for the :code:`"debounce"` and
+            :code:`"throttle"` schedules.
+        max_queue:
+            Maximum number of waiting Tasks for the :code:`"queue"` schedule.
+            If this limit is exceeded, then the oldest waiting Task is dropped.
+            Default is :code:`None`, unlimited.
     Returns:
         A function which can be called to cancel the :code:`fn_coroutine` Task manually.
 
@@ -436,6 +465,47 @@ def use_async(
     See also
     `Task Cancellation <https://docs.python.org/3/library/asyncio-task.html#task-cancellation>`_.
 
+    .. _rate_control:
+
+    Rate control
+    ------------
+
+    The :code:`schedule` argument decides what happens when a new
+    :code:`fn_coroutine` Task is requested.
+
+    :code:`"cancel"`
+        Start the new Task immediately, cancelling the oldest Task if the
+        :code:`max_concurrent` limit is exceeded. This is the default.
+    :code:`"debounce"`
+        Wait until there have been no new requests for :code:`interval`
+        seconds, then start only the last requested Task.
+    :code:`"throttle"`
+        Start the new Task immediately if no Task has started in the last
+        :code:`interval` seconds. Otherwise start the last requested Task
+        at the end of the :code:`interval`.
+    :code:`"queue"`
+        Start the new Task when the number of running Tasks is less than
+        :code:`max_concurrent`, without cancelling any running Task.
+        At most :code:`max_queue` requested Tasks wait in the queue.
+    :code:`"latest"`
+        Like :code:`"queue"`, but only the last requested Task waits.
+        When a running Task finishes, the last requested Task starts and all
+        of the older requests are dropped.
+
+    The :code:`"debounce"` and :code:`"throttle"` schedules
+    wait with one event loop timer, so there are no sleeping Tasks.
+    Requested Tasks which have not started are dropped when the component
+    unmounts or when the cancel function is called.
+
+    .. code-block:: python
+        :caption: use_async with debounce
+
+        async def save_x():
+            await save_to_disk(x)
+
+        # Save 1 second after the last change of x.
+        use_async(save_x, x, schedule="debounce", interval=1.0)
+
     Timers
     ------
 
@@ -558,7 +628,15 @@ def use_async(
     context = get_render_context_maybe()
     if context is None or context.current_element is None:
         raise ValueError("use_async used outside component")
-    return context.engine.use_async(context.current_element, fn_coroutine, dependencies, max_concurrent=max_concurrent)
+    return context.engine.use_async(
+        context.current_element,
+        fn_coroutine,
+        dependencies,
+        max_concurrent=max_concurrent,
+        schedule=schedule,
+        interval=interval,
+        max_queue=max_queue,
+    )
 
 
 def use_ref() -> Reference:
@@ -573,6 +651,9 @@ def use_ref() -> Reference:
 def use_async_call(
     fn_coroutine: Callable[_P_async, Coroutine[None, None, None]],
     max_concurrent: int | None = 1,
+    schedule: AsyncSchedule = "cancel",
+    interval: float = 0.0,
+    max_queue: int | None = None,
 ) -> tuple[Callable[_P_async, None], Callable[[], None]]:
     """
     Hook to call an async function from a non-async context.
@@ -586,6 +667,16 @@ def use_async_call(
             :code:`fn_coroutine` Task will be cancelled to make room for the new
             Task. Default is :code:`1`. Set to :code:`None` to allow unlimited
             concurrency.
+        schedule:
+            How to schedule a new :code:`fn_coroutine` Task. See
+            :ref:`Rate control<rate_control>`. Default is :code:`"cancel"`.
+        interval:
+            The interval in seconds for the :code:`"debounce"` and
+            :code:`"throttle"` schedules.
+        max_queue:
+            Maximum number of waiting Tasks for the :code:`"queue"` schedule.
+            If this limit is exceeded, then the oldest waiting Task is dropped.
+            Default is :code:`None`, unlimited.
     Returns:
         A tuple pair of non-async functions.
             1. A non-async function with the same argument signature as the
@@ -638,11 +729,32 @@ def use_async_call(
     but it will cancel the Task
     when this :func:`@component<edifice.component>` is unmounted, or when the
     concurrency limit is exceeded.
+
+    .. code-block:: python
+        :caption: use_async_call to search as the user types
+
+        async def search(query: str):
+            set_results(await fetch_results(query))
+
+        # Search only after the user stops typing for 0.3 seconds.
+        search_debounce, _ = use_async_call(search, schedule="debounce", interval=0.3)
+
+        TextInput(value=query, on_change=search_debounce)
+
+    The :code:`schedule`, :code:`interval`, and :code:`max_queue` arguments
+    are the same as for :func:`use_async`.
     """
     context = get_render_context_maybe()
     if context is None or context.current_element is None:
         raise ValueError("use_async used outside component")
-    return context.engine.use_async_call(context.current_element, fn_coroutine, max_concurrent=max_concurrent)
+    return context.engine.use_async_call(
+        context.current_element,
+        fn_coroutine,
+        max_concurrent=max_concurrent,
+        schedule=schedule,
+        interval=interval,
+        max_queue=max_queue,
+    )
 
 
 T = TypeVar("T")
@@ -793,6 +905,7 @@ _T_use_memo = tp.TypeVar("_T_use_memo")
 def use_memo(
     fn: Callable[[], _T_use_memo],
     dependencies: tp.Any = (),
+    max_entries: int = 1,
 ) -> _T_use_memo:
     """
     Hook to memoize the result of calling a function.
@@ -808,6 +921,9 @@ def use_memo(
             are not :code:`__eq__` to the old :code:`dependencies`.
             If :code:`dependencies` is :code:`None`, then the **value** will
             recompute on every render.
+        max_entries:
+            The number of **values** to remember for the most recently used
+            :code:`dependencies`. Default is :code:`1`.
     Returns:
         The memoized **value** from calling :code:`fn`.
 
@@ -939,18 +1055,111 @@ def use_memo(
     :code:`value_from_slowprop`
     function will only change when the :code:`slowprop` changes.
 
+    Memoize many values
+    -------------------
+
+    If the :code:`dependencies` switch back and forth between a few
+    values, then set :code:`max_entries` to remember the **values** for
+    the last :code:`max_entries` different :code:`dependencies`, with
+    least-recently-used eviction.
+
+    .. code-block:: python
+        :caption: use_memo with max_entries
+
+        filtered = use_memo(lambda: expensive_filter(rows, mode), (rows, mode), max_entries=4)
+
+    The :code:`dependencies` are compared by :code:`__eq__`, so they do not need
+    to be hashable.
+
+    To share memoized **values** among components, use :func:`use_memo_shared`.
     """
 
-    stored, _ = use_state([None, None])
+    # [dependencies, value] pairs ordered from least to most recently used.
+    # The same storage for every max_entries, so that max_entries can change
+    # between renders.
+    entries: list[list[Any]]
+    entries, _ = use_state(tp.cast(Callable[[], list[list[Any]]], list))
     if dependencies is None:
-        stored[0] = fn()  # type: ignore  # noqa: PGH003
-    elif stored[1] != dependencies:
-        stored[0] = fn()  # type: ignore  # noqa: PGH003
-        stored[1] = dependencies
-    return stored[0]  # type: ignore  # noqa: PGH003
+        return fn()
+    for i, entry in enumerate(entries):
+        if entry[0] != dependencies:
+            continue
+        if i != len(entries) - 1:
+            entries.append(entries.pop(i))
+        del entries[: len(entries) - max(1, max_entries)]
+        return entry[1]
+    value = fn()
+    entries.append([dependencies, value])
+    del entries[: len(entries) - max(1, max_entries)]
+    return value
+
+
+def use_memo_shared(
+    key: tp.Hashable,
+    fn: Callable[[], _T_use_memo],
+    cache: MemoCache | None = None,
+) -> _T_use_memo:
+    """
+    Hook to memoize the result of calling a function in a cache shared by
+    all components.
 
+    Args:
+        key:
+            Hashable key of the **value**, which must include everything the
+            :code:`fn` depends on, for example :code:`("histogram", path, bins)`.
+        fn:
+            A function of no arguments which returns a **value**.
+        cache:
+            The :class:`MemoCache`. Default is the process-wide :class:`MemoCache`
+            with :code:`max_entries=1024` and :code:`max_bytes=256MiB`.
+    Returns:
+        The memoized **value** from calling :code:`fn`.
 
-@dataclass
+    Unlike :func:`use_memo`, the **value** is not owned by the component. Ten
+    components which call :func:`use_memo_shared` with the same :code:`key` call
+    :code:`fn` once and share the **value**, and the **value** stays cached after
+    the components unmount, until it is evicted.
+
+    The process-wide :class:`MemoCache` is cleared on hot reload.
+
+    .. code-block:: python
+        :caption: use_memo_shared
+
+        @component
+        def Histogram(self, path: str, bins: int):
+            histogram = use_memo_shared(("histogram", path, bins), lambda: compute_histogram(path, bins))
+    """
+    return (_memo_cache if cache is None else cache).get(key, fn)
+
+
+@dataclass(eq=False)
+class _ContextSubscriber:
+    """
+    One use_context or use_context_select Hook.
+    """
+
+    element: Element
+    selector: Callable[[Any], Any] | None
+    """
+    None for use_context.
+    """
+    selected: Any
+    """
+    The selected value for the context value_seen.
+    """
+    value_seen: Any
+    """
+    The context value when selected was last evaluated.
+    """
+
+    def select(self, value: Any) -> Any:
+        if value is not self.value_seen:
+            self.selected = value if self.selector is None else self.selector(value)
+            self.value_seen = value
+        return self.selected
+
+
+@dataclass(eq=False)
 class _EdificeProvideContext:
     value: Any
     """
@@ -958,16 +1167,30 @@ class _EdificeProvideContext:
     """
     stable_setter: Callable[[Any], None]
     """
-    setter that calls all the setters.
+    setter which notifies all of the subscribers.
     """
-    setters: set[Callable[[Any], None]]
+    subscribers: set[_ContextSubscriber]
     """
-    setters for the all of the use_context subscribers.
+    The use_context and use_context_select subscribers.
     """
 
+    def notify(self) -> list[Element]:
+        """
+        Called by the RenderEngine once before the next render after the value changed.
+        Evaluate the selectors and return the elements whose selected value changed.
+        """
+        changed: list[Element] = []
+        for subscriber in self.subscribers:
+            selected_old = subscriber.selected
+            if subscriber.select(self.value) != selected_old:
+                changed.append(subscriber.element)
+        return changed
+
 
 _edifice_provide_context: dict[str, _EdificeProvideContext] = {}
 
+_context_value_unseen = object()
+
 _T_provide_context = tp.TypeVar("_T_provide_context")
 
 
@@ -1050,18 +1273,21 @@ def provide_context(
     local_state, local_setter = use_state(initial_state)
 
     if context_key not in _edifice_provide_context:
+        render_context = get_render_context_maybe()
+        assert render_context is not None
+        engine = render_context.engine
 
         def stable_setter(update: _T_provide_context | Callable[[_T_provide_context], _T_provide_context]) -> None:
             context = _edifice_provide_context[context_key]
             new_value = update(context.value) if isinstance(update, Callable) else update
             if new_value != context.value:
                 context.value = new_value
-                # Call each setter for every use_context with this context_key.
-                # This is how we trigger re-render for every component using the context.
-                # Note that the context value update happens now but the local_setter
-                # updates will not happen until the beginning of the next render.
-                for use_context_setter in context.setters:
-                    use_context_setter(new_value)
+                # Notify all of the subscribers in one batch before the
+                # next render, instead of calling a setter for each subscriber.
+                # The selectors are evaluated then, once per render, and only
+                # the components whose selected value changed will re-render.
+                if len(context.subscribers) > 0:
+                    engine._notify_batch(context.notify)
                 local_setter(new_value)
 
         _edifice_provide_context[context_key] = _EdificeProvideContext(local_state, stable_setter, set())
@@ -1111,28 +1337,47 @@ def use_context(
 
     The **setter function** will, when called, update the **state value** across
     each :func:`@component<edifice.component>` using :func:`use_context` with the
-    same :code:`context_key`.
+    same :code:`context_key`. The components are notified in one batch before
+    the next render, no matter how many components use the :code:`context_key`.
     """
     if context_key not in _edifice_provide_context:
         raise ValueError(f"use_context context_key '{context_key}' has no provide_context.")
     context = _edifice_provide_context[context_key]
+    return _use_context_subscriber(context_key, context, None), context.stable_setter
 
-    local_state, local_setter = use_state(context.value)
 
-    if local_setter not in context.setters:
-        context.setters.add(local_setter)
-        # call the local setter so that it gets the value if the context_key
-        # changed.
-        if local_state != context.value:
-            local_setter(context.value)
+def _use_context_subscriber(
+    context_key: str,
+    context: _EdificeProvideContext,
+    selector: Callable[[Any], Any] | None,
+) -> Any:
+    """
+    Subscribe the current element to the context, and return the selected value.
+    """
+    render_context = get_render_context_maybe()
+    if render_context is None or render_context.current_element is None:
+        raise ValueError("use_context used outside component")
+    element = render_context.current_element
+
+    subscriber, _ = use_state(lambda: _ContextSubscriber(element, selector, None, _context_value_unseen))
+    if subscriber.selector is not selector:
+        # Use the latest selector.
+        subscriber.selector = selector
+        subscriber.value_seen = _context_value_unseen
+    # Subscribe during the render, so that the component is notified of
+    # updates which happen before the effects run.
+    context.subscribers.add(subscriber)
 
     def cleanup():
-        # We want the cleanup function bound to the context_key before it changed
-        _edifice_provide_context[context_key].setters.remove(local_setter)
+        # We want the cleanup function bound to the context before the context_key changed
+        context.subscribers.discard(subscriber)
+        # The provide_context may have remounted with the same context_key.
+        context_current = _edifice_provide_context.get(context_key)
+        if context_current is not None:
+            context_current.subscribers.discard(subscriber)
 
     use_effect(lambda: cleanup, context_key)
-
-    return local_state, context.stable_setter
+    return subscriber.select(context.value)
 
 
 def use_context_select(
@@ -1168,40 +1413,22 @@ def use_context_select(
     only re-render when the *selected* part of the context **state value**
     is not :code:`__eq__` to the previous *selected* part.
 
-    The :code:`selector` function passed into
-    :func:`use_context_select` for the first render of the
-    :func:`@component<component>` will be the one used for the lifetime
-    of the :func:`@component<component>`.
+    When the shared context **state value** changes, all of the components
+    using the :code:`context_key` are notified in one batch before the next
+    render. The :code:`selector` functions are evaluated then, once per
+    render, and only the components whose *selected* part changed are
+    re-rendered. Many updates to the shared context **state value** between
+    renders cause one evaluation of each :code:`selector`.
+
+    During a render of the component, the :code:`selector` is evaluated only
+    if the shared context **state value** or the :code:`selector` function
+    changed, so the :code:`selector` should be a pure function of the shared
+    context **state value**.
     """
     if context_key not in _edifice_provide_context:
         raise ValueError(f"use_context_select context_key '{context_key}' has no provide_context.")
     context = _edifice_provide_context[context_key]
-
-    local_state, local_setter = use_state(selector(context.value))
-
-    def local_setter_select_construct() -> Callable[[_T_use_context], None]:
-        def setter(new: _T_use_context) -> None:
-            local_setter(selector(new))
-
-        return setter
-
-    # local_setter_select must be a stable function reference
-    local_setter_select = use_memo(local_setter_select_construct)
-
-    if local_setter_select not in context.setters:
-        context.setters.add(local_setter_select)
-        # call the local setter so that it gets the value if the context_key
-        # changed.
-        if local_state != selector(context.value):
-            local_setter_select(context.value)
-
-    def cleanup():
-        # We want the cleanup function bound to the context_key before it changed
-        _edifice_provide_context[context_key].setters.remove(local_setter_select)
-
-    use_effect(lambda: cleanup, context_key)
-
-    return local_state
+    return _use_context_subscriber(context_key, context, selector)
 
 
 def use_palette_edifice() -> QtGui.QPalette:
@@ -1219,3 +1446,685 @@ def use_palette_edifice() -> QtGui.QPalette:
         return palette
 
     return use_memo(initializer)
+
+
+def use_subprocess_pool(
+    max_workers: int | None = None,
+    initializer: Callable[..., object] | None = None,
+    initargs: tuple[Any, ...] = (),
+    start_method: tp.Literal["spawn", "forkserver"] = "spawn",
+    preload: list[str] | None = None,
+) -> SubprocessPool:
+    """
+    Hook to create a warm :class:`SubprocessPool` of worker processes
+    which is shut down when the :func:`@component<edifice.component>` unmounts.
+
+    The arguments are passed to the :class:`SubprocessPool` constructor on the
+    first render and ignored on later renders.
+
+    Returns:
+        The :class:`SubprocessPool`.
+
+    Submit jobs to the pool with :func:`SubprocessPool.run` from a
+    :func:`use_async` or :func:`use_async_call` coroutine.
+
+    .. code-block:: python
+        :caption: use_subprocess_pool
+
+        def my_subprocess(x: int, callback: Callable[[str], None]) -> int:
+            callback("working")
+            return x * 2
+
+        @component
+        def Compute(self, x: int):
+            pool = use_subprocess_pool(max_workers=2)
+            result, result_set = use_state(0)
+
+            async def compute():
+                result_set(await pool.run(functools.partial(my_subprocess, x), print))
+
+            use_async(compute, x)
+            Label(str(result))
+
+    To share one pool among many components, call :func:`use_subprocess_pool`
+    in a parent component and pass the pool down with :func:`provide_context`.
+    """
+    pool, _ = use_state(
+        lambda: SubprocessPool(
+            max_workers=max_workers,
+            initializer=initializer,
+            initargs=initargs,
+            start_method=start_method,
+            preload=preload,
+        ),
+    )
+    use_effect(lambda: pool.shutdown, ())
+    return pool
+
+
+_T_use_thread = tp.TypeVar("_T_use_thread")
+_P_use_thread = tp.ParamSpec("_P_use_thread")
+
+
+class RunThread(tp.Protocol):
+    """
+    The function returned by :func:`use_thread`, with the same arguments as
+    :func:`run_thread_with_callback`.
+    """
+
+    def __call__(
+        self,
+        thread: Callable[[Callable[_P_use_thread, None], CancelToken], _T_use_thread],
+        callback: Callable[_P_use_thread, None],
+    ) -> Coroutine[None, None, _T_use_thread]: ...
+
+
+def use_thread() -> RunThread:
+    """
+    Hook to run :code:`thread` functions with :func:`run_thread_with_callback`
+    in the :func:`App.thread_executor` thread pool.
+
+    Returns:
+        An async function :code:`run_thread(thread, callback)` which behaves
+        like :func:`run_thread_with_callback`.
+
+    Every :code:`run_thread` job is tied to the lifetime of the
+    :func:`@component<edifice.component>`.
+    Each :code:`run_thread` job runs in its own Task. When the component
+    unmounts, those Tasks are cancelled, so the :class:`CancelToken` of each
+    job is cancelled, no more :code:`callback` calls will run, and the
+    :code:`await run_thread(...)` raises
+    `CancelledError <https://docs.python.org/3/library/asyncio-exceptions.html#asyncio.CancelledError>`_.
+    The Task which awaits :code:`run_thread` is not itself cancelled.
+
+    .. code-block:: python
+        :caption: use_thread
+
+        def fetch(ticker: str, callback: Callable[[str], None], cancel: CancelToken) -> pd.DataFrame:
+            # This function will run in a worker thread.
+            callback("Fetching")
+            return yf.Ticker(ticker).history("1y")
+
+        @component
+        def Chart(self, ticker: str):
+            run_thread = use_thread()
+            status, status_set = use_state("")
+            history, history_set = use_state(None)
+
+            async def fetch_history():
+                history_set(await run_thread(functools.partial(fetch, ticker), status_set))
+
+            use_async(fetch_history, ticker)
+    """
+    context = get_render_context_maybe()
+    if context is None or context.current_element is None:
+        raise ValueError("use_thread used outside component")
+    app = context.engine._app
+    executor = None if app is None else app.thread_executor
+
+    tasks: set[asyncio.Task[tp.Any]]
+    tasks, _ = use_state(tp.cast(Callable[[], set[asyncio.Task[tp.Any]]], set))
+
+    def cancel_tasks():
+        for task in tasks:
+            task.cancel()
+        tasks.clear()
+
+    use_effect(lambda: cancel_tasks, ())
+
+    async def run_thread(
+        thread: Callable[[Callable[_P_use_thread, None], CancelToken], _T_use_thread],
+        callback: Callable[_P_use_thread, None],
+    ) -> _T_use_thread:
+        # Track only this job, not the Task of the caller, so that unmount
+        # does not cancel other work which the caller awaits.
+        task = asyncio.ensure_future(run_thread_with_callback(thread, callback, executor))
+        tasks.add(task)
+        try:
+            return await task
+        finally:
+            tasks.discard(task)
+
+    return run_thread
+
+
+_T_use_query = tp.TypeVar("_T_use_query")
+
+_query_cache_no_app = QueryCache()
+"""
+The QueryCache for use_query when the RenderEngine has no App.
+"""
+
+
+def use_query(
+    key: tp.Hashable,
+    fetcher: Callable[[], Coroutine[None, None, _T_use_query]],
+    stale_time: float = 0.0,
+    enabled: bool = True,
+) -> QueryResult[_T_use_query]:
+    """
+    Hook to fetch async data which is cached and shared by key
+    in the :func:`App.query_cache`.
+
+    Args:
+        key:
+            Hashable key of the data, for example :code:`("quote", ticker)`.
+            All of the :func:`use_query` Hooks with the same :code:`key` share
+            the same data.
+        fetcher:
+            Async function of no arguments which fetches the data for the :code:`key`.
+        stale_time:
+            Seconds until fetched data becomes stale. Default is :code:`0.0`,
+            so data is always stale.
+        enabled:
+            Set to :code:`False` to prevent fetching.
+    Returns:
+        The :class:`QueryResult` for the :code:`key`.
+
+    When the component mounts or the :code:`key` changes, if the cached data
+    for the :code:`key` is stale, then the :code:`fetcher` will be started
+    in a new Task. Stale data is returned while it is fetched again in the
+    background.
+
+    Concurrent fetches for the same :code:`key` are deduplicated into one Task,
+    so ten components which show the same data cause one fetch.
+    When a fetch completes, every component using the :code:`key` re-renders.
+
+    The fetch Task is not cancelled when the component unmounts, because other
+    components may be waiting for it. A :code:`key` with no components using it
+    is evicted from the cache after :attr:`QueryCache.cache_time`, or when the
+    cache has more than :attr:`QueryCache.max_entries` keys.
+
+    If the :code:`fetcher` raises an exception, then the exception is
+    in :attr:`QueryResult.error` and the last successful :attr:`QueryResult.data`
+    is kept.
+
+    .. code-block:: python
+        :caption: use_query
+
+        @component
+        def Quote(self, ticker: str):
+            async def fetch_quote():
+                return await fetch_quote_from_the_internet(ticker)
+
+            quote = use_query(("quote", ticker), fetch_quote, stale_time=10.0)
+
+            with HBoxView():
+                if quote.is_loading:
+                    Label(text="Loading")
+                elif quote.data is not None:
+                    Label(text=str(quote.data))
+                Button(text="Refresh", on_click=lambda _: quote.refetch())
+
+    This Hook is similar to :code:`useQuery` from
+    https://tanstack.com/query
+    """
+    context = get_render_context_maybe()
+    if context is None or context.current_element is None:
+        raise ValueError("use_query used outside component")
+    app = context.engine._app
+    cache = _query_cache_no_app if app is None else app.query_cache
+
+    _, version_set = use_state(0)
+
+    def subscribe():
+        unsubscribe = cache.subscribe(key, lambda: version_set(lambda v: v + 1))
+        if enabled and cache.get(key, stale_time).is_stale:
+            cache.fetch(key, fetcher)
+        return unsubscribe
+
+    use_effect(subscribe, (key, enabled))
+
+    def refetch():
+        cache.fetch(key, fetcher)
+
+    return replace(cache.get(key, stale_time), refetch=refetch)
+
+
+_T_use_async_iter = tp.TypeVar("_T_use_async_iter")
+_T_use_async_iter_acc = tp.TypeVar("_T_use_async_iter_acc")
+
+
+class _AsyncIterBuffer:
+    """
+    Items yielded by the iterator of :func:`use_async_iter` which have not
+    been rendered yet.
+    """
+
+    def __init__(self):
+        self.items: deque[Any] = deque()
+        self.reset: bool = False
+        """
+        The state must be reset to the initial value at the next flush.
+        """
+        self.flush_pending: bool = False
+        """
+        A flush is scheduled or the state updater has not run yet.
+        """
+        self.last_flush: float = float("-inf")
+        self.timer: asyncio.TimerHandle | None = None
+        """
+        The scheduled flush, cancelled when the iterator stops.
+        """
+        self.space = asyncio.Event()
+        """
+        Set when the items are drained, for the "block" drop policy.
+        """
+
+
+@tp.overload
+def use_async_iter(
+    fn_iterator: Callable[[], AsyncIterator[_T_use_async_iter]],
+    dependencies: Any = (),
+    *,
+    window: int = 1000,
+    max_buffer: int | None = None,
+    drop: tp.Literal["oldest", "newest", "block"] = "oldest",
+    interval: float = 1 / 60,
+) -> tuple[_T_use_async_iter, ...]: ...
+
+
+@tp.overload
+def use_async_iter(
+    fn_iterator: Callable[[], AsyncIterator[_T_use_async_iter]],
+    dependencies: Any = (),
+    *,
+    reducer: Callable[[_T_use_async_iter_acc, list[_T_use_async_iter]], _T_use_async_iter_acc],
+    initial: _T_use_async_iter_acc,
+    max_buffer: int | None = None,
+    drop: tp.Literal["oldest", "newest", "block"] = "oldest",
+    interval: float = 1 / 60,
+) -> _T_use_async_iter_acc: ...
+
+
+def use_async_iter(
+    fn_iterator: Callable[[], AsyncIterator[Any]],
+    dependencies: Any = (),
+    *,
+    reducer: Callable[[Any, list[Any]], Any] | None = None,
+    initial: Any = (),
+    window: int = 1000,
+    max_buffer: int | None = None,
+    drop: tp.Literal["oldest", "newest", "block"] = "oldest",
+    interval: float = 1 / 60,
+) -> Any:
+    """
+    Hook to consume an async iterator and render its items in batches.
+
+    Args:
+        fn_iterator:
+            Function of no arguments which returns an
+            `AsyncIterator <https://docs.python.org/3/library/collections.abc.html#collections.abc.AsyncIterator>`_,
+            for example an async generator function.
+        dependencies:
+            A new iterator will be started when the
+            :code:`dependencies` are not :code:`__eq__` to the old :code:`dependencies`.
+            The state is reset to the initial value.
+        window:
+            Without a :code:`reducer`, the state is a tuple of the last
+            :code:`window` items.
+        reducer:
+            Function which takes the previous state and a list of the items yielded
+            since the last render, and returns the new state.
+        initial:
+            The initial state for the :code:`reducer`.
+        max_buffer:
+            Maximum number of items to hold between renders.
+            Default is :code:`None`, unlimited.
+        drop:
+            What to do with a new item when there are :code:`max_buffer` items.
+
+            * :code:`"oldest"` Drop the oldest item.
+            * :code:`"newest"` Drop the new item.
+            * :code:`"block"` Wait until the next render before taking the
+              next item from the iterator. No items are dropped, but the
+              iterator is limited to :code:`max_buffer` items per :code:`interval`.
+        interval:
+            Minimum seconds between renders. Default is one frame at 60Hz.
+    Returns:
+        The state, which is the tuple of the last :code:`window` items, or
+        the :code:`reducer` state.
+
+    Calling a :func:`use_state` setter for every item of a fast stream
+    will queue one updater per item between renders.
+    This Hook instead appends the items to a buffer, and calls one
+    updater per render which passes all of the buffered items to the
+    :code:`reducer` at once. So a stream of 100,000 items per second
+    causes at most one render per :code:`interval`.
+
+    The iterator runs in a :func:`use_async` Task which is cancelled when
+    the component unmounts or when the :code:`dependencies` change.
+
+    .. code-block:: python
+        :caption: use_async_iter with a window
+
+        @component
+        def Ticks(self, ticker: str):
+            async def ticks():
+                async for tick in subscribe_to_ticks(ticker):
+                    yield tick.price
+
+            prices = use_async_iter(ticks, ticker, window=100)
+            Label(text=", ".join(str(p) for p in prices))
+
+    .. code-block:: python
+        :caption: use_async_iter with a reducer
+
+        def count_reducer(count: int, events: list[Event]) -> int:
+            return count + len(events)
+
+        count = use_async_iter(events, reducer=count_reducer, initial=0)
+    """
+    buffer, _ = use_state(_AsyncIterBuffer)
+    state, state_set = use_state(initial)
+
+    def drain(previous: Any) -> Any:
+        buffer.flush_pending = False
+        batch = list(buffer.items)
+        buffer.items.clear()
+        buffer.space.set()
+        if buffer.reset:
+            buffer.reset = False
+            previous = initial
+        if reducer is not None:
+            return reducer(previous, batch)
+        if len(batch) == 0:
+            return previous
+        return (*previous, *batch)[-window:]
+
+    def schedule_flush():
+        if buffer.flush_pending:
+            return
+        buffer.flush_pending = True
+        loop = asyncio.get_running_loop()
+
+        def flush():
+            buffer.timer = None
+            buffer.last_flush = loop.time()
+            state_set(drain)
+
+        delay = buffer.last_flush + interval - loop.time()
+        if delay > 0:
+            buffer.timer = loop.call_later(delay, flush)
+        else:
+            flush()
+
+    def cancel_flush():
+        # Do not flush into the state after unmount or for stale dependencies.
+        if buffer.timer is not None:
+            buffer.timer.cancel()
+            buffer.timer = None
+            buffer.flush_pending = False
+
+    async def consume():
+        buffer.items.clear()
+        buffer.reset = True
+        schedule_flush()
+        iterator = fn_iterator()
+        try:
+            async for item in iterator:
+                if max_buffer is not None and len(buffer.items) >= max_buffer:
+                    if drop == "newest":
+                        continue
+                    if drop == "oldest":
+                        buffer.items.popleft()
+                    else:
+                        while len(buffer.items) >= max_buffer:
+                            buffer.space.clear()
+                            await buffer.space.wait()
+                buffer.items.append(item)
+                schedule_flush()
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    use_effect(lambda: cancel_flush, dependencies)
+    use_async(consume, dependencies)
+    return state
+
+
+_T_use_disk_memo = tp.TypeVar("_T_use_disk_memo")
+
+
+class _DiskMemoResult:
+    """
+    Holder for a :func:`use_disk_memo` value in a :func:`use_state`.
+    Compared by identity, because values like arrays cannot be compared with :code:`!=`.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def use_disk_memo(
+    fn: Callable[[], _T_use_disk_memo],
+    dependencies: Any = (),
+    version: str = "",
+    cache: DiskMemoCache | None = None,
+) -> _T_use_disk_memo | None:
+    """
+    Hook to memoize the result of calling a function on disk, so that
+    the result persists across runs.
+
+    Args:
+        fn:
+            A function of no arguments which returns a **value**. The **value**
+            must be picklable to be cached.
+        dependencies:
+            The :code:`fn` depends only on the :code:`dependencies`, which must
+            be picklable. The cache key is a hash of the code of :code:`fn`,
+            the pickled :code:`dependencies`, and the :code:`version`.
+        version:
+            Change the :code:`version` to invalidate the cached **values**, for
+            example when data which :code:`fn` reads has changed.
+        cache:
+            The :class:`DiskMemoCache`. Default is the process-wide :class:`DiskMemoCache`.
+    Returns:
+        The **value**, or :code:`None` while it is being loaded or computed.
+
+    Like :func:`use_memo`, but the **value** is stored in a
+    :class:`DiskMemoCache` directory and loaded on the next run instead of
+    being computed again. Large arrays in the **value** are memory-mapped
+    from the cache file.
+
+    The cache lookup and the :code:`fn` run in the
+    :func:`App.thread_executor` thread pool, so a slow computation during
+    startup does not block the first render. When the :code:`dependencies` change,
+    the **value** is :code:`None` until the new **value** is ready.
+
+    .. code-block:: python
+        :caption: use_disk_memo
+
+        @component
+        def Index(self, path: str):
+            index = use_disk_memo(lambda: build_index(path), path, version="1")
+            if index is None:
+                Label(text="Indexing")
+            else:
+                Label(text=f"{len(index)} entries")
+
+    To memoize a function outside of a component, use the :func:`disk_memo`
+    decorator.
+    """
+    context = get_render_context_maybe()
+    if context is None or context.current_element is None:
+        raise ValueError("use_disk_memo used outside component")
+    app = context.engine._app
+    executor = None if app is None else app.thread_executor
+    memo = _get_disk_memo_cache() if cache is None else cache
+
+    result, result_set = use_state(tp.cast(_DiskMemoResult | None, None))
+
+    async def compute():
+        result_set(None)
+        value = await asyncio.get_running_loop().run_in_executor(executor, memo.get, fn, dependencies, version)
+        result_set(_DiskMemoResult(value))
+
+    use_async(compute, dependencies)
+    return None if result is None else result.value
+
+
+_T_use_sync_external_store = tp.TypeVar("_T_use_sync_external_store")
+
+_external_store_unseen = object()
+
+
+@dataclass(eq=False)
+class _HookExternalStore:
+    """
+    The state of one use_sync_external_store Hook.
+    """
+
+    element: Element
+    engine: RenderEngine
+    get_snapshot: Callable[[], Any]
+    get_version: Callable[[], Any] | None
+    """
+    None if the snapshot is the version.
+    """
+    version: Any = _external_store_unseen
+    """
+    The version of the snapshot which was last rendered.
+    """
+    loop: asyncio.AbstractEventLoop | None = None
+    """
+    The event loop of the RenderEngine, captured when subscribing.
+    """
+    pending: bool = False
+    """
+    A notification has been scheduled and has not run yet. Guarded by lock.
+    """
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def current_version(self) -> Any:
+        return self.get_snapshot() if self.get_version is None else self.get_version()
+
+    def notify(self) -> list[Element]:
+        """
+        Called by the RenderEngine once before the next render after the store changed.
+        Return the element if the version changed since the last render.
+        """
+        with self.lock:
+            self.pending = False
+        version = self.current_version()
+        if version is self.version or (self.get_version is not None and version == self.version):
+            return []
+        return [self.element]
+
+    def on_store_change(self):
+        """
+        The callback passed to subscribe. May be called from any thread.
+        Schedules at most one notification before the next render, always
+        on the event loop thread.
+        """
+        with self.lock:
+            if self.pending:
+                return
+            self.pending = True
+        assert self.loop is not None
+        self.loop.call_soon_threadsafe(self.engine._notify_batch, self.notify)
+
+
+def use_sync_external_store(
+    subscribe: Callable[[Callable[[], None]], Callable[[], None]],
+    get_snapshot: Callable[[], _T_use_sync_external_store],
+    get_version: Callable[[], tp.Hashable] | None = None,
+) -> _T_use_sync_external_store:
+    """
+    Hook to read a snapshot of data from a store which is outside of Edifice.
+
+    Behaves like React `useSyncExternalStore <https://react.dev/reference/react/useSyncExternalStore>`_.
+
+    Args:
+        subscribe:
+            A function which takes a :code:`callback` function, subscribes
+            the :code:`callback` to the store, and returns a function which
+            unsubscribes the :code:`callback`. The store must call the
+            :code:`callback` when it changes. The :code:`callback` may be
+            called from any thread.
+        get_snapshot:
+            A function which returns a snapshot of the store.
+        get_version:
+            A function which returns the version of the store, for example an
+            :code:`int` which the store increments on every change.
+            If :code:`None`, then the snapshot is the version, so
+            :code:`get_snapshot` must return the same object until the store changes.
+    Returns:
+        The snapshot of the store.
+
+    Copying data from a store into a :func:`use_state` with the **setter function**
+    queues one updater and compares the old and new **state value**
+    with :code:`__eq__` on every update.
+
+    This Hook instead reads the snapshot only when the component renders.
+    When the store calls the :code:`callback`, the component is notified in one
+    batch with the other subscribers before the next render. The component
+    re-renders only if the version has changed since the last render. So
+    many updates to the store between renders cause one render, and a large
+    snapshot is never compared with :code:`__eq__`.
+
+    The :code:`subscribe` function is called again when it is not :code:`__eq__`
+    to the previous :code:`subscribe` function, so pass a bound method
+    or a stable function, not a new :code:`lambda` on every render.
+
+    .. code-block:: python
+        :caption: use_sync_external_store
+
+        class QuoteStore:
+            def __init__(self):
+                self.quotes: dict[str, float] = {}
+                self.version = 0
+                self.callbacks: set[Callable[[], None]] = set()
+
+            def update(self, ticker: str, price: float):
+                # Called from the socket thread.
+                self.quotes[ticker] = price
+                self.version += 1
+                for callback in list(self.callbacks):
+                    callback()
+
+            def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+                self.callbacks.add(callback)
+                return lambda: self.callbacks.discard(callback)
+
+        @component
+        def Quote(self, store: QuoteStore, ticker: str):
+            price = use_sync_external_store(
+                store.subscribe,
+                lambda: store.quotes.get(ticker),
+                lambda: store.version,
+            )
+            Label(text=str(price))
+    """
+    context = get_render_context_maybe()
+    if context is None or context.current_element is None:
+        raise ValueError("use_sync_external_store used outside component")
+    element = context.current_element
+    engine = context.engine
+
+    hook, _ = use_state(lambda: _HookExternalStore(element, engine, get_snapshot, get_version))
+    hook.get_snapshot = get_snapshot
+    hook.get_version = get_version
+
+    # Read the version before the snapshot, so that a change between the two
+    # reads causes another render.
+    if get_version is None:
+        snapshot = get_snapshot()
+        hook.version = snapshot
+    else:
+        hook.version = get_version()
+        snapshot = get_snapshot()
+
+    def setup():
+        hook.loop = asyncio.get_event_loop()
+        unsubscribe = subscribe(hook.on_store_change)
+        # The store may have changed between the render and the subscription.
+        if hook.notify():
+            hook.on_store_change()
+        return unsubscribe
+
+    use_effect(setup, subscribe)
+    return snapshot
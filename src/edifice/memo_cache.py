@@ -0,0 +1,128 @@
+# This memo_cache module depends only on the Python standard library.
+
+from __future__ import annotations
+
+import collections
+import sys
+import typing
+from collections.abc import Callable, Hashable
+
+_T_memo = typing.TypeVar("_T_memo")
+
+MEMO_CACHE_MAX_ENTRIES_DEFAULT = 1024
+MEMO_CACHE_MAX_BYTES_DEFAULT = 256 * 1024 * 1024
+
+
+def _value_nbytes(value: typing.Any) -> int:
+    """
+    The size of a value. Uses the :code:`nbytes` of arrays like
+    :code:`numpy.ndarray`, because :code:`sys.getsizeof` does not count
+    buffers owned by other objects.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+class MemoCache:
+    """
+    LRU cache of computed values, keyed by hashable keys, for
+    :func:`edifice.use_memo_shared`.
+
+    Args:
+        max_entries:
+            Maximum number of cached values.
+        max_bytes:
+            Maximum total size of the cached values, or :code:`None` for no limit.
+            A single value larger than :code:`max_bytes` is not cached.
+        sizeof:
+            Function which returns the size in bytes of a value.
+            The default uses the :code:`nbytes` attribute if the value has one,
+            like a :code:`numpy.ndarray`, and otherwise
+            `sys.getsizeof() <https://docs.python.org/3/library/sys.html#sys.getsizeof>`_.
+
+    When either limit is exceeded, the least recently used values are evicted.
+
+    All methods must be called from the main thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MEMO_CACHE_MAX_ENTRIES_DEFAULT,
+        max_bytes: int | None = MEMO_CACHE_MAX_BYTES_DEFAULT,
+        sizeof: Callable[[typing.Any], int] = _value_nbytes,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: collections.OrderedDict[Hashable, tuple[typing.Any, int]] = collections.OrderedDict()
+        """
+        key → (value, bytes). Ordered from least to most recently used.
+        """
+        self._total_bytes: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        The total size of the cached values.
+        """
+        return self._total_bytes
+
+    def get(self, key: Hashable, fn: Callable[[], _T_memo]) -> _T_memo:
+        """
+        Return the cached value for the :code:`key`, or call :code:`fn` to
+        compute it and cache it.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[0]
+        value = fn()
+        self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: typing.Any):
+        """
+        Cache the :code:`value` for the :code:`key`.
+        """
+        self.remove(key)
+        nbytes = self._sizeof(value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        self._entries[key] = (value, nbytes)
+        self._total_bytes += nbytes
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._total_bytes > self.max_bytes
+        ):
+            self.remove(next(iter(self._entries)))
+
+    def remove(self, key: Hashable):
+        """
+        Remove the :code:`key` from the cache.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def clear(self):
+        """
+        Remove all of the cached values.
+        """
+        self._entries.clear()
+        self._total_bytes = 0
+
+
+_memo_cache = MemoCache()
+"""
+The process-wide cache for :func:`edifice.use_memo_shared`.
+
+Cleared on hot reload, because the cached values may have been computed
+by code which has changed.
+"""
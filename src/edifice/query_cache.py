@@ -0,0 +1,271 @@
+# This query_cache module depends only on the Python standard library.
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import typing
+from collections.abc import Callable, Coroutine, Hashable
+from dataclasses import dataclass, field
+
+_T_query = typing.TypeVar("_T_query")
+
+
+@dataclass(frozen=True)
+class QueryResult(typing.Generic[_T_query]):
+    """
+    The state of one key of a :class:`QueryCache`, returned by :func:`edifice.use_query`.
+    """
+
+    data: _T_query | None = None
+    """
+    The result of the last successful fetch, or :code:`None` if no fetch has succeeded.
+    """
+    error: BaseException | None = None
+    """
+    The exception raised by the last fetch, or :code:`None` if the last fetch succeeded.
+    """
+    is_fetching: bool = False
+    """
+    True while a fetch is running.
+    """
+    is_stale: bool = True
+    """
+    True if there is no :code:`data`, if the :code:`data` is older than the :code:`stale_time`,
+    or if the key was invalidated since the last successful fetch.
+    """
+    updated_at: float | None = None
+    """
+    The event loop time of the last successful fetch.
+    """
+    refetch: Callable[[], None] = field(default=lambda: None, compare=False, repr=False)
+    """
+    Call this function to start a new fetch. While a fetch for the key is
+    running, this does nothing.
+    """
+
+    @property
+    def is_loading(self) -> bool:
+        """
+        True while the first fetch is running and there is no :code:`data` yet.
+        """
+        return self.is_fetching and self.updated_at is None
+
+
+class _QueryEntry:
+    __slots__ = ("data", "error", "eviction", "fetcher", "invalidated", "listeners", "task", "updated_at")
+
+    def __init__(self):
+        self.data: typing.Any = None
+        self.error: BaseException | None = None
+        self.updated_at: float | None = None
+        """
+        The event loop time of the last successful fetch, or None if no fetch has succeeded.
+        """
+        self.invalidated: bool = False
+        """
+        True if invalidate() was called since the last successful fetch.
+        """
+        self.task: asyncio.Task[typing.Any] | None = None
+        """
+        The running fetch task which all of the listeners share.
+        """
+        self.fetcher: Callable[[], Coroutine[None, None, typing.Any]] | None = None
+        """
+        The last fetcher, for refetch after invalidate().
+        """
+        self.listeners: list[Callable[[], None]] = []
+        self.eviction: asyncio.TimerHandle | None = None
+
+
+class QueryCache:
+    """
+    Cache of async fetch results, keyed by hashable keys and shared by
+    all of the :func:`edifice.use_query` Hooks of an :class:`edifice.App`.
+
+    Concurrent fetches for the same key share one
+    `Task <https://docs.python.org/3/library/asyncio-task.html#asyncio.Task>`_.
+
+    Args:
+        max_entries:
+            Maximum number of cached keys. When this is exceeded, the least
+            recently used keys with no listeners are evicted.
+        cache_time:
+            Seconds to keep a key after its last listener unsubscribes.
+            Set to :code:`None` to keep the key until it is evicted by
+            :code:`max_entries`.
+
+    All methods must be called from the event loop thread.
+    The :class:`edifice.App` has a :attr:`edifice.App.query_cache`.
+    """
+
+    def __init__(self, max_entries: int = 256, cache_time: float | None = 300.0):
+        self.max_entries = max_entries
+        self.cache_time = cache_time
+        self._entries: collections.OrderedDict[Hashable, _QueryEntry] = collections.OrderedDict()
+        """
+        key → entry. Ordered from least to most recently used.
+        """
+
+    def _entry(self, key: Hashable) -> _QueryEntry:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _QueryEntry()
+            self._entries[key] = entry
+            self._evict_lru()
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _evict_lru(self):
+        if len(self._entries) <= self.max_entries:
+            return
+        for key, entry in list(self._entries.items()):
+            if len(self._entries) <= self.max_entries:
+                break
+            if len(entry.listeners) == 0 and entry.task is None:
+                self.remove(key)
+
+    def get(self, key: Hashable, stale_time: float = 0.0) -> QueryResult[typing.Any]:
+        """
+        The current :class:`QueryResult` for the :code:`key`, without fetching.
+
+        The :code:`data` is stale if it is older than :code:`stale_time` seconds.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return QueryResult()
+        return QueryResult(
+            data=entry.data,
+            error=entry.error,
+            is_fetching=entry.task is not None,
+            is_stale=self._is_stale(entry, stale_time),
+            updated_at=entry.updated_at,
+        )
+
+    @staticmethod
+    def _is_stale(entry: _QueryEntry, stale_time: float) -> bool:
+        return (
+            entry.invalidated
+            or entry.updated_at is None
+            or asyncio.get_running_loop().time() - entry.updated_at >= stale_time
+        )
+
+    def fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Coroutine[None, None, _T_query]],
+    ) -> asyncio.Task[_T_query]:
+        """
+        Start a fetch for the :code:`key` and return its Task.
+
+        If a fetch for the :code:`key` is already running, then return the running
+        Task instead of starting a new one.
+        """
+        entry = self._entry(key)
+        entry.fetcher = fetcher
+        if entry.task is not None:
+            return entry.task
+        task = asyncio.create_task(fetcher())
+        entry.task = task
+        task.add_done_callback(lambda t: self._on_done(key, entry, t))
+        self._notify(entry)
+        return task
+
+    def _on_done(self, key: Hashable, entry: _QueryEntry, task: asyncio.Task[typing.Any]):
+        if entry.task is task:
+            entry.task = None
+        if task.cancelled():
+            pass
+        elif (exception := task.exception()) is not None:
+            entry.error = exception
+        else:
+            entry.data = task.result()
+            entry.error = None
+            entry.invalidated = False
+            entry.updated_at = asyncio.get_running_loop().time()
+        if self._entries.get(key) is entry:
+            self._notify(entry)
+            self._evict_lru()
+
+    def _notify(self, entry: _QueryEntry):
+        for listener in list(entry.listeners):
+            listener()
+
+    def subscribe(self, key: Hashable, listener: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call the :code:`listener` with no arguments whenever the :class:`QueryResult`
+        for the :code:`key` changes.
+
+        Returns a function which unsubscribes the :code:`listener`.
+        """
+        entry = self._entry(key)
+        if entry.eviction is not None:
+            entry.eviction.cancel()
+            entry.eviction = None
+        entry.listeners.append(listener)
+
+        def unsubscribe():
+            if listener in entry.listeners:
+                entry.listeners.remove(listener)
+            if len(entry.listeners) == 0 and self.cache_time is not None and self._entries.get(key) is entry:
+                entry.eviction = asyncio.get_running_loop().call_later(self.cache_time, lambda: self._expire(key))
+
+        return unsubscribe
+
+    def _expire(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is not None and len(entry.listeners) == 0:
+            self.remove(key)
+
+    def set_data(self, key: Hashable, data: typing.Any):
+        """
+        Set the :code:`data` for the :code:`key` as if it had been fetched now.
+        """
+        entry = self._entry(key)
+        entry.data = data
+        entry.error = None
+        entry.invalidated = False
+        entry.updated_at = asyncio.get_running_loop().time()
+        self._notify(entry)
+
+    def invalidate(self, key: Hashable | None = None):
+        """
+        Mark the :code:`data` for the :code:`key` as stale, or for all keys if
+        :code:`key` is :code:`None`.
+
+        Keys which have listeners are fetched again. The stale :code:`data`
+        is kept until the new fetch succeeds.
+        """
+        keys = list(self._entries) if key is None else [key]
+        for k in keys:
+            entry = self._entries.get(k)
+            if entry is None:
+                continue
+            entry.invalidated = True
+            if len(entry.listeners) > 0 and entry.fetcher is not None:
+                self.fetch(k, entry.fetcher)
+            else:
+                self._notify(entry)
+
+    def remove(self, key: Hashable):
+        """
+        Remove the :code:`key` from the cache and cancel its running fetch.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.eviction is not None:
+            entry.eviction.cancel()
+            entry.eviction = None
+        if entry.task is not None:
+            entry.task.cancel()
+
+    async def aclose(self):
+        """
+        Remove all keys and wait for the running fetches to cancel.
+        """
+        tasks = [entry.task for entry in self._entries.values() if entry.task is not None]
+        for key in list(self._entries):
+            self.remove(key)
+        await asyncio.gather(*tasks, return_exceptions=True)
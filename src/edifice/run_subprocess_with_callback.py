@@ -31,19 +31,37 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import dataclasses
+import mmap
 import multiprocessing
-import multiprocessing.queues
+import multiprocessing.connection
+import multiprocessing.process
+import multiprocessing.resource_tracker
+import os
+import pickle
 import queue
+import secrets
+import struct
+import sys
+import threading
+import time
 import traceback
 import typing
+from multiprocessing import shared_memory
 
 if typing.TYPE_CHECKING:
     from multiprocessing.context import SpawnContext
 
 _T_subprocess = typing.TypeVar("_T_subprocess")
+_T_iterate = typing.TypeVar("_T_iterate")
 _P_callback = typing.ParamSpec("_P_callback")
 
+Delivery = typing.Literal["all", "latest", "batch"] | typing.Callable[[typing.Any, typing.Any], typing.Any]
+"""
+The delivery policy for :code:`callback` calls. See :ref:`Delivery<delivery>`.
+"""
+
 
 @dataclasses.dataclass
 class _EndProcess:
@@ -64,35 +82,472 @@ class _ExceptionWrapper:
     ex_string: list[str]
 
 
-def _run_subprocess(
+@dataclasses.dataclass
+class _SharedMemoryMessage:
+    """
+    A message pickled with protocol 5, with its large out-of-band buffers
+    in shared memory segments.
+    """
+
+    data: bytes
+    segments: list[tuple[str, int]]
+    """
+    (segment name, number of bytes) for each out-of-band buffer.
+    """
+
+
+@dataclasses.dataclass
+class _SharedMemoryConfig:
+    name_prefix: str
+    """
+    Shared memory segment names are the :code:`name_prefix` followed by a
+    sequence number, so that the parent process can find and unlink the
+    segments which it did not receive.
+    """
+    min_bytes: int
+
+
+def _shared_memory_config(shared_memory_min_bytes: int | None) -> _SharedMemoryConfig | None:
+    if shared_memory_min_bytes is None:
+        return None
+    # Short names because macOS limits POSIX shared memory names to 31 characters.
+    return _SharedMemoryConfig(f"edf{secrets.token_hex(4)}_", max(1, shared_memory_min_bytes))
+
+
+class _SharedMemorySender:
+    """
+    Child side. Put messages on the queue as :class:`_SharedMemoryMessage`.
+    """
+
+    def __init__(self, config: _SharedMemoryConfig, callback_send: _PipeSender):
+        self._config = config
+        self._callback_send = callback_send
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    def _next_name(self) -> str:
+        # The subprocess may call the callback from more than one thread.
+        with self._lock:
+            name = f"{self._config.name_prefix}{self._sequence}"
+            self._sequence += 1
+        return name
+
+    def put(self, message: typing.Any) -> None:
+        segments: list[tuple[str, int]] = []
+
+        def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+            raw = buffer.raw()
+            if raw.nbytes < self._config.min_bytes or sys.platform == "win32":
+                # Pickle this buffer in-band. On Windows a segment is freed
+                # when its last handle is closed, which is before the main
+                # process could open it.
+                return True
+            shm = shared_memory.SharedMemory(name=self._next_name(), create=True, size=raw.nbytes)
+            try:
+                shm.buf[: raw.nbytes] = raw
+                segments.append((shm.name, raw.nbytes))
+            finally:
+                shm.close()
+            return False
+
+        data = pickle.dumps(message, protocol=5, buffer_callback=buffer_callback)
+        self._callback_send.put(_SharedMemoryMessage(data, segments))
+
+
+def _attach_shared_memory(name: str, nbytes: int) -> memoryview:
+    """
+    Map a shared memory segment and unlink it.
+
+    On Linux the segment is a file in :code:`/dev/shm`, so map the file
+    ourselves and return a view of the mapping which lives exactly as long
+    as the objects which are unpickled from it, so that the memory is freed
+    when the last array view is garbage-collected.
+
+    On other platforms copy the segment out and close it.
+    """
+    if sys.platform == "linux":
+        path = os.path.join("/dev/shm", name)  # noqa: S108
+        try:
+            fd = os.open(path, os.O_RDWR)
+        except OSError:
+            pass
+        else:
+            try:
+                mapping = mmap.mmap(fd, nbytes)
+            finally:
+                os.close(fd)
+            try:
+                # The mapping stays valid after the file is unlinked.
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            else:
+                # Same as SharedMemory.unlink().
+                multiprocessing.resource_tracker.unregister(f"/{name}", "shared_memory")
+            return memoryview(mapping)
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf[:nbytes] as view:
+            buffer = bytearray(view)
+    finally:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    return memoryview(buffer)
+
+
+class _SharedMemoryReceiver:
+    """
+    Parent side. Unpickle :class:`_SharedMemoryMessage`, and unlink the
+    segments of messages which were never received.
+    """
+
+    def __init__(self, config: _SharedMemoryConfig):
+        self._config = config
+        self._received: set[int] = set()
+        self.complete = False
+        """
+        The job ended normally, so all of the segments were received.
+        """
+
+    def loads(self, message: _SharedMemoryMessage) -> typing.Any:
+        buffers = []
+        for name, nbytes in message.segments:
+            self._received.add(int(name.removeprefix(self._config.name_prefix)))
+            buffers.append(_attach_shared_memory(name, nbytes))
+        return pickle.loads(message.data, buffers=buffers)  # noqa: S301
+
+    def unlink_remaining(self) -> None:
+        """
+        Unlink the segments which the subprocess created but we did not
+        receive, because the subprocess was terminated or crashed.
+
+        The received segments are unlinked when they are attached, so if
+        the job ended normally there is nothing to unlink.
+        """
+        if self.complete:
+            return
+        misses = 0
+        sequence = 0
+        last_received = max(self._received, default=-1)
+        # Sequence numbers might not arrive in order if the subprocess
+        # calls the callback from more than one thread, so look a little
+        # past the last segment we can find.
+        while misses < 16 or sequence <= last_received:
+            if sequence not in self._received:
+                try:
+                    shm = shared_memory.SharedMemory(name=f"{self._config.name_prefix}{sequence}")
+                except FileNotFoundError:
+                    misses += 1
+                else:
+                    misses = 0
+                    shm.unlink()
+                    shm.close()
+            sequence += 1
+
+
+@dataclasses.dataclass
+class _DeliveryConfig:
+    delivery: Delivery
+    interval: float
+
+
+def _delivery_config(delivery: Delivery, delivery_interval: float) -> _DeliveryConfig | None:
+    if delivery == "all":
+        return None
+    return _DeliveryConfig(delivery, delivery_interval)
+
+
+class _Coalescer:
+    """
+    Coalesce the arguments of callback calls into one pending callback call,
+    according to the delivery policy.
+    """
+
+    def __init__(self, delivery: Delivery):
+        self._delivery = delivery
+        self._pending: tuple[tuple[typing.Any, ...], dict[str, typing.Any]] | None = None
+
+    def add(self, args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any], *, coalesced: bool) -> None:
+        """
+        Add the arguments of one callback call or, if coalesced, of one
+        callback message which was already coalesced by the subprocess.
+        """
+        if self._delivery == "latest":
+            self._pending = (args, kwargs)
+            return
+        if len(args) != 1 or len(kwargs) > 0:
+            raise TypeError(f"delivery {self._delivery!r} requires exactly one positional callback argument")
+        value = args[0]
+        if self._delivery == "batch":
+            values = value if coalesced else [value]
+            if self._pending is None:
+                self._pending = ((values,), {})
+            else:
+                self._pending[0][0].extend(values)
+        elif self._pending is None:
+            self._pending = ((value,), {})
+        else:
+            reducer = typing.cast(typing.Callable[[typing.Any, typing.Any], typing.Any], self._delivery)
+            self._pending = ((reducer(self._pending[0][0], value),), {})
+
+    def take(self) -> tuple[tuple[typing.Any, ...], dict[str, typing.Any]] | None:
+        pending = self._pending
+        self._pending = None
+        return pending
+
+
+class _CoalescingSender:
+    """
+    Child side. Coalesce callback calls and put at most one callback
+    message per delivery interval.
+    """
+
+    def __init__(self, config: _DeliveryConfig, sender: _PipeSender | _SharedMemorySender):
+        self._interval = config.interval
+        self._sender = sender
+        self._coalescer = _Coalescer(config.delivery)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def callback(self, args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any]) -> None:
+        with self._lock:
+            self._coalescer.add(args, kwargs, coalesced=False)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+                self._thread.start()
+        self._ready.set()
+
+    def _flush(self) -> None:
+        with self._lock:
+            message = self._coalescer.take()
+        if message is not None:
+            self._sender.put(message)
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._ready.wait()
+            self._ready.clear()
+            if self._closed:
+                return
+            self._flush()
+            time.sleep(self._interval)
+
+    def close(self) -> None:
+        """
+        Stop the flush thread and put the last pending callback message.
+        """
+        self._closed = True
+        self._ready.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._flush()
+
+
+_FRAME_HEADER = struct.Struct("<Q")
+"""
+Each callback message frame is the length of the pickled message followed by the pickled message.
+"""
+
+
+class _PipeSender:
+    """
+    Child side of the callback message transport.
+
+    Each message is pickled immediately by :code:`put`, so pickling errors
+    raise in the caller. A writer thread writes all of the pending message
+    frames with one :code:`send_bytes`, so a burst of many small messages
+    costs one pipe write instead of one pipe write per message.
+    """
+
+    def __init__(self, connection: multiprocessing.connection.Connection):
+        self._connection = connection
+        self._condition = threading.Condition()
+        self._frames: list[bytes] = []
+        self._writing = False
+        self._broken = False
+        self._thread: threading.Thread | None = None
+
+    def put(self, message: typing.Any) -> None:
+        data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._condition:
+            self._frames.append(_FRAME_HEADER.pack(len(data)))
+            self._frames.append(data)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._condition:
+                while len(self._frames) == 0:
+                    self._condition.wait()
+                frames = self._frames
+                self._frames = []
+                self._writing = True
+            try:
+                self._connection.send_bytes(b"".join(frames))
+            except OSError:
+                # The main process closed the pipe.
+                with self._condition:
+                    self._broken = True
+                    self._writing = False
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """
+        Wait until all of the messages have been written to the pipe.
+        """
+        with self._condition:
+            while (len(self._frames) > 0 or self._writing) and not self._broken:
+                self._condition.wait()
+
+
+class _PipeReceiver:
+    """
+    Main process side of the callback message transport.
+
+    Reads all of the available writes from the pipe at once and splits them
+    into messages.
+    """
+
+    def __init__(self, connection: multiprocessing.connection.Connection):
+        self._connection = connection
+        self._messages: collections.deque[typing.Any] = collections.deque()
+
+    def fileno(self) -> int:
+        return self._connection.fileno()
+
+    def _read(self) -> None:
+        while self._connection.poll():
+            try:
+                chunk = memoryview(self._connection.recv_bytes())
+            except EOFError:
+                # The subprocess has exited.
+                return
+            offset = 0
+            while offset < len(chunk):
+                (length,) = _FRAME_HEADER.unpack_from(chunk, offset)
+                offset += _FRAME_HEADER.size
+                self._messages.append(pickle.loads(chunk[offset : offset + length]))  # noqa: S301
+                offset += length
+
+    def get_nowait(self) -> typing.Any:
+        """
+        Raise queue.Empty if there is no message.
+        """
+        if len(self._messages) == 0:
+            self._read()
+        if len(self._messages) == 0:
+            raise queue.Empty
+        return self._messages.popleft()
+
+    def empty(self) -> bool:
+        if len(self._messages) == 0:
+            self._read()
+        return len(self._messages) == 0
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def _run_job(
     subprocess: typing.Callable[[typing.Callable[_P_callback, None]], _T_subprocess],
-    callback_send: multiprocessing.queues.Queue,
+    callback_send: _PipeSender,
+    shared_memory_config: _SharedMemoryConfig | None,
+    delivery_config: _DeliveryConfig | None,
 ) -> None:
+    sender = callback_send if shared_memory_config is None else _SharedMemorySender(shared_memory_config, callback_send)
+    coalescing = None if delivery_config is None else _CoalescingSender(delivery_config, sender)
 
     def _run_callback(*args: _P_callback.args, **kwargs: _P_callback.kwargs) -> None:
-        callback_send.put((args, kwargs))
+        if coalescing is None:
+            sender.put((args, kwargs))
+        else:
+            coalescing.callback(args, kwargs)
 
     try:
         r = subprocess(_run_callback)
     except BaseException as e:  # noqa: BLE001
-        callback_send.put(_ExceptionWrapper(e, traceback.format_exception(e)))
+        final: _EndProcess | _ExceptionWrapper = _ExceptionWrapper(e, traceback.format_exception(e))
     else:
-        callback_send.put(_EndProcess(r))
+        final = _EndProcess(r)
+    if coalescing is not None:
+        coalescing.close()
+    try:
+        sender.put(final)
+    except Exception as e:  # noqa: BLE001
+        # For example the return value is not picklable.
+        sender.put(_ExceptionWrapper(e, traceback.format_exception(e)))
+    callback_send.flush()
 
-    # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Queue.join_thread
-    # > “By default if a process is not the creator of the queue then on
-    # > exit it will attempt to join the queue's background thread.”
-    #
-    # https://docs.python.org/3/library/multiprocessing.html#pipes-and-queues
-    # > “if a child process has put items on a queue (and it has not used
-    # > JoinableQueue.cancel_join_thread), then that process will not
-    # > terminate until all buffered items have been flushed to the pipe.”
+
+def _run_subprocess(
+    subprocess: typing.Callable[[typing.Callable[_P_callback, None]], _T_subprocess],
+    callback_send: multiprocessing.connection.Connection,
+    shared_memory_config: _SharedMemoryConfig | None = None,
+    delivery_config: _DeliveryConfig | None = None,
+) -> None:
+    # _run_job flushes all of the messages to the pipe before it returns,
+    # so the main process will receive all of the messages before it sees
+    # that this process has exited.
+    _run_job(subprocess, _PipeSender(callback_send), shared_memory_config, delivery_config)
+
+
+def _run_subprocess_iterator(
+    subprocess: typing.Callable[[typing.Callable[[_T_iterate], None]], None],
+    callback_send: multiprocessing.connection.Connection,
+    buffer_semaphore: typing.Any,
+) -> None:
+    """
+    The main function of an iterate_subprocess Process.
+    """
+
+    def subprocess_backpressure(callback: typing.Callable[[_T_iterate], None]) -> None:
+        def send(value: _T_iterate) -> None:
+            # Block while the buffer is full.
+            buffer_semaphore.acquire()
+            callback(value)
+
+        subprocess(send)
+
+    _run_subprocess(subprocess_backpressure, callback_send)
+
+
+def _run_worker(
+    job_receive: multiprocessing.connection.Connection,
+    callback_send: multiprocessing.connection.Connection,
+    initializer: typing.Callable[..., object] | None,
+    initargs: tuple[typing.Any, ...],
+) -> None:
+    """
+    The main function of a SubprocessPool worker Process.
+    Run jobs until the job is None.
+    """
+    if initializer is not None:
+        initializer(*initargs)
+    sender = _PipeSender(callback_send)
+    while (job := job_receive.recv()) is not None:
+        subprocess, shared_memory_config, delivery_config = job
+        _run_job(subprocess, sender, shared_memory_config, delivery_config)
 
 
 async def run_subprocess_with_callback(
     subprocess: typing.Callable[[typing.Callable[_P_callback, None]], _T_subprocess],
     callback: typing.Callable[_P_callback, None],
     daemon: bool | None = None,
+    shared_memory_min_bytes: int | None = None,
+    delivery: Delivery = "all",
+    delivery_interval: float = 1 / 60,
 ) -> _T_subprocess:
     """
     Run a
@@ -117,6 +572,21 @@ async def run_subprocess_with_callback(
             Optional argument which will be passed to the Process
             `daemon <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.daemon>`_
             argument.
+        shared_memory_min_bytes:
+            Optional size threshold in bytes. If not :code:`None`, then
+            buffers at least this large in the :code:`callback` arguments and the
+            return value, like NumPy arrays, are transferred through shared memory
+            instead of through the pipe. The main process receives views of the
+            shared memory without copying only on Linux.
+            See :ref:`Shared memory<shared_memory>`.
+        delivery:
+            The delivery policy for :code:`callback` calls,
+            :code:`"all"`, :code:`"latest"`, :code:`"batch"`, or a reducer function.
+            See :ref:`Delivery<delivery>`.
+        delivery_interval:
+            For a :code:`delivery` policy other than :code:`"all"`,
+            the minimum interval in seconds between :code:`callback` messages
+            from the :code:`subprocess`. Default is one 60Hz frame.
 
     The advantage of :func:`run_subprocess_with_callback` over
     `run_in_executor <https://docs.python.org/3/library/asyncio-eventloop.html#asyncio.loop.run_in_executor>`_
@@ -136,6 +606,9 @@ async def run_subprocess_with_callback(
 
     While the :code:`subprocess` is running, it may call the supplied :code:`callback` function.
     The :code:`callback` function will run in the main event loop of the calling process.
+    The event loop is woken when a :code:`callback` message arrives or the :code:`subprocess`
+    exits, so the :code:`callback` runs promptly and an idle :code:`subprocess`
+    costs nothing in the main process.
 
     The :code:`subprocess` will be started with the
     `"spawn" start method <https://docs.python.org/3/library/multiprocessing.html#contexts-and-start-methods>`_,
@@ -300,6 +773,96 @@ async def run_subprocess_with_callback(
     which will be propagated and re-raised from
     :func:`run_subprocess_with_callback` in the usual way.
 
+    .. _delivery:
+
+    Delivery
+    ^^^^^^^^
+
+    If the :code:`subprocess` calls the :code:`callback` thousands of times per
+    second, for example to report progress, then sending every call to the main
+    process and running every :code:`callback` there is wasteful, because the
+    main process can only render once per frame.
+
+    The :code:`delivery` argument coalesces :code:`callback` calls in the
+    :code:`subprocess`, which sends at most one :code:`callback` message per
+    :code:`delivery_interval`.
+    The main process coalesces again all of the messages which arrive together,
+    and calls the :code:`callback` once.
+    Pending calls are always delivered before the :code:`subprocess` returns.
+
+    :code:`"all"`
+        Default. Every :code:`callback` call is delivered, in order.
+
+    :code:`"latest"`
+        Only the latest :code:`callback` call is delivered.
+
+    :code:`"batch"`
+        The :code:`subprocess` calls the :code:`callback` with one argument,
+        and the main process :code:`callback` is called with a :code:`list`
+        of the arguments of all of the coalesced calls, in order.
+
+    A reducer function :code:`reducer(accumulated, value) -> accumulated`
+        The :code:`subprocess` calls the :code:`callback` with one argument,
+        and the main process :code:`callback` is called with the reduction
+        of the coalesced arguments. The reducer must be picklable and associative,
+        because it reduces in both processes.
+
+    .. code-block:: python
+        :caption: Example delivery
+
+        def my_subprocess(callback: Callable[[int], None]) -> str:
+            for i in range(1_000_000):
+                callback(i)
+            return "done"
+
+        await run_subprocess_with_callback(
+            my_subprocess,
+            lambda i: progress_set(i),
+            delivery="latest",
+        )
+
+    .. _shared_memory:
+
+    Shared memory
+    ^^^^^^^^^^^^^
+
+    Normally the :code:`callback` arguments and the return value are pickled,
+    copied through a pipe, and unpickled, which is slow for large arrays.
+
+    With the :code:`shared_memory_min_bytes` argument, they are pickled with
+    `pickle protocol 5 <https://docs.python.org/3/library/pickle.html#out-of-band-buffers>`_
+    and every out-of-band buffer at least that large, like the data of a contiguous
+    NumPy array, is copied once into a new
+    `SharedMemory <https://docs.python.org/3/library/multiprocessing.shared_memory.html>`_
+    segment.
+    Zero-copy transfer is only on Linux. There, in the main process the
+    unpickled array is a view of the shared memory, without copying, and the
+    shared memory is freed when the last view of the array in the main
+    process is garbage-collected.
+
+    On macOS and other POSIX platforms, the main process copies each segment
+    out once and frees it immediately, so the unpickled array is not a view
+    of the shared memory.
+
+    On Windows, :code:`shared_memory_min_bytes` has no effect and all buffers
+    are transferred through the pipe, because a Windows shared memory segment
+    is freed as soon as the subprocess closes it.
+    Shared memory segments which were not yet received when the :code:`subprocess`
+    is cancelled or crashes are unlinked.
+
+    .. code-block:: python
+        :caption: Example shared memory
+
+        def my_subprocess(callback: Callable[[np.ndarray], None]) -> np.ndarray:
+            callback(np.zeros((1000, 1000)))
+            return np.ones((10000, 10000))
+
+        a = await run_subprocess_with_callback(
+            my_subprocess,
+            my_callback,
+            shared_memory_min_bytes=1024 * 1024,
+        )
+
     PyInstaller
     ^^^^^^^^^^^
 
@@ -319,125 +882,542 @@ async def run_subprocess_with_callback(
     """
 
 
-    # multiprocessing.Queue can only be used with spawn startmethod
-    # if we get it from a spawn context.
-    # https://stackoverflow.com/questions/34847203/queue-objects-should-only-be-shared-between-processes-through-inheritance
+    # The callback message pipe must be passed to the constructor
+    # of the Process object.
     # https://docs.python.org/3/library/multiprocessing.html#contexts-and-start-methods
-    #
-    # “You generally can't pass a multiprocessing.Queue as argument after a
-    # Process has already started, you need to pass it already to the constructor
-    # of the Process object.”
-    # https://stackoverflow.com/questions/63419229/passing-a-queue-with-concurrent-futures-regardless-of-executor-type#comment112144271_63419229
 
     spawncontext: SpawnContext = multiprocessing.get_context("spawn")
-    callback_send = spawncontext.Queue()
+    callback_receive_connection, callback_send = spawncontext.Pipe(duplex=False)
+    callback_receive = _PipeReceiver(callback_receive_connection)
+    shared_memory_config = _shared_memory_config(shared_memory_min_bytes)
     proc = spawncontext.Process(
         group=None,
         target=_run_subprocess,
-        args=(subprocess, callback_send),
+        args=(subprocess, callback_send, shared_memory_config, _delivery_config(delivery, delivery_interval)),
         daemon=daemon,
     )
-    # We alternate waiting on the queue and waiting on the event loop.
-    # There is no good way in Python to wait on both at the same time.
-    # Mostly we wait on the event loop, and poll the queue.
-    # Because we want to be able to cancel the task.
-    # Because then the event loop can run.
-    # Unfortunately this means
-    #   1. We raise queue.Empty errors all the time internally.
-    #   2. There is an extra <100ms delay calling the callback.
-    #   3. There is some extra CPU busy-waiting while the subprocess is running.
+    shared_memory = None if shared_memory_config is None else _SharedMemoryReceiver(shared_memory_config)
     proc.start()
-    while True:
-        try:
-            while True:
-                # Pull messages out of the queue as fast as we can until
-                # the queue is empty.
-                # Then wait on the event loop for 100ms and check the queue
-                # again.
-                message = callback_send.get_nowait()
-                match message:
-                    case _EndProcess(r):
-                        # subprocess returned
-                        proc.join()  # We know that process end is imminent.
-                        return r
-                    case _ExceptionWrapper(ex, ex_string):
-                        # subprocess raised an exception
-                        if hasattr(ex, "add_note"):
-                            # https://docs.python.org/3/library/exceptions.html#BaseException.add_note
-                            ex.add_note("".join(ex_string))  # type: ignore  # noqa: PGH003
-                        proc.join()  # We know that process end is imminent.
-                        raise ex  # including CancelledError
-                    case (args, kwargs):
-                        # subprocess called callback
-                        try:
-                            callback(*args, **kwargs)  # type: ignore  # noqa: PGH003
-                        except:  # noqa: S110, E722
-                            # We suppress exceptions in the callback.
-                            # TODO I don't like suppressing exceptions but
-                            # but it's tricky to decide what to do with them
-                            # here. If we raise them then we must also
-                            # terminate the subprocess.
-                            pass
-                    case _:
-                        raise RuntimeError("unreachable")
-        except queue.Empty:
-            pass
-        # Can the callback_send queue raise any other kind of exception?
-        if not proc.is_alive() and callback_send.empty():
-            # Is that extra empty() check necessary and sufficient to avoid a
-            # race condition when the process returns normally and exits?
-            # Yes, because
-            # https://docs.python.org/3/library/multiprocessing.html#pipes-and-queues
-            # > “if a child process has put items on a queue (and it has not used
-            # > JoinableQueue.cancel_join_thread), then that process will not
-            # > terminate until all buffered items have been flushed to the pipe.”
-            #
-            # This is a lot of extra system calls, too bad we have to poll like this.
-            raise multiprocessing.ProcessError(f"subprocess exited with code {proc.exitcode}")
-        try:
-            await asyncio.sleep(0.1)  # CancelledError can be raised here
-        except asyncio.CancelledError:
-            # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.terminate
-            # > “Warning: If this method is used when the associated process is
-            # > using a pipe or queue then the pipe or queue is liable to become
-            # corrupted and may become unusable by other process.”
-            #
-            # Really?
+    # Close our copy of the send end so that the pipe reaches EOF
+    # when the subprocess exits.
+    callback_send.close()
+    try:
+        message = await _receive_messages(proc, callback_receive, callback, shared_memory, delivery)
+    except asyncio.CancelledError:
+        _terminate(proc, callback_receive)
+        raise
+    finally:
+        if shared_memory is not None:
+            shared_memory.unlink_remaining()
+        callback_receive.close()
+    proc.join()  # We know that process end is imminent.
+    return _unwrap_result(message)
+
+
+async def iterate_subprocess(
+    subprocess: typing.Callable[[typing.Callable[[_T_iterate], None]], None],
+    max_buffer: int = 16,
+    daemon: bool | None = None,
+) -> typing.AsyncGenerator[_T_iterate, None]:
+    """
+    Run a :code:`subprocess` function in a
+    `Process <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process>`_
+    and iterate over the values which it sends.
 
-            # https://docs.python.org/3/library/multiprocessing.html#pipes-and-queues
-            # > “Warning If a process is killed using Process.terminate() while
-            # > it is trying to use a Queue, then the data in the queue is
-            # > likely to become corrupted. This may cause any other process to
-            # get an exception when it tries to use the queue later on.”
-            #
-            # What kind of exception?
+    Args:
+        subprocess:
+            The function to run in a
+            `Process <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process>`_.
+            This :code:`subprocess` function takes a single argument: a :code:`send`
+            function which takes one value.
+            The :code:`subprocess` function must be picklable.
+            All of the values must be picklable.
+        max_buffer:
+            The maximum number of values which have been sent by the :code:`subprocess`
+            but not yet consumed by the :code:`async for` loop.
+            When the buffer is full, the :code:`send` function blocks.
+        daemon:
+            Optional argument which will be passed to the Process
+            `daemon <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.daemon>`_
+            argument.
+
+    This is the pull-style counterpart of :func:`run_subprocess_with_callback`.
+    The :code:`callback` of :func:`run_subprocess_with_callback` is called
+    for every message, so if the main process is slower than the :code:`subprocess`
+    then the messages pile up in memory without limit.
+    With :func:`iterate_subprocess` the :code:`subprocess` waits for the
+    :code:`async for` loop, so memory stays bounded.
+
+    The iteration ends when the :code:`subprocess` returns.
+    An exception raised in the :code:`subprocess` is re-raised from the
+    :code:`async for` loop.
+    If the :code:`subprocess` exits abnormally then the :code:`async for` loop raises
+    `ProcessError <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.ProcessError>`_.
+
+    The :code:`subprocess` is terminated when the iterator is closed before the
+    iteration ends, for example by :code:`break` or by cancellation of the
+    :func:`edifice.use_async` Hook.
+    Use
+    `contextlib.aclosing <https://docs.python.org/3/library/contextlib.html#contextlib.aclosing>`_
+    to close the iterator promptly, instead of when it is garbage-collected.
+
+    .. code-block:: python
+        :caption: Example iterate_subprocess
+
+        def my_subprocess(send: Callable[[int], None]) -> None:
+            # This function will run in a new Process.
+            for i in range(1_000_000):
+                send(i)
+
+        @component
+        def Progress(self):
+            x, x_set = use_state(0)
+
+            async def consume() -> None:
+                async with contextlib.aclosing(iterate_subprocess(my_subprocess)) as values:
+                    async for i in values:
+                        x_set(i)
+
+            use_async(consume)
+            Label(str(x))
+    """
+    spawncontext: SpawnContext = multiprocessing.get_context("spawn")
+    buffer_semaphore = spawncontext.Semaphore(max_buffer)
+    callback_receive_connection, callback_send = spawncontext.Pipe(duplex=False)
+    callback_receive = _PipeReceiver(callback_receive_connection)
+    proc = spawncontext.Process(
+        group=None,
+        target=_run_subprocess_iterator,
+        args=(subprocess, callback_send, buffer_semaphore),
+        daemon=daemon,
+    )
+    proc.start()
+    callback_send.close()
+    wakeup = _Wakeup(asyncio.get_running_loop(), [callback_receive.fileno(), proc.sentinel])
+    try:
+        while True:
+            try:
+                message = callback_receive.get_nowait()
+            except queue.Empty:
+                if not proc.is_alive() and callback_receive.empty():
+                    raise multiprocessing.ProcessError(f"subprocess exited with code {proc.exitcode}") from None
+                await wakeup.wait()  # CancelledError can be raised here
+                continue
+            match message:
+                case _EndProcess() | _ExceptionWrapper():
+                    proc.join()  # We know that process end is imminent.
+                    _unwrap_result(message)
+                    return
+                case ((value,), _):
+                    yield value
+                    buffer_semaphore.release()
+                case _:
+                    raise RuntimeError("unreachable")
+    finally:
+        wakeup.close()
+        if proc.is_alive():
+            _terminate(proc, callback_receive)
+        else:
+            proc.join()
+            callback_receive.close()
+
+
+def _unwrap_result(message: _EndProcess | _ExceptionWrapper) -> typing.Any:
+    match message:
+        case _EndProcess(r):
+            # subprocess returned
+            return r
+        case _ExceptionWrapper(ex, ex_string):
+            # subprocess raised an exception
+            if hasattr(ex, "add_note"):
+                # https://docs.python.org/3/library/exceptions.html#BaseException.add_note
+                ex.add_note("".join(ex_string))  # type: ignore  # noqa: PGH003
+            raise ex  # including CancelledError
+
+
+async def _receive_messages(
+    proc: multiprocessing.process.BaseProcess,
+    callback_receive: _PipeReceiver,
+    callback: typing.Callable[..., None],
+    shared_memory: _SharedMemoryReceiver | None = None,
+    delivery: Delivery = "all",
+) -> _EndProcess | _ExceptionWrapper:
+    """
+    Call the callback for each callback message from the subprocess job
+    until the job ends, and return the final message of the job.
+
+    For a delivery policy other than "all", coalesce the callback messages
+    which arrive together into one callback call.
 
-            # Windows
-            # https://learn.microsoft.com/en-us/windows/win32/api/processthreadsapi/nf-processthreadsapi-terminateprocess#remarks
-            # > “The terminated process cannot exit until all pending I/O has
-            # > been completed or canceled.”
+    Raise ProcessError if the process exits before the job ends.
+    """
+    # Wait on the event loop until either the pipe has a message or the
+    # process has exited. The process sentinel becomes readable when the
+    # process exits.
+    wakeup = _Wakeup(asyncio.get_running_loop(), [callback_receive.fileno(), proc.sentinel])
+    coalescer = None if delivery == "all" else _Coalescer(delivery)
 
-            proc.terminate()
+    def deliver_coalesced() -> None:
+        if coalescer is not None and (pending := coalescer.take()) is not None:
+            _call_callback(callback, *pending)
 
-            # https://docs.python.org/3/library/multiprocessing.html#pipes-and-queues
-            # > ”This means that if you try joining that process you may get a
-            # > deadlock unless you are sure that all items which have been put
-            # > on the queue have been consumed.”
+    try:
+        while True:
             try:
                 while True:
-                    callback_send.get_nowait()
+                    # Pull messages out of the pipe as fast as we can until
+                    # the pipe is empty.
+                    message = callback_receive.get_nowait()
+                    if shared_memory is not None and isinstance(message, _SharedMemoryMessage):
+                        message = shared_memory.loads(message)
+                    match message:
+                        case _EndProcess() | _ExceptionWrapper():
+                            if shared_memory is not None:
+                                shared_memory.complete = True
+                            deliver_coalesced()
+                            return message
+                        case (args, kwargs):
+                            # subprocess called callback
+                            if coalescer is None:
+                                _call_callback(callback, args, kwargs)
+                            else:
+                                coalescer.add(args, kwargs, coalesced=True)
+                        case _:
+                            raise RuntimeError("unreachable")
             except queue.Empty:
                 pass
+            deliver_coalesced()
+            if not proc.is_alive() and callback_receive.empty():
+                # Is that extra empty() check necessary and sufficient to avoid a
+                # race condition when the process returns normally and exits?
+                # Yes, because the subprocess flushes all of its messages to the
+                # pipe before it exits, and the pipe keeps them after it exits.
+                raise multiprocessing.ProcessError(f"subprocess exited with code {proc.exitcode}")
+            await wakeup.wait()  # CancelledError can be raised here
+    finally:
+        wakeup.close()
+
+
+def _call_callback(
+    callback: typing.Callable[..., None],
+    args: tuple[typing.Any, ...],
+    kwargs: dict[str, typing.Any],
+) -> None:
+    try:
+        callback(*args, **kwargs)
+    except:  # noqa: S110, E722
+        # We suppress exceptions in the callback.
+        # TODO I don't like suppressing exceptions but
+        # but it's tricky to decide what to do with them
+        # here. If we raise them then we must also
+        # terminate the subprocess.
+        pass
 
-            # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.join
-            proc.join()
 
-            # proc.close()?
-            # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.close
-            # https://stackoverflow.com/questions/58866837/python3-multiprocessing-terminate-vs-kill-vs-close/58866932#58866932
-            # > “close allows you to ensure the resources are definitely cleaned at a
-            # > specific point in time”
-            # We don't need to call close() because we are not worried about
-            # the OS running out of file descriptors.
+class _Wakeup:
+    """
+    Wake up an awaiting coroutine when any of some file descriptors
+    becomes readable, instead of polling.
+
+    On Windows the pipe handles and process sentinels are not sockets, so
+    they cannot be watched by
+    `add_reader <https://docs.python.org/3/library/asyncio-eventloop.html#asyncio.loop.add_reader>`_.
+    The qasync event loop accepts them anyway and never wakes up, so on
+    Windows, or if the event loop does not support add_reader, fall back
+    to polling every 100ms.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, fds: list[int]):
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._fds: list[int] = []
+        self.event_driven = sys.platform != "win32"
+        if not self.event_driven:
+            return
+        try:
+            for fd in fds:
+                # add_reader is level-triggered, so if a file descriptor is
+                # still readable after we wake up then we will wake up again.
+                loop.add_reader(fd, self._event.set)
+                self._fds.append(fd)
+        except NotImplementedError:
+            self.close()
+            self.event_driven = False
+
+    async def wait(self) -> None:
+        if self.event_driven:
+            await self._event.wait()
+            self._event.clear()
+        else:
+            await asyncio.sleep(0.1)
+
+    def close(self) -> None:
+        for fd in self._fds:
+            self._loop.remove_reader(fd)
+        self._fds.clear()
+
+
+def _terminate(proc: multiprocessing.process.BaseProcess, callback_receive: _PipeReceiver) -> None:
+    """
+    Terminate the subprocess after cancellation.
+    """
+    # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.terminate
+    # > “Warning: If this method is used when the associated process is
+    # > using a pipe or queue then the pipe or queue is liable to become
+    # corrupted and may become unusable by other process.”
+    #
+    # Really?
+
+    # https://docs.python.org/3/library/multiprocessing.html#pipes-and-queues
+    # > “Warning If a process is killed using Process.terminate() while
+    # > it is trying to use a Queue, then the data in the queue is
+    # > likely to become corrupted. This may cause any other process to
+    # get an exception when it tries to use the queue later on.”
+    #
+    # What kind of exception?
+
+    # Windows
+    # https://learn.microsoft.com/en-us/windows/win32/api/processthreadsapi/nf-processthreadsapi-terminateprocess#remarks
+    # > “The terminated process cannot exit until all pending I/O has
+    # > been completed or canceled.”
+
+    proc.terminate()
+
+    # Close the pipe instead of draining it, because the subprocess may have
+    # been terminated in the middle of a write. If the subprocess is blocked
+    # writing to the pipe then the write will fail, so the subprocess can exit.
+    callback_receive.close()
+
+    # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.join
+    proc.join()
+
+    # proc.close()?
+    # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.close
+    # https://stackoverflow.com/questions/58866837/python3-multiprocessing-terminate-vs-kill-vs-close/58866932#58866932
+    # > “close allows you to ensure the resources are definitely cleaned at a
+    # > specific point in time”
+    # We don't need to call close() because we are not worried about
+    # the OS running out of file descriptors.
+
 
-            raise
+@dataclasses.dataclass
+class _PoolWorker:
+    proc: multiprocessing.process.BaseProcess
+    job_send: multiprocessing.connection.Connection
+    callback_receive: _PipeReceiver
+
+
+class SubprocessPool:
+    """
+    A pool of long-lived worker
+    `Processes <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process>`_
+    for running :code:`subprocess` functions with :func:`SubprocessPool.run`.
+
+    Args:
+        max_workers:
+            The maximum number of worker processes. Default is
+            `os.cpu_count() <https://docs.python.org/3/library/os.html#os.cpu_count>`_.
+        initializer:
+            Optional picklable function which each worker process will call
+            once when it starts, with the :code:`initargs`.
+            Use this to import heavy modules and load data before the first job.
+        initargs:
+            Arguments for the :code:`initializer`.
+        start_method:
+            The
+            `start method <https://docs.python.org/3/library/multiprocessing.html#contexts-and-start-methods>`_
+            for worker processes, :code:`"spawn"` or :code:`"forkserver"`.
+        preload:
+            For the :code:`"forkserver"` start method, a list of module names
+            which the fork server will
+            `preload <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.set_forkserver_preload>`_,
+            so that each new worker process starts with those modules already imported.
+
+            The fork server and its preload list are global to the Python process,
+            so this replaces the preload list for every :code:`"forkserver"`
+            process started afterwards, also outside of this pool,
+            and it has no effect if the fork server is already running.
+        daemon:
+            Optional argument which will be passed to the worker Process
+            `daemon <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Process.daemon>`_
+            argument.
+
+    :func:`run_subprocess_with_callback` starts a new process for every call,
+    which can take hundreds of milliseconds if the :code:`subprocess` imports
+    large modules.
+    A :class:`SubprocessPool` keeps its worker processes running between jobs,
+    so each worker process pays the startup cost only once.
+
+    :func:`SubprocessPool.run` has the same behavior as :func:`run_subprocess_with_callback`
+    for the :code:`callback`, for exceptions, and for cancellation.
+    If :func:`SubprocessPool.run` is cancelled then its worker process will be
+    terminated and replaced by a new worker process.
+
+    Worker processes are started when they are first needed.
+    Call :func:`SubprocessPool.shutdown` to terminate all of the worker processes,
+    or use the :class:`SubprocessPool` as a context manager.
+
+    .. code-block:: python
+        :caption: Example SubprocessPool
+
+        def init_worker() -> None:
+            import torch  # Import once per worker process.
+
+        def my_subprocess(x: int, callback: Callable[[int], None]) -> int:
+            callback(1)
+            return x * 2
+
+        async def main() -> None:
+            with SubprocessPool(max_workers=2, initializer=init_worker) as pool:
+                y = await pool.run(functools.partial(my_subprocess, 21), print)
+
+    In an Edifice :func:`@component<edifice.component>`, use the
+    :func:`edifice.use_subprocess_pool` Hook to create a pool which shuts down
+    when the component unmounts.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        initializer: typing.Callable[..., object] | None = None,
+        initargs: tuple[typing.Any, ...] = (),
+        start_method: typing.Literal["spawn", "forkserver"] = "spawn",
+        preload: list[str] | None = None,
+        daemon: bool | None = None,
+    ):
+        self._context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver" and preload is not None:
+            self._context.set_forkserver_preload(preload)  # type: ignore  # noqa: PGH003
+        self._max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self._initializer = initializer
+        self._initargs = initargs
+        self._daemon = daemon
+        self._workers: list[_PoolWorker] = []
+        """
+        All of the worker processes, idle and busy.
+        """
+        self._idle: list[_PoolWorker] = []
+        self._semaphore: asyncio.Semaphore | None = None
+        self._is_shutdown = False
+
+    def _start_worker(self) -> _PoolWorker:
+        job_receive, job_send = self._context.Pipe(duplex=False)
+        callback_receive, callback_send = self._context.Pipe(duplex=False)
+        proc = self._context.Process(
+            group=None,
+            target=_run_worker,
+            args=(job_receive, callback_send, self._initializer, self._initargs),
+            daemon=self._daemon,
+        )
+        proc.start()
+        job_receive.close()
+        callback_send.close()
+        worker = _PoolWorker(proc, job_send, _PipeReceiver(callback_receive))
+        self._workers.append(worker)
+        return worker
+
+    def _discard_worker(self, worker: _PoolWorker) -> None:
+        """
+        Terminate a worker which is not reusable and replace it.
+        """
+        if worker not in self._workers:
+            # shutdown() already terminated the worker.
+            return
+        self._workers.remove(worker)
+        _terminate(worker.proc, worker.callback_receive)
+        worker.job_send.close()
+        if not self._is_shutdown:
+            # Replace the worker so that the pool stays warm.
+            self._idle.append(self._start_worker())
+
+    def _release_worker(self, worker: _PoolWorker) -> None:
+        """
+        Return a worker to the idle workers after a job.
+        """
+        if not self._is_shutdown and worker in self._workers:
+            self._idle.append(worker)
+
+    async def run(
+        self,
+        subprocess: typing.Callable[[typing.Callable[_P_callback, None]], _T_subprocess],
+        callback: typing.Callable[_P_callback, None],
+        shared_memory_min_bytes: int | None = None,
+        delivery: Delivery = "all",
+        delivery_interval: float = 1 / 60,
+    ) -> _T_subprocess:
+        """
+        Run a :code:`subprocess` function in a worker process of the pool
+        and return the result.
+
+        If all of the worker processes are busy then wait for one to become idle.
+
+        Args:
+            subprocess:
+                The function to run in a worker process.
+                Same as for :func:`run_subprocess_with_callback`.
+            callback:
+                The :code:`callback` function to pass to the :code:`subprocess`.
+                Same as for :func:`run_subprocess_with_callback`.
+            shared_memory_min_bytes:
+                Same as for :func:`run_subprocess_with_callback`.
+            delivery:
+                Same as for :func:`run_subprocess_with_callback`.
+            delivery_interval:
+                Same as for :func:`run_subprocess_with_callback`.
+        """
+        if self._is_shutdown:
+            raise RuntimeError("SubprocessPool is shut down")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_workers)
+        async with self._semaphore:
+            if self._is_shutdown:
+                raise RuntimeError("SubprocessPool is shut down")
+            worker = self._idle.pop() if len(self._idle) > 0 else self._start_worker()
+            shared_memory_config = _shared_memory_config(shared_memory_min_bytes)
+            shared_memory = None if shared_memory_config is None else _SharedMemoryReceiver(shared_memory_config)
+            try:
+                # Pickle the job now so that pickling errors raise here.
+                worker.job_send.send((subprocess, shared_memory_config, _delivery_config(delivery, delivery_interval)))
+                message = await _receive_messages(
+                    worker.proc,
+                    worker.callback_receive,
+                    callback,
+                    shared_memory,
+                    delivery,
+                )
+            except (OSError, EOFError) as ex:
+                # The pipe is broken, or shutdown() closed it.
+                self._discard_worker(worker)
+                if self._is_shutdown:
+                    raise multiprocessing.ProcessError("SubprocessPool is shut down") from ex
+                raise
+            except BaseException:
+                # Cancelled, the worker process died, or the job was interrupted
+                # in some other way, so the worker may still be running it.
+                self._discard_worker(worker)
+                raise
+            finally:
+                if shared_memory is not None:
+                    shared_memory.unlink_remaining()
+            self._release_worker(worker)
+        return _unwrap_result(message)
+
+    def shutdown(self) -> None:
+        """
+        Terminate all of the worker processes.
+
+        Any :func:`SubprocessPool.run` which is awaiting a result will raise
+        `ProcessError <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.ProcessError>`_.
+        """
+        self._is_shutdown = True
+        for worker in self._workers:
+            _terminate(worker.proc, worker.callback_receive)
+            worker.job_send.close()
+        self._workers.clear()
+        self._idle.clear()
+
+    def __enter__(self) -> SubprocessPool:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.shutdown()
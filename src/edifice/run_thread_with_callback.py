@@ -0,0 +1,153 @@
+# This run_thread_with_callback module depends only on the
+# Python standard library, like run_subprocess_with_callback.
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import typing
+
+_T_thread = typing.TypeVar("_T_thread")
+_P_callback = typing.ParamSpec("_P_callback")
+
+
+class CancelToken:
+    """
+    Cooperative cancellation token for a :code:`thread` function of
+    :func:`run_thread_with_callback`.
+
+    A running thread cannot be interrupted, so the :code:`thread` function
+    should check the token periodically and return early when it is cancelled.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        Request cancellation.
+        """
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        True if cancellation has been requested.
+        """
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise
+        `CancelledError <https://docs.python.org/3/library/asyncio-exceptions.html#asyncio.CancelledError>`_
+        if cancellation has been requested.
+        """
+        if self._event.is_set():
+            raise asyncio.CancelledError
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Block until cancellation is requested or the :code:`timeout` in seconds
+        expires. Return :code:`True` if cancellation was requested.
+
+        Use this instead of
+        `time.sleep() <https://docs.python.org/3/library/time.html#time.sleep>`_
+        in the :code:`thread` function.
+        """
+        return self._event.wait(timeout)
+
+
+async def run_thread_with_callback(
+    thread: typing.Callable[[typing.Callable[_P_callback, None], CancelToken], _T_thread],
+    callback: typing.Callable[_P_callback, None],
+    executor: concurrent.futures.ThreadPoolExecutor | None = None,
+) -> _T_thread:
+    """
+    Run a :code:`thread` function in a worker thread and return the result.
+
+    Args:
+        thread:
+            The function to run in a worker thread.
+            This :code:`thread` function takes two arguments: a function with the same type
+            as the :code:`callback` function, and a :class:`CancelToken`.
+        callback:
+            The :code:`callback` function to pass to the :code:`thread` when it starts.
+            The :code:`thread` may call the :code:`callback` function
+            at any time.
+            The :code:`callback` function will run in the main event loop.
+        executor:
+            The
+            `ThreadPoolExecutor <https://docs.python.org/3/library/concurrent.futures.html#threadpoolexecutor>`_
+            in which to run the :code:`thread`. Default is the event loop’s
+            default executor.
+
+    This is the thread counterpart of :func:`run_subprocess_with_callback`,
+    for work which releases the
+    `GIL <https://docs.python.org/3/glossary.html#term-global-interpreter-lock>`_,
+    like NumPy or I/O.
+    There is no process start-up time and no pickling, and the :code:`callback`
+    arguments and the return value can be any objects.
+
+    While the :code:`thread` is running, it may call the supplied :code:`callback` function.
+    The :code:`callback` function will run in the main event loop.
+    Exceptions raised by the :code:`callback` are suppressed.
+    All :code:`callback` calls will run before :func:`run_thread_with_callback` returns.
+
+    If the :code:`thread` raises an exception, then the exception will be re-raised
+    from :func:`run_thread_with_callback`.
+
+    If the :code:`await` :func:`run_thread_with_callback` is cancelled, then
+    the :class:`CancelToken` will be cancelled, no more :code:`callback`
+    calls will run, and
+    `CancelledError <https://docs.python.org/3/library/asyncio-exceptions.html#asyncio.CancelledError>`_
+    will be raised immediately, without waiting for the :code:`thread` to
+    return.
+    Threads cannot be terminated, so the :code:`thread` function must check
+    the :class:`CancelToken` and return early.
+
+    .. code-block:: python
+        :caption: Example
+
+        def my_thread(callback: Callable[[int], None], cancel: CancelToken) -> str:
+            # This function will run in a worker thread.
+            for i in range(100):
+                cancel.raise_if_cancelled()
+                callback(i)
+                time.sleep(0.1)
+            return "done"
+
+        async def main() -> None:
+            def my_callback(x: int) -> None:
+                # This function will run in the main event loop.
+                print(f"callback {x}")
+
+            y = await run_thread_with_callback(my_thread, my_callback)
+
+    In an Edifice :func:`@component<edifice.component>`, use the
+    :func:`edifice.use_thread` Hook to run threads in the :class:`edifice.App`
+    thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    token = CancelToken()
+
+    def _call_callback(*args: _P_callback.args, **kwargs: _P_callback.kwargs) -> None:
+        if token.cancelled:
+            return
+        try:
+            callback(*args, **kwargs)
+        except:  # noqa: S110, E722
+            # We suppress exceptions in the callback, the same as
+            # run_subprocess_with_callback.
+            pass
+
+    def _run_callback(*args: _P_callback.args, **kwargs: _P_callback.kwargs) -> None:
+        loop.call_soon_threadsafe(lambda: _call_callback(*args, **kwargs))
+
+    try:
+        # The result is delivered with call_soon_threadsafe after all of the
+        # callbacks, so all of the callbacks run first.
+        return await loop.run_in_executor(executor, thread, _run_callback, token)
+    except asyncio.CancelledError:
+        token.cancel()
+        raise
@@ -11,13 +11,26 @@ else:
     from PySide6.QtGui import QColor, QPalette
     from PySide6.QtWidgets import QApplication
 
-from .run_subprocess_with_callback import run_subprocess_with_callback
+from .disk_memo import DiskMemoCache, disk_memo
+from .memo_cache import MemoCache
+from .query_cache import QueryCache, QueryResult
+from .run_subprocess_with_callback import SubprocessPool, iterate_subprocess, run_subprocess_with_callback
+from .run_thread_with_callback import CancelToken, run_thread_with_callback
 
 __all__ = [
+    "CancelToken",
+    "DiskMemoCache",
+    "MemoCache",
+    "QueryCache",
+    "QueryResult",
+    "SubprocessPool",
+    "disk_memo",
+    "iterate_subprocess",
     "palette_dump",
     "palette_edifice_dark",
     "palette_edifice_light",
     "run_subprocess_with_callback",
+    "run_thread_with_callback",
     "set_trace",
     "theme_is_light",
 ]
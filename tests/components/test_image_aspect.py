@@ -1,13 +1,19 @@
+import os
+import shutil
+import tempfile
+import time
 import unittest
 
 import edifice
+from edifice.base_components.image_aspect import _ScaledLabel
+from edifice.base_components.image_cache import _ImageCache
 
 from edifice.qt import QT_VERSION
 
 if QT_VERSION == "PyQt6":
-    from PyQt6 import QtWidgets
+    from PyQt6 import QtCore, QtGui, QtWidgets
 else:
-    from PySide6 import QtWidgets
+    from PySide6 import QtCore, QtGui, QtWidgets
 
 if QtWidgets.QApplication.instance() is None:
     app_obj = QtWidgets.QApplication(["-platform", "offscreen"])
@@ -21,5 +27,119 @@ class FormTest(unittest.TestCase):
             loop.call_later(0.1, my_app.stop)
 
 
+class ImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.tmpdir, f"image{i}.png")
+            image = QtGui.QImage(10, 10, QtGui.QImage.Format.Format_ARGB32)
+            image.fill(0xFF000000 + i)
+            image.save(path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_byte_budget(self):
+        # Room for two 10×10 32-bit images.
+        cache = _ImageCache(max_bytes=800)
+        for path in self.paths:
+            cache.get(path)
+        self.assertEqual(list(cache._lru._entries), self.paths[1:])
+        self.assertLessEqual(cache._lru._total_bytes, 800)
+        # Touching an entry makes it most recently used.
+        cache.get(self.paths[1])
+        cache.get(self.paths[0])
+        self.assertEqual(list(cache._lru._entries), [self.paths[1], self.paths[0]])
+
+    def test_mtime_invalidation(self):
+        cache = _ImageCache()
+        pixmap = cache.get(self.paths[0])
+        self.assertIs(cache.get(self.paths[0]), pixmap)
+        image = QtGui.QImage(20, 20, QtGui.QImage.Format.Format_ARGB32)
+        image.fill(0xFFFFFFFF)
+        image.save(self.paths[0])
+        stat = os.stat(self.paths[0])
+        os.utime(self.paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(cache.get(self.paths[0]).width(), 20)
+
+    def test_async(self):
+        cache = _ImageCache()
+        loaded = []
+        self.assertIsNone(cache.get_async(self.paths[0], loaded.append))
+        # A second request for the same path shares the decode.
+        self.assertIsNone(cache.get_async(self.paths[0], loaded.append))
+        deadline = time.monotonic() + 5.0
+        while len(loaded) < 2 and time.monotonic() < deadline:
+            QtWidgets.QApplication.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(loaded[0].width(), 10)
+        self.assertIs(cache.get_async(self.paths[0], loaded.append), loaded[0])
+
+    def test_placeholder(self):
+        placeholder = QtGui.QPixmap(4, 4)
+        label = edifice.Image(src=self.paths[2], placeholder=placeholder)
+        for command in label._qt_update_commands({}, {"src": (None, label.props["src"])}):
+            command.fn(*command.args, **command.kwargs)
+        assert label.underlying is not None
+        self.assertIs(label.underlying._pixmap, placeholder)
+        deadline = time.monotonic() + 5.0
+        while label.underlying._pixmap is placeholder and time.monotonic() < deadline:
+            QtWidgets.QApplication.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(label.underlying._pixmap.width(), 10)
+
+    def test_placeholder_change(self):
+        path = os.path.join(self.tmpdir, "placeholder_change.png")
+        image = QtGui.QImage(10, 10, QtGui.QImage.Format.Format_ARGB32)
+        image.fill(0xFF0000FF)
+        image.save(path)
+        placeholder1 = QtGui.QPixmap(4, 4)
+        placeholder2 = QtGui.QPixmap(5, 5)
+        label = edifice.Image(src=path, placeholder=placeholder1)
+        for command in label._qt_update_commands({}, {"src": (None, path)}):
+            command.fn(*command.args, **command.kwargs)
+        assert label.underlying is not None
+        self.assertIs(label.underlying._pixmap, placeholder1)
+        # The placeholder changes while the src is loading.
+        for command in label._qt_update_commands({}, {"placeholder": (placeholder1, placeholder2)}):
+            command.fn(*command.args, **command.kwargs)
+        self.assertIs(label.underlying._pixmap, placeholder2)
+        deadline = time.monotonic() + 5.0
+        while label.underlying._pixmap is placeholder2 and time.monotonic() < deadline:
+            QtWidgets.QApplication.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(label.underlying._pixmap.width(), 10)
+        # After the src has loaded, the placeholder is not shown.
+        for command in label._qt_update_commands({}, {"placeholder": (placeholder2, placeholder1)}):
+            command.fn(*command.args, **command.kwargs)
+        self.assertEqual(label.underlying._pixmap.width(), 10)
+
+    def test_scaled_shared(self):
+        pixmap = QtGui.QPixmap(100, 100)
+        pixmap.fill(QtGui.QColor(255, 0, 0))
+        labels = []
+        for _ in range(2):
+            label = _ScaledLabel()
+            label.resize(50, 40)
+            label._setAspectRatioMode(QtCore.Qt.AspectRatioMode.KeepAspectRatio)
+            label._setPixmap(pixmap)
+            labels.append(label)
+        # Both labels show the same smoothly scaled pixmap.
+        self.assertEqual(labels[0].pixmap().cacheKey(), labels[1].pixmap().cacheKey())
+
+        # An interactive resize uses the fast transformation, then settles.
+        label = labels[0]
+        label.resizeEvent(None)
+        self.assertTrue(label._settle_timer.isActive())
+        deadline = time.monotonic() + 5.0
+        while label._settle_timer.isActive() and time.monotonic() < deadline:
+            QtWidgets.QApplication.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(label.pixmap().cacheKey(), labels[1].pixmap().cacheKey())
+
+
 if __name__ == "__main__":
     unittest.main()
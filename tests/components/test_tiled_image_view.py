@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import edifice
+from edifice.base_components.tiled_image_view import _tile_cache
+
+from edifice.qt import QT_VERSION
+
+if QT_VERSION == "PyQt6":
+    from PyQt6 import QtCore, QtGui, QtWidgets
+else:
+    from PySide6 import QtCore, QtGui, QtWidgets
+
+if QtWidgets.QApplication.instance() is None:
+    app_obj = QtWidgets.QApplication(["-platform", "offscreen"])
+
+
+def _wait_for_tiles(widget):
+    deadline = time.monotonic() + 5.0
+    widget.grab()
+    while len(widget._futures) > 0 and time.monotonic() < deadline:
+        QtWidgets.QApplication.processEvents()
+        time.sleep(0.01)
+    widget.grab()
+
+
+class TiledImageViewTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "large.png")
+        image = QtGui.QImage(1000, 600, QtGui.QImage.Format.Format_RGB32)
+        image.fill(QtGui.QColor(0, 128, 255))
+        image.save(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_tiles(self):
+        view = edifice.TiledImageView(src=self.path, tile_size=128)
+        for command in view._qt_update_commands({}, {"src": (None, self.path)}):
+            command.fn(*command.args, **command.kwargs)
+        widget = view.underlying
+        assert widget is not None
+        widget.resize(200, 120)
+        self.assertEqual(widget._image_size, (1000, 600))
+
+        # Zoomed out to fit, the whole image is a few tiles of a coarse level.
+        _wait_for_tiles(widget)
+        level = widget._level()
+        self.assertGreater(level, 0)
+        source = edifice.TiledImageFile(self.path)
+        tiles = widget._visible_tiles(level)
+        for column, row in tiles:
+            entry = _tile_cache.get((source, 128, level, column, row))
+            assert entry is not None
+            self.assertLessEqual(entry[0].width(), 128)
+            # A view of the same source with another tile size does not share the tile.
+            self.assertIsNone(_tile_cache.get((source, 256, level, column, row)))
+
+        # Zoomed in to full resolution, only the visible tiles are read.
+        widget._zoom(1.0 / widget._scale, QtCore.QPointF(100.0, 60.0))
+        self.assertEqual(widget._level(), 0)
+        _wait_for_tiles(widget)
+        tiles = widget._visible_tiles(0)
+        self.assertLessEqual(len(tiles), 9)
+        for column, row in tiles:
+            self.assertIsNotNone(_tile_cache.get((source, 128, 0, column, row)))
+        self.assertIsNone(_tile_cache.get((source, 128, 0, 7, 4)))
+
+    def test_file_pyramid(self):
+        # PNG does not support ClipRect, so the file is decoded once and
+        # the coarser levels are downscaled from the levels below.
+        source = edifice.TiledImageFile(self.path)
+        image = source.read_region(0, 0, 512, 512, 128, 128)
+        self.assertEqual((image.width(), image.height()), (128, 128))
+        self.assertEqual(image.pixelColor(64, 64), QtGui.QColor(0, 128, 255))
+        self.assertEqual(
+            [(level.width(), level.height()) for level in source._pyramid],
+            [(1000, 600), (500, 300), (250, 150)],
+        )
+        decoded = source._pyramid[0]
+        image = source.read_region(768, 512, 232, 88, 58, 22)
+        self.assertEqual((image.width(), image.height()), (58, 22))
+        self.assertIs(source._pyramid[0], decoded)
+
+    def test_file_mtime(self):
+        source = edifice.TiledImageFile(self.path)
+        self.assertEqual(source, edifice.TiledImageFile(self.path))
+        os.utime(self.path, ns=(0, 0))
+        self.assertNotEqual(source, edifice.TiledImageFile(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,7 @@
 import asyncio
+import tempfile
+import threading
+import time
 import unittest
 
 import edifice as ed
@@ -104,6 +107,436 @@ class IntegrationTestCase(unittest.TestCase):
 
         self.assertTrue(not render_after_has_cancelled)
 
+    def test_use_thread(self):
+        """
+        Test use_thread hook in the App thread pool, and cancellation of the
+        thread CancelToken when the component unmounts.
+        """
+
+        progress: list[int] = []
+        results: list[str] = []
+        thread_names: list[str] = []
+        cancelled = False
+
+        def work(callback, cancel: ed.CancelToken) -> str:
+            thread_names.append(threading.current_thread().name)
+            callback(1)
+            return "done"
+
+        def work_forever(callback, cancel: ed.CancelToken) -> str:
+            nonlocal cancelled
+            while not cancel.wait(0.01):
+                pass
+            cancelled = True
+            return "cancelled"
+
+        @ed.component
+        def TestThread(self):
+            run_thread = ed.use_thread()
+
+            async def run():
+                results.append(await run_thread(work, progress.append))
+                results.append(await run_thread(work_forever, progress.append))
+
+            ed.use_async(run, ())
+            ed.Label(text="Test Thread")
+
+        @ed.component
+        def MainTestThread(self):
+            y, y_set = ed.use_state(0)
+
+            async def unmount_later():
+                await asyncio.sleep(0.5)
+                y_set(1)
+
+            ed.use_async(unmount_later, ())
+
+            with ed.Window():
+                if y == 0:
+                    TestThread()
+                else:
+                    ed.Label(text="TestThread unmounted")
+
+        my_app = ed.App(MainTestThread(), create_application=False, max_thread_workers=2)
+        with my_app.start_loop() as loop:
+            loop.call_later(1.0, my_app.stop)
+
+        self.assertEqual(progress, [1])
+        self.assertEqual(results, ["done"])
+        self.assertTrue(thread_names[0].startswith("edifice_thread"))
+        time.sleep(0.1)
+        self.assertTrue(cancelled)
+        with self.assertRaises(RuntimeError):
+            my_app.thread_executor.submit(lambda: None)
+
+    def test_use_thread_caller_not_cancelled(self):
+        """
+        Test that unmount cancels the run_thread job but not the Task which
+        awaits it.
+        """
+
+        run_threads: list = []
+        events: list[str] = []
+
+        def work_forever(callback, cancel: ed.CancelToken) -> str:
+            while not cancel.wait(0.01):
+                pass
+            return "cancelled"
+
+        async def caller():
+            try:
+                await run_threads[0](work_forever, lambda: None)
+            except asyncio.CancelledError:
+                events.append("job cancelled")
+            task = asyncio.current_task()
+            assert task is not None
+            # Python 3.11+: the Task of the caller was never cancelled.
+            if hasattr(task, "cancelling") and task.cancelling() > 0:
+                events.append("caller cancelled")
+            await asyncio.sleep(0.01)
+            events.append("caller continued")
+
+        @ed.component
+        def TestThread(self):
+            run_threads.append(ed.use_thread())
+
+            def start():
+                asyncio.get_event_loop().create_task(caller())
+
+            ed.use_effect(start, ())
+            ed.Label(text="Test Thread")
+
+        @ed.component
+        def MainTestThread(self):
+            y, y_set = ed.use_state(0)
+
+            async def unmount_later():
+                await asyncio.sleep(0.2)
+                y_set(1)
+
+            ed.use_async(unmount_later, ())
+
+            with ed.Window():
+                if y == 0:
+                    TestThread()
+                else:
+                    ed.Label(text="TestThread unmounted")
+
+        my_app = ed.App(MainTestThread(), create_application=False)
+        with my_app.start_loop() as loop:
+            loop.call_later(0.5, my_app.stop)
+
+        self.assertEqual(events, ["job cancelled", "caller continued"])
+
+    def test_use_async_call_schedule(self):
+        """
+        Test the rate control schedules of use_async_call.
+        """
+
+        started: dict[str, list[int]] = {
+            "debounce": [],
+            "throttle": [],
+            "queue": [],
+            "latest": [],
+            "unmount": [],
+        }
+
+        @ed.component
+        def TestSchedule(self):
+            def make(name: str, duration: float = 0.0):
+                async def fn(i: int):
+                    started[name].append(i)
+                    await asyncio.sleep(duration)
+
+                return fn
+
+            debounce, _ = ed.use_async_call(make("debounce"), schedule="debounce", interval=0.1)
+            throttle, _ = ed.use_async_call(make("throttle"), schedule="throttle", interval=0.1)
+            queue, _ = ed.use_async_call(make("queue", 0.02), schedule="queue", max_queue=2)
+            latest, _ = ed.use_async_call(make("latest", 0.02), schedule="latest")
+
+            async def run():
+                for i in range(5):
+                    debounce(i)
+                    throttle(i)
+                    queue(i)
+                    latest(i)
+                    await asyncio.sleep(0.01)
+
+            ed.use_async(run, ())
+            ed.Label(text="Test Schedule")
+
+        @ed.component
+        def TestUnmount(self):
+            unmount, _ = ed.use_async_call(make_unmount(), schedule="debounce", interval=0.2)
+
+            async def run():
+                unmount(0)
+
+            ed.use_async(run, ())
+            ed.Label(text="Test Unmount")
+
+        def make_unmount():
+            async def fn(i: int):
+                started["unmount"].append(i)
+
+            return fn
+
+        @ed.component
+        def MainTestSchedule(self):
+            y, y_set = ed.use_state(0)
+
+            async def unmount_later():
+                await asyncio.sleep(0.1)
+                y_set(1)
+
+            ed.use_async(unmount_later, ())
+
+            with ed.Window():
+                TestSchedule()
+                if y == 0:
+                    TestUnmount()
+
+        my_app = ed.App(MainTestSchedule(), create_application=False)
+        with my_app.start_loop() as loop:
+            loop.call_later(0.5, my_app.stop)
+
+        # Only the last request after the requests stop.
+        self.assertEqual(started["debounce"], [4])
+        # The first request immediately, then the last request in each interval.
+        self.assertEqual(started["throttle"][0], 0)
+        self.assertEqual(started["throttle"][-1], 4)
+        self.assertLess(len(started["throttle"]), 5)
+        # The oldest waiting requests are dropped.
+        self.assertEqual(started["queue"][0], 0)
+        self.assertEqual(started["queue"][-2:], [3, 4])
+        self.assertEqual(started["queue"], sorted(started["queue"]))
+        # Only the last waiting request starts.
+        self.assertEqual(started["latest"][0], 0)
+        self.assertEqual(started["latest"][-1], 4)
+        self.assertLess(len(started["latest"]), 5)
+        # The debounced request is dropped when the component unmounts.
+        self.assertEqual(started["unmount"], [])
+
+    def test_use_query(self):
+        """
+        Test that use_query deduplicates one fetch for many components with
+        the same key, and re-renders all of them.
+        """
+
+        calls = 0
+        rendered: list[tuple[int, str | None]] = []
+
+        async def fetch_quote():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "quote"
+
+        @ed.component
+        def Quote(self, i: int):
+            quote = ed.use_query(("quote", "EDF"), fetch_quote, stale_time=10.0)
+            rendered.append((i, quote.data))
+            ed.Label(text=str(quote.data))
+
+        @ed.component
+        def MainTestQuery(self):
+            with ed.Window():
+                for i in range(3):
+                    Quote(i)
+
+        my_app = ed.App(MainTestQuery(), create_application=False)
+        with my_app.start_loop() as loop:
+            loop.call_later(0.3, my_app.stop)
+
+        self.assertEqual(calls, 1)
+        for i in range(3):
+            self.assertIn((i, "quote"), rendered)
+
+    def test_use_async_iter(self):
+        """
+        Test that use_async_iter renders a fast stream in batches.
+        """
+
+        count = 10_000
+        renders_window: list[tuple[int, ...]] = []
+        renders_reducer: list[int] = []
+        renders_block: list[int] = []
+
+        async def stream():
+            for i in range(count):
+                yield i
+                if i % 100 == 0:
+                    await asyncio.sleep(0)
+
+        def sum_reducer(total: int, items: list[int]) -> int:
+            return total + sum(items)
+
+        @ed.component
+        def TestAsyncIter(self):
+            window = ed.use_async_iter(stream, window=10)
+            renders_window.append(window)
+            total = ed.use_async_iter(stream, reducer=sum_reducer, initial=0)
+            renders_reducer.append(total)
+            # Lossless with backpressure.
+            total_block = ed.use_async_iter(stream, reducer=sum_reducer, initial=0, max_buffer=1000, drop="block")
+            renders_block.append(total_block)
+            ed.Label(text=str(total))
+
+        my_app = ed.App(ed.Window()(TestAsyncIter()), create_application=False)
+        with my_app.start_loop() as loop:
+            loop.call_later(1.0, my_app.stop)
+
+        self.assertEqual(renders_window[-1], tuple(range(count - 10, count)))
+        self.assertEqual(renders_reducer[-1], sum(range(count)))
+        self.assertEqual(renders_block[-1], sum(range(count)))
+        self.assertLess(len(renders_window), count // 10)
+
+    def test_use_memo_max_entries(self):
+        """
+        Test that use_memo with max_entries does not recompute when the
+        dependencies switch back, and that use_memo_shared computes once
+        for many components.
+        """
+
+        computed: list[str] = []
+        computed_shared: list[str] = []
+        values: list[tuple[str, str]] = []
+        cache = ed.MemoCache()
+
+        @ed.component
+        def Shared(self):
+            def compute():
+                computed_shared.append("x")
+                return "X"
+
+            ed.Label(text=ed.use_memo_shared(("test_use_memo_max_entries", "x"), compute, cache=cache))
+
+        @ed.component
+        def TestMemo(self):
+            mode, mode_set = ed.use_state("a")
+
+            def compute():
+                computed.append(mode)
+                return mode.upper()
+
+            values.append((mode, ed.use_memo(compute, (mode,), max_entries=2)))
+            # max_entries may change between renders.
+            values.append((mode, ed.use_memo(lambda: mode.upper(), (mode,), max_entries=1 if mode == "a" else 3)))
+
+            async def toggle():
+                for m in ["b", "a", "b", "c", "a"]:
+                    await asyncio.sleep(0.01)
+                    mode_set(m)
+
+            ed.use_async(toggle, ())
+            with ed.VBoxView():
+                for _ in range(3):
+                    Shared()
+
+        my_app = ed.App(ed.Window()(TestMemo()), create_application=False)
+        with my_app.start_loop() as loop:
+            loop.call_later(0.3, my_app.stop)
+
+        # "a" was evicted by "c".
+        self.assertEqual(computed, ["a", "b", "c", "a"])
+        self.assertEqual(computed_shared, ["x"])
+        for mode, value in values:
+            self.assertEqual(value, mode.upper())
+
+    def test_use_disk_memo(self):
+        """
+        Test that use_disk_memo computes in a worker thread and loads from
+        the DiskMemoCache on the next run.
+        """
+
+        thread_names: list[str] = []
+        rendered: list[int | None] = []
+
+        def compute():
+            thread_names.append(threading.current_thread().name)
+            return 42
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            @ed.component
+            def TestDiskMemo(self):
+                value = ed.use_disk_memo(compute, (), cache=ed.DiskMemoCache(directory))
+                rendered.append(value)
+                ed.Label(text=str(value))
+
+            for _ in range(2):
+                my_app = ed.App(ed.Window()(TestDiskMemo()), create_application=False)
+                with my_app.start_loop() as loop:
+                    loop.call_later(0.2, my_app.stop)
+
+        self.assertEqual(len(thread_names), 1)
+        self.assertTrue(thread_names[0].startswith("edifice_thread"))
+        self.assertEqual(rendered[0], None)
+        self.assertEqual(rendered[-1], 42)
+
+    def test_use_sync_external_store(self):
+        """
+        Test that use_sync_external_store renders the latest snapshot of a
+        store which is updated from another thread, in batches, and only when
+        the version changes.
+        """
+
+        count = 10_000
+        renders: list[tuple[int, int]] = []
+        renders_unchanged: list[int] = []
+
+        class Store:
+            def __init__(self):
+                self.value = 0
+                self.version = 0
+                self.callbacks: set = set()
+
+            def update(self, value: int, bump_version: bool = True):
+                self.value = value
+                if bump_version:
+                    self.version += 1
+                for callback in list(self.callbacks):
+                    callback()
+
+            def subscribe(self, callback):
+                self.callbacks.add(callback)
+                return lambda: self.callbacks.discard(callback)
+
+        store = Store()
+
+        def run_socket():
+            time.sleep(0.1)
+            for i in range(1, count + 1):
+                store.update(i)
+
+        @ed.component
+        def Quote(self):
+            value = ed.use_sync_external_store(store.subscribe, lambda: store.value, lambda: store.version)
+            renders.append((store.version, value))
+            ed.Label(text=str(value))
+
+        @ed.component
+        def Unchanged(self):
+            # The snapshot never changes, so this never re-renders.
+            ed.use_sync_external_store(store.subscribe, lambda: 0, lambda: 0)
+            renders_unchanged.append(0)
+            ed.Label(text="Unchanged")
+
+        thread = threading.Thread(target=run_socket)
+        my_app = ed.App(ed.Window()(Quote(), Unchanged()), create_application=False)
+        with my_app.start_loop() as loop:
+            loop.call_soon(thread.start)
+            loop.call_later(1.0, my_app.stop)
+        thread.join()
+
+        self.assertEqual(renders[-1], (count, count))
+        self.assertLess(len(renders), count)
+        # Every render is of a new version.
+        versions = [version for version, _ in renders]
+        self.assertEqual(versions, sorted(set(versions)))
+        self.assertEqual(len(renders_unchanged), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
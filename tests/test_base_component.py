@@ -1,13 +1,24 @@
+import atexit
 import importlib.resources
 import os
+import shutil
+import tempfile
+import time
 import unittest
 import unittest.mock
 
+# Do not write the rasters of the bundled icons to the user cache.
+if "EDIFICE_ICON_CACHE_DIR" not in os.environ:
+    os.environ["EDIFICE_ICON_CACHE_DIR"] = tempfile.mkdtemp(prefix="edifice_icons_")
+    atexit.register(shutil.rmtree, os.environ["EDIFICE_ICON_CACHE_DIR"], True)
+
 import numpy as np
 
 import edifice.icons
 from edifice import engine
 from edifice.base_components import base_components
+from edifice.base_components.icon_cache import _bundled_icon_path, _IconDiskCache
+from edifice.base_components.image_cache import _svg_raster, _svg_renderer
 from edifice.engine import CommandType
 from edifice.qt import QT_VERSION
 
@@ -384,5 +395,98 @@ class BaseElementsTest(unittest.TestCase):
         )
 
 
+class ImageSvgTest(unittest.TestCase):
+    def test_svg_raster(self):
+        src = b'<svg viewBox="0 0 10 10"><circle fill="black" cx="5" cy="5" r="5"/></svg>'
+        pixmap = _svg_raster(src, 20, 20, 2.0)
+        self.assertEqual((pixmap.width(), pixmap.height()), (40, 40))
+        self.assertEqual(pixmap.devicePixelRatio(), 2.0)
+        # Cached and shared.
+        self.assertIs(_svg_raster(src, 20, 20, 2.0), pixmap)
+        self.assertIs(_svg_renderer(src), _svg_renderer(src))
+
+        # Tinting preserves the alpha channel.
+        red = _svg_raster(src, 20, 20, 1.0, QtGui.QColor(255, 0, 0)).toImage()
+        center = red.pixelColor(10, 10)
+        self.assertEqual((center.red(), center.green(), center.alpha()), (255, 0, 255))
+        self.assertEqual(red.pixelColor(0, 0).alpha(), 0)
+        edge = red.pixelColor(10, 0)
+        self.assertLess(edge.alpha(), 255)
+
+    def test_image_svg(self):
+        src = QtCore.QByteArray(b'<svg viewBox="0 0 10 10"><rect fill="black" width="10" height="10"/></svg>')
+        element = edifice.ImageSvg(src=src, color=QtGui.QColor(0, 0, 255))
+        for command in element._qt_update_commands({}, {"src": (None, src)}):
+            command.fn(*command.args, **command.kwargs)
+        widget = element.underlying
+        assert widget is not None
+        widget.resize(16, 16)
+        image = widget.grab().toImage()
+        self.assertEqual(image.pixelColor(8, 8).blue(), 255)
+        self.assertEqual(widget.sizeHint(), QtCore.QSize(10, 10))
+
+    def test_svg_animated_eviction(self):
+        src = (
+            b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10"><rect width="10" height="10">'
+            b'<animateTransform attributeName="transform" type="rotate" from="0" to="360" dur="1s"'
+            b' repeatCount="indefinite"/>'
+            b"</rect></svg>"
+        )
+        widget = base_components._SvgWidget()
+        widget._setSvg(src, None, 0.0)
+        renderer = widget._renderer
+        assert renderer is not None
+        self.assertTrue(renderer.animated())
+        # After the shared renderer is evicted, disconnect from the renderer
+        # which was connected, not from a new one.
+        _svg_renderer.cache_clear()
+        widget._setSvg(b'<svg viewBox="0 0 10 10"/>', None, 0.0)
+        self.assertIsNone(widget._renderer)
+        meta_object = renderer.metaObject()
+        repaint_needed = meta_object.method(meta_object.indexOfSignal("repaintNeeded()"))
+        self.assertFalse(renderer.isSignalConnected(repaint_needed))
+
+    def test_icon_disk_cache(self):
+        self.assertEqual(
+            _bundled_icon_path(str(ICONS / "font-awesome/solid/share.svg")),
+            "font-awesome/solid/share.svg",
+        )
+        self.assertIsNone(_bundled_icon_path("tests/example.png"))
+        self.assertIsNone(_bundled_icon_path(b"<svg/>"))
+
+        directory = tempfile.mkdtemp()
+        try:
+            # A directory of another version which is in use, for example by
+            # the other Qt binding, and one which has not been used for a long time.
+            os.makedirs(os.path.join(directory, "icons-0.0.0-other"))
+            os.makedirs(os.path.join(directory, "icons-0.0.0-old"))
+            old_time = time.time() - 365 * 24 * 60 * 60
+            os.utime(os.path.join(directory, "icons-0.0.0-old"), (old_time, old_time))
+            image = QtGui.QImage(3, 2, QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+            image.fill(QtGui.QColor(10, 20, 30, 255))
+            cache = _IconDiskCache(directory, max_files=2)
+            self.assertIsNone(cache.get("key"))
+            cache.put("key", image)
+            self.assertTrue(os.path.exists(os.path.join(directory, "icons-0.0.0-other")))
+            self.assertFalse(os.path.exists(os.path.join(directory, "icons-0.0.0-old")))
+
+            # A new cache, as in the next run, reads the raster from disk.
+            cache_next = _IconDiskCache(directory, max_files=2)
+            loaded = cache_next.get("key")
+            assert loaded is not None
+            self.assertEqual((loaded.width(), loaded.height()), (3, 2))
+            self.assertEqual(loaded.pixelColor(2, 1).green(), 20)
+
+            # The least recently written rasters are deleted.
+            cache_next.put("key2", image)
+            cache_next.put("key3", image)
+            self.assertIsNone(cache_next.get("key"))
+            self.assertIsNotNone(cache_next.get("key3"))
+            assert cache_next._directory is not None
+            self.assertEqual(len(os.listdir(cache_next._directory)), 2)
+        finally:
+            shutil.rmtree(directory)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from edifice import DiskMemoCache, disk_memo
+
+
+def is_memory_mapped(array: np.ndarray) -> bool:
+    base = array
+    while base is not None:
+        if isinstance(base, memoryview) and isinstance(base.obj, mmap.mmap):
+            return True
+        base = getattr(base, "base", None) if not isinstance(base, memoryview) else base.obj
+    return False
+
+
+class DiskMemoCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = DiskMemoCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get(self):
+        calls: list[int] = []
+
+        def compute(x: int):
+            calls.append(x)
+            return {"x": x}
+
+        assert self.cache.get(lambda: compute(1), 1) == {"x": 1}
+        # A new DiskMemoCache for the same directory, like on the next run.
+        cache = DiskMemoCache(self.directory.name)
+        assert cache.get(lambda: compute(1), 1) == {"x": 1}
+        assert calls == [1]
+        assert cache.get(lambda: compute(2), 2) == {"x": 2}
+        assert cache.get(lambda: compute(2), 2, version="2") == {"x": 2}
+        assert calls == [1, 2, 2]
+
+    def test_code_version(self):
+        def compute_a():
+            return "a"
+
+        def compute_b():
+            return "b"
+
+        assert self.cache.digest(compute_a, ()) != self.cache.digest(compute_b, ())
+        assert self.cache.digest(compute_a, ()) == self.cache.digest(compute_a, ())
+
+    def test_memory_map_arrays(self):
+        array = np.arange(100_000, dtype=np.float64)
+        calls: list[int] = []
+
+        def compute():
+            calls.append(1)
+            return {"array": array}
+
+        self.cache.get(compute, "arrays")
+        value = self.cache.get(compute, "arrays")
+        assert calls == [1]
+        np.testing.assert_array_equal(value["array"], array)
+        assert not value["array"].flags.writeable
+        assert is_memory_mapped(value["array"])
+
+    def test_eviction(self):
+        cache = DiskMemoCache(self.directory.name, max_bytes=300_000)
+        for i in range(5):
+            cache.get(lambda: np.zeros(100_000, dtype=np.uint8), i)
+        files = os.listdir(self.directory.name)
+        assert len(files) == 2
+        cache.clear()
+        assert os.listdir(self.directory.name) == []
+
+    def test_unpicklable(self):
+        calls: list[int] = []
+
+        def compute():
+            calls.append(1)
+            return lambda: None
+
+        self.cache.get(compute, ())
+        self.cache.get(compute, ())
+        assert calls == [1, 1]
+
+    def test_decorator(self):
+        calls: list[int] = []
+
+        @disk_memo(cache=self.cache)
+        def square(x: int) -> int:
+            calls.append(x)
+            return x * x
+
+        assert square(3) == 9
+        assert square(3) == 9
+        assert square(4) == 16
+        assert calls == [3, 4]
+        assert square.__name__ == "square"
+
+
+if __name__ == "__main__":
+    unittest.main()
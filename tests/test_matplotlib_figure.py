@@ -1,4 +1,7 @@
 import asyncio as asyncio
+import concurrent.futures
+import threading
+import time
 import unittest
 
 from edifice import App
@@ -13,6 +16,11 @@ else:
 if QtWidgets.QApplication.instance() is None:
     app_obj = QtWidgets.QApplication(["-platform", "offscreen"])
 
+import numpy as np
+from matplotlib.axes import Axes
+
+from edifice.extra.matplotlib_figure import MatplotlibFigure, MatplotlibFigureImage, MatplotlibLine
+
 from examples.example_matplotlib_figure import Main
 
 
@@ -23,5 +31,82 @@ class IntegrationTestCase(unittest.TestCase):
             loop.call_later(0.1, my_app.stop)
 
 
+class MatplotlibFigureTestCase(unittest.TestCase):
+    def test_lines(self):
+        def plot_static(ax: Axes):
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+
+        xs = np.linspace(0, 1, 10)
+        figure = MatplotlibFigure(plot_fun=plot_static, lines={"a": MatplotlibLine(xs, xs)})
+        diff_props = {"plot_fun": (None, plot_static), "lines": (None, figure.props["lines"])}
+        for command in figure._qt_update_commands({}, diff_props):
+            command.fn(*command.args, **command.kwargs)
+        artist_a = figure.line_artists["a"]
+        self.assertTrue(artist_a.get_animated())
+        self.assertTrue(figure.blit_pending)
+        figure._blit()
+        self.assertFalse(figure.blit_pending)
+
+        # Changing the data updates the same artist in place.
+        ys = 1.0 - xs
+        lines_new = {"a": MatplotlibLine(xs, ys), "b": MatplotlibLine(xs, xs, color="red")}
+        figure._update_lines(lines_new)
+        self.assertIs(figure.line_artists["a"], artist_a)
+        np.testing.assert_array_equal(artist_a.get_ydata(), ys)
+        self.assertIn("b", figure.line_artists)
+
+        # Removing a key removes the artist from the Axes.
+        artist_b = figure.line_artists["b"]
+        figure._update_lines({"a": lines_new["a"]})
+        self.assertNotIn("b", figure.line_artists)
+        self.assertNotIn(artist_b, figure.subplots.lines)
+
+        # Without lines the background is not cached after each full draw.
+        self.assertIsNotNone(figure.on_draw_connect_id)
+        figure._update_lines({})
+        self.assertIsNone(figure.on_draw_connect_id)
+        self.assertIsNone(figure.background)
+
+        # Equality is by array identity.
+        self.assertEqual(MatplotlibLine(xs, ys), MatplotlibLine(xs, ys))
+        self.assertNotEqual(MatplotlibLine(xs, ys), MatplotlibLine(xs, ys.copy()))
+
+    def test_figure_image(self):
+        calls = []
+        thread_names = []
+
+        def plot_fun_1(ax: Axes):
+            calls.append(1)
+            ax.plot([0, 1], [0, 1])
+
+        def plot_fun_2(ax: Axes):
+            calls.append(2)
+            thread_names.append(threading.current_thread().name)
+            ax.plot([0, 1], [1, 0])
+
+        figure = MatplotlibFigureImage(plot_fun=plot_fun_1)
+        for command in figure._qt_update_commands({}, {"plot_fun": (None, plot_fun_1)}):
+            command.fn(*command.args, **command.kwargs)
+        widget = figure.underlying
+        assert widget is not None
+        widget.resize(200, 100)
+        # Request a new render before the first one is shown.
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="test_executor")
+        widget._setPlotFun(plot_fun_2, 100.0, executor)
+        generation = widget._generation
+
+        deadline = time.monotonic() + 10.0
+        while (widget._pixmap is None or widget._future is not None) and time.monotonic() < deadline:
+            QtWidgets.QApplication.processEvents()
+            time.sleep(0.01)
+        assert widget._pixmap is not None
+        self.assertEqual(widget._generation, generation)
+        self.assertEqual(calls[-1], 2)
+        self.assertTrue(thread_names[-1].startswith("test_executor"))
+        executor.shutdown()
+        self.assertEqual(widget._pixmap.width(), round(200 * widget.devicePixelRatioF()))
+
+
 if __name__ == "__main__":
     unittest.main()
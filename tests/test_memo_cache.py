@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from edifice import MemoCache
+
+
+class MemoCacheTestCase(unittest.TestCase):
+    def test_get(self):
+        cache = MemoCache()
+        calls: list[str] = []
+
+        def compute(key: str):
+            calls.append(key)
+            return key.upper()
+
+        assert cache.get("a", lambda: compute("a")) == "A"
+        assert cache.get("a", lambda: compute("a")) == "A"
+        assert calls == ["a"]
+
+    def test_max_entries(self):
+        cache = MemoCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        # Use "a" so that "b" is the least recently used.
+        cache.get("a", lambda: 0)
+        cache.put("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+
+    def test_max_bytes(self):
+        cache = MemoCache(max_bytes=1000)
+        cache.put("a", np.zeros(400, dtype=np.uint8))
+        cache.put("b", np.zeros(400, dtype=np.uint8))
+        assert cache.total_bytes == 800
+        cache.put("c", np.zeros(400, dtype=np.uint8))
+        assert "a" not in cache
+        assert cache.total_bytes == 800
+        # Too large to cache.
+        cache.put("d", np.zeros(2000, dtype=np.uint8))
+        assert "d" not in cache
+        assert cache.total_bytes == 800
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.total_bytes == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
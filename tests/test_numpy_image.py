@@ -3,7 +3,16 @@ import unittest
 import numpy as np
 
 from edifice import Image, engine
-from edifice.extra.numpy_image import NumpyArray, NumpyArray_to_QImage, NumpyImage
+from edifice.extra.numpy_image import (
+    COLORMAP_GRAY,
+    COLORMAP_VIRIDIS,
+    NumpyArray,
+    NumpyArray_to_QImage,
+    NumpyArray_to_QImage_colormap,
+    NumpyArrayDirty,
+    NumpyImage,
+    NumpyTiledImageSource,
+)
 from edifice.qt import QT_VERSION
 
 if QT_VERSION == "PyQt6":
@@ -35,3 +44,63 @@ class NumpyImageTest(unittest.TestCase):
         assert NumpyArray(np.zeros((100, 100, 3))) == NumpyArray(np.zeros((100, 100, 3)))
         assert NumpyArray(np.zeros((100, 100, 3))) != NumpyArray(np.zeros((100, 100)))
         assert NumpyArray(np.zeros((100, 100, 3))) != NumpyArray(np.ones((100, 100, 3)))
+
+    def test_dirty_rects(self):
+        arr = np.zeros((100, 100, 3), dtype=np.uint8)
+        image = NumpyImage(src=NumpyArray(arr))
+        render_engine = engine.RenderEngine(image)
+        render_engine._request_rerender([image])
+        label = image.underlying
+        assert label is not None
+
+        arr[10:20, 30:40] = 255
+        dirty = NumpyArrayDirty(arr, ((30, 10, 10, 10),))
+        assert dirty != NumpyArray(arr)
+        assert NumpyArray(arr) != dirty
+        assert dirty == dirty
+        image._props["src"] = dirty
+        commands = image._qt_update_commands({}, {"src": (NumpyArray(arr), dirty)})
+        assert [command.fn for command in commands] == [label._updateImageRects]
+        for command in commands:
+            command.fn(*command.args, **command.kwargs)
+
+        assert label._pixmap is not None
+        qimage = label._pixmap.toImage()
+        assert qimage.pixelColor(35, 15).red() == 255
+        assert qimage.pixelColor(5, 5).red() == 0
+
+    def test_colormap(self):
+        self._test_comp(NumpyImage(src=NumpyArray(np.zeros((100, 100))), colormap=COLORMAP_VIRIDIS))
+        self._test_comp(NumpyImage(src=NumpyArray(np.zeros((100, 100, 1), dtype=np.uint16)), colormap=COLORMAP_GRAY))
+        self._test_comp(
+            NumpyImage(src=NumpyArray(np.zeros((100, 100), dtype=np.uint8)), colormap=COLORMAP_GRAY, vmin=0, vmax=10)
+        )
+
+        ramp = np.linspace(0.0, 1.0, 101, dtype=np.float32).reshape((1, 101))
+        qimage = NumpyArray_to_QImage_colormap(ramp, COLORMAP_GRAY, vmin=0.0, vmax=1.0)
+        assert qimage.pixelColor(0, 0).red() == 0
+        assert qimage.pixelColor(100, 0).red() == 255
+        assert 120 < qimage.pixelColor(50, 0).red() < 135
+
+        ramp8 = np.arange(256, dtype=np.uint8).reshape((1, 256))
+        qimage = NumpyArray_to_QImage_colormap(ramp8, COLORMAP_GRAY, vmin=0, vmax=127)
+        assert qimage.pixelColor(0, 0).red() == 0
+        assert qimage.pixelColor(127, 0).red() == 255
+        assert qimage.pixelColor(255, 0).red() == 255
+
+    def test_tiled_image_source(self):
+        arr = np.zeros((600, 1000, 3), dtype=np.uint8)
+        arr[:, 500:] = 255
+        source = NumpyTiledImageSource(arr)
+        assert source.image_size() == (1000, 600)
+        image = source.read_region(256, 0, 512, 512, 128, 128)
+        assert (image.width(), image.height()) == (128, 128)
+        assert image.pixelColor(0, 0).red() == 0
+        assert image.pixelColor(127, 0).red() == 255
+
+        scalar = NumpyTiledImageSource(arr[:, :, 0].astype(np.float32), COLORMAP_GRAY, vmin=0.0, vmax=255.0)
+        image = scalar.read_region(0, 0, 1000, 600, 250, 150)
+        assert (image.width(), image.height()) == (250, 150)
+        assert image.pixelColor(249, 0).red() == 255
+        with self.assertRaises(ValueError):
+            NumpyTiledImageSource(arr[:, :, 0], COLORMAP_GRAY)
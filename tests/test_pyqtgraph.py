@@ -1,6 +1,8 @@
 import unittest
 
-from edifice import App
+import numpy as np
+
+from edifice import App, engine
 from edifice.qt import QT_VERSION
 
 # Import edifice before importing pyqtgraph so that pyqtgraph detects the same version of PyQt
@@ -12,6 +14,7 @@ else:
 if QtWidgets.QApplication.instance() is None:
     app_obj = QtWidgets.QApplication(["-platform", "offscreen"])
 
+from edifice.extra.pyqtgraph_plot import PlotCurve, PlotRingBuffer, PyQtPlot, _DecimationPyramid
 from examples.example_pyqtgraph import Main
 
 
@@ -21,6 +24,63 @@ class IntegrationTestCase(unittest.TestCase):
         with my_app.start_loop() as loop:
             loop.call_later(0.1, my_app.stop)
 
+    def test_ring_buffer(self):
+        buffer0 = PlotRingBuffer(4)
+        assert len(buffer0) == 0
+        buffer1 = buffer0.extend([1.0, 2.0, 3.0], [10.0, 20.0, 30.0])
+        assert buffer1 != buffer0
+        assert list(buffer1.x) == [1.0, 2.0, 3.0]
+        buffer2 = buffer1.append(4.0, 40.0).append(5.0, 50.0)
+        assert len(buffer2) == 4
+        assert list(buffer2.x) == [2.0, 3.0, 4.0, 5.0]
+        assert list(buffer2.y) == [20.0, 30.0, 40.0, 50.0]
+        buffer3 = buffer2.extend(np.arange(10.0), np.arange(10.0))
+        assert list(buffer3.y) == [6.0, 7.0, 8.0, 9.0]
+        with self.assertRaises(ValueError):
+            buffer1.append(0.0, 0.0)
+
+    def test_curves(self):
+        xs = np.linspace(0.0, 1.0, 10)
+        ys = np.sin(xs)
+        plot = PyQtPlot(curves={"a": PlotCurve(ys, xs), "b": PlotCurve(ys)})
+        render_engine = engine.RenderEngine(plot)
+        render_engine._request_rerender([plot])
+        item_a = plot._curve_items["a"]
+        assert len(plot._curve_items) == 2
+
+        ys2 = np.cos(xs)
+        plot._props["curves"] = {"a": PlotCurve(ys2, xs)}
+        commands = plot._qt_update_commands({}, {"curves": ({"a": PlotCurve(ys, xs)}, plot._props["curves"])})
+        for command in commands:
+            command.fn(*command.args, **command.kwargs)
+        assert list(plot._curve_items) == ["a"]
+        assert plot._curve_items["a"] is item_a
+        assert np.array_equal(item_a.yData, ys2)
+
+    def test_decimation(self):
+        n = 1_000_000
+        xs = np.arange(n, dtype=np.float64)
+        ys = np.zeros(n)
+        ys[123456] = 10.0
+        ys[654321] = -10.0
+        for method in ("minmax", "lttb"):
+            pyramid = _DecimationPyramid(xs, ys, method)
+            x_full, y_full = pyramid.decimate(None, None, 500)
+            assert len(x_full) <= 2 * 500
+            assert y_full.max() == 10.0
+            assert y_full.min() == -10.0
+            assert np.all(np.diff(x_full) >= 0)
+            x_zoom, y_zoom = pyramid.decimate(100000.0, 200000.0, 500)
+            assert x_zoom[0] <= 100000.0
+            assert x_zoom[-1] >= 200000.0
+            assert x_zoom[-1] - x_zoom[0] < 200000.0
+            assert y_zoom.max() == 10.0
+
+        plot = PyQtPlot(curves={"a": PlotCurve(ys, xs, decimation="minmax")})
+        render_engine = engine.RenderEngine(plot)
+        render_engine._request_rerender([plot])
+        assert len(plot._curve_items["a"].yData) < n
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from edifice import QueryCache
+
+
+class QueryCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_deduplicate(self):
+        cache = QueryCache()
+        calls = 0
+
+        async def fetcher():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        task1 = cache.fetch("k", fetcher)
+        task2 = cache.fetch("k", fetcher)
+        assert task1 is task2
+        assert cache.get("k").is_fetching
+        assert cache.get("k").is_loading
+        assert await task1 == 1
+        assert calls == 1
+        result = cache.get("k", stale_time=10.0)
+        assert result.data == 1
+        assert not result.is_fetching
+        assert not result.is_stale
+        assert cache.get("k", stale_time=0.0).is_stale
+
+    async def test_stale_while_revalidate(self):
+        cache = QueryCache()
+        cache.set_data("k", "old")
+
+        async def fetcher():
+            await asyncio.sleep(0.01)
+            return "new"
+
+        notified: list[tuple[str, bool]] = []
+
+        def listener():
+            result = cache.get("k")
+            notified.append((result.data, result.is_fetching))
+
+        cache.subscribe("k", listener)
+        cache.fetch("k", fetcher)
+        assert cache.get("k").data == "old"
+        assert not cache.get("k").is_loading
+        await asyncio.sleep(0.05)
+        assert notified == [("old", True), ("new", False)]
+
+    async def test_error_keeps_data(self):
+        cache = QueryCache()
+        cache.set_data("k", 1)
+
+        async def fetcher():
+            raise ValueError("fetch failed")
+
+        cache.fetch("k", fetcher)
+        await asyncio.sleep(0.01)
+        result = cache.get("k")
+        assert result.data == 1
+        assert isinstance(result.error, ValueError)
+        assert not result.is_fetching
+
+    async def test_invalidate_refetches_subscribed(self):
+        cache = QueryCache()
+        calls = 0
+
+        async def fetcher():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        cache.subscribe("k", lambda: None)
+        await cache.fetch("k", fetcher)
+        assert cache.get("k", stale_time=10.0).data == 1
+        updated_at = cache.get("k").updated_at
+        cache.invalidate()
+        result = cache.get("k", stale_time=10.0)
+        assert result.is_stale
+        assert result.is_fetching
+        # The stale data is shown while refetching, so this is not loading.
+        assert not result.is_loading
+        assert result.updated_at == updated_at
+        await asyncio.sleep(0.01)
+        assert cache.get("k", stale_time=10.0).data == 2
+        assert not cache.get("k", stale_time=10.0).is_stale
+
+    async def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2)
+        unsubscribe = cache.subscribe("a", lambda: None)
+        cache.set_data("a", 1)
+        cache.set_data("b", 2)
+        cache.set_data("c", 3)
+        # "a" has a listener so "b" is evicted instead.
+        assert cache.get("a").data == 1
+        assert cache.get("b").data is None
+        assert cache.get("c").data == 3
+        unsubscribe()
+        cache.set_data("d", 4)
+        assert cache.get("a").data is None
+
+    async def test_cache_time(self):
+        cache = QueryCache(cache_time=0.01)
+        unsubscribe = cache.subscribe("k", lambda: None)
+        cache.set_data("k", 1)
+        unsubscribe()
+        assert cache.get("k").data == 1
+        await asyncio.sleep(0.05)
+        assert cache.get("k").data is None
+
+    async def test_aclose(self):
+        cache = QueryCache()
+        cancelled = False
+
+        async def fetcher():
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(10.0)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        cache.fetch("k", fetcher)
+        await asyncio.sleep(0)
+        await cache.aclose()
+        assert cancelled
+        assert cache.get("k").data is None
+
+
+if __name__ == "__main__":
+    unittest.main()
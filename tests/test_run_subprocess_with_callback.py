@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import functools
+import mmap
 import multiprocessing
 import multiprocessing.connection
 import multiprocessing.queues
@@ -10,8 +12,20 @@ import os
 import time
 import typing
 import unittest
+import unittest.mock
+from multiprocessing import shared_memory
+from types import SimpleNamespace
 
-from edifice import run_subprocess_with_callback
+import numpy as np
+
+from edifice import SubprocessPool, iterate_subprocess, run_subprocess_with_callback
+from edifice.run_subprocess_with_callback import (
+    _PipeSender,
+    _shared_memory_config,
+    _SharedMemoryMessage,
+    _SharedMemoryReceiver,
+    _SharedMemorySender,
+)
 
 
 def callback_return(x: int) -> None:
@@ -99,10 +113,107 @@ def subprocess_async_cancel(callback: typing.Callable[[int], None]) -> str:
     return asyncio.new_event_loop().run_until_complete(work())
 
 
+def subprocess_timestamp(callback: typing.Callable[[float], None]) -> str:
+    callback(time.time())
+    time.sleep(0.5)
+    return "done"
+
+
+def subprocess_array(callback: typing.Callable[[np.ndarray], None]) -> np.ndarray:
+    callback(np.arange(1000, dtype=np.float64))
+    callback(np.arange(10, dtype=np.int32))
+    return np.ones((100, 100), dtype=np.float32)
+
+
+def subprocess_array_sleep(callback: typing.Callable[[np.ndarray], None]) -> str:
+    callback(np.zeros(1000))
+    # This array will never be received.
+    callback(np.zeros(1000))
+    time.sleep(10)
+    return "done"
+
+
+def subprocess_count(callback: typing.Callable[[int], None]) -> str:
+    for i in range(10000):
+        callback(i)
+    return "done"
+
+
+def subprocess_two_args(callback: typing.Callable[..., None]) -> str:
+    callback(1, 2)
+    return "done"
+
+
+def subprocess_unpicklable_callback(callback: typing.Callable[[typing.Any], None]) -> str:
+    try:
+        callback(lambda: None)
+    except Exception:  # noqa: BLE001
+        return "caught"
+    return "done"
+
+
+def subprocess_unpicklable_return(callback: typing.Callable[[int], None]) -> typing.Callable[[], None]:
+    return lambda: None
+
+
+def iterate_timestamps(send: typing.Callable[[float], None]) -> None:
+    for _ in range(20):
+        send(time.time())
+
+
+def iterate_forever(send: typing.Callable[[int], None]) -> None:
+    i = 0
+    while True:
+        send(i)
+        i += 1
+
+
+def iterate_throw(send: typing.Callable[[int], None]) -> None:
+    send(1)
+    raise ValueError("interrupt the subprocess")
+
+
+def subprocess_count_send(send: typing.Callable[[int], None]) -> None:
+    subprocess_count(send)
+
+
+def reduce_add(x: int, y: int) -> int:
+    return x + y
+
+
+_worker_state: list[str] = []
+
+
+def worker_initializer(value: str) -> None:
+    _worker_state.append(value)
+
+
+def subprocess_pid(callback: typing.Callable[[int], None]) -> tuple[int, list[str]]:
+    callback(os.getpid())
+    return os.getpid(), _worker_state
+
+
+def subprocess_sleep(callback: typing.Callable[[int], None]) -> str:
+    callback(1)
+    time.sleep(10)
+    return "done"
+
+
 class IntegrationTestCase(unittest.IsolatedAsyncioTestCase):
     async def test_success(self):
         assert "done" == await run_subprocess_with_callback(subprocess_return, callback_return)
 
+    async def test_latency(self):
+        latencies: list[float] = []
+
+        def callback_latency(sent: float) -> None:
+            latencies.append(time.time() - sent)
+
+        assert "done" == await run_subprocess_with_callback(subprocess_timestamp, callback_latency)
+        assert len(latencies) == 1
+        # Event-driven, not polled every 100ms.
+        assert latencies[0] < 0.05
+
     async def test_cancel(self):
         y_task = asyncio.create_task(run_subprocess_with_callback(subprocess_return, callback_return))
 
@@ -160,6 +271,24 @@ class IntegrationTestCase(unittest.IsolatedAsyncioTestCase):
         except:
             assert False
 
+    async def test_many_messages(self):
+        values: list[int] = []
+        assert "done" == await run_subprocess_with_callback(subprocess_count, values.append)
+        assert values == list(range(10000))
+
+    async def test_unpicklable_callback(self):
+        # Pickling errors raise in the subprocess when it calls the callback.
+        assert "caught" == await run_subprocess_with_callback(subprocess_unpicklable_callback, callback_return)
+
+    async def test_unpicklable_return(self):
+        try:
+            await run_subprocess_with_callback(subprocess_unpicklable_return, callback_return)
+            assert False
+        except multiprocessing.ProcessError:
+            assert False
+        except Exception:  # noqa: BLE001
+            assert True
+
     async def test_subprocess_async(self):
         await run_subprocess_with_callback(subprocess_async, callback_return)
         assert True
@@ -303,5 +432,237 @@ class IntegrationTestCase(unittest.IsolatedAsyncioTestCase):
             assert False
 
 
+def is_shared_memory(a: np.ndarray) -> bool:
+    base = a.base
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, memoryview) and isinstance(base.obj, mmap.mmap)
+
+
+class SharedMemoryTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_array(self):
+        arrays: list[np.ndarray] = []
+        result = await run_subprocess_with_callback(subprocess_array, arrays.append, shared_memory_min_bytes=1000)
+        assert np.array_equal(arrays[0], np.arange(1000, dtype=np.float64))
+        assert np.array_equal(arrays[1], np.arange(10, dtype=np.int32))
+        assert np.array_equal(result, np.ones((100, 100), dtype=np.float32))
+        # The large arrays are views of shared memory, the small array was pickled in-band.
+        assert is_shared_memory(arrays[0])
+        assert not is_shared_memory(arrays[1])
+        assert is_shared_memory(result)
+        result[0, 0] = 2.0
+
+    async def test_cancel_unlinks(self):
+        y = asyncio.create_task(
+            run_subprocess_with_callback(subprocess_array_sleep, lambda _: None, shared_memory_min_bytes=1000)
+        )
+        await asyncio.sleep(1.0)
+        y.cancel()
+        try:
+            await y
+            assert False
+        except asyncio.CancelledError:
+            assert True
+        if os.path.isdir("/dev/shm"):
+            assert not any(name.startswith("edf") for name in os.listdir("/dev/shm"))
+
+    def test_unlink_remaining(self):
+        config = _shared_memory_config(1000)
+        assert config is not None
+        sent: list[_SharedMemoryMessage] = []
+        sender = _SharedMemorySender(config, typing.cast(_PipeSender, SimpleNamespace(put=sent.append)))
+        sender.put(np.zeros(1000))
+        sender.put(np.zeros(1000))
+        receiver = _SharedMemoryReceiver(config)
+        assert np.array_equal(receiver.loads(sent[0]), np.zeros(1000))
+        receiver.unlink_remaining()
+        name, _ = sent[1].segments[0]
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_copy_fallback(self):
+        config = _shared_memory_config(1000)
+        assert config is not None
+        sent: list[_SharedMemoryMessage] = []
+        sender = _SharedMemorySender(config, typing.cast(_PipeSender, SimpleNamespace(put=sent.append)))
+        sender.put(np.arange(1000))
+        receiver = _SharedMemoryReceiver(config)
+        # Platforms other than Linux copy the segment out.
+        with unittest.mock.patch("sys.platform", "darwin"):
+            result = receiver.loads(sent[0])
+        assert np.array_equal(result, np.arange(1000))
+        assert not is_shared_memory(result)
+        name, _ = sent[0].segments[0]
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+        # The job ended normally, so there is nothing to probe for.
+        receiver.complete = True
+        receiver.unlink_remaining()
+
+    async def test_pool(self):
+        with SubprocessPool(max_workers=1) as pool:
+            arrays: list[np.ndarray] = []
+            result = await pool.run(subprocess_array, arrays.append, shared_memory_min_bytes=1000)
+            assert np.array_equal(result, np.ones((100, 100), dtype=np.float32))
+            assert len(arrays) == 2
+
+
+class DeliveryTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_latest(self):
+        values: list[int] = []
+        assert "done" == await run_subprocess_with_callback(subprocess_count, values.append, delivery="latest")
+        assert 0 < len(values) < 10000
+        assert values == sorted(values)
+        assert values[-1] == 9999
+
+    async def test_batch(self):
+        batches: list[list[int]] = []
+        assert "done" == await run_subprocess_with_callback(subprocess_count, batches.append, delivery="batch")
+        assert len(batches) < 10000
+        assert [i for batch in batches for i in batch] == list(range(10000))
+
+    async def test_reducer(self):
+        sums: list[int] = []
+        assert "done" == await run_subprocess_with_callback(subprocess_count, sums.append, delivery=reduce_add)
+        assert len(sums) < 10000
+        assert sum(sums) == sum(range(10000))
+
+    async def test_batch_arguments(self):
+        try:
+            await run_subprocess_with_callback(subprocess_two_args, callback_return, delivery="batch")
+            assert False
+        except TypeError:
+            assert True
+
+    async def test_pool(self):
+        with SubprocessPool(max_workers=1) as pool:
+            batches: list[list[int]] = []
+            assert "done" == await pool.run(subprocess_count, batches.append, delivery="batch")
+            assert [i for batch in batches for i in batch] == list(range(10000))
+
+
+class IterateSubprocessTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_iterate(self):
+        values = [i async for i in iterate_subprocess(subprocess_count_send)]
+        assert values == list(range(10000))
+
+    async def test_backpressure(self):
+        async with contextlib.aclosing(iterate_subprocess(iterate_timestamps, max_buffer=2)) as values:
+            sent = [await anext(values)]
+            start = time.time()
+            await asyncio.sleep(1.0)
+            sent.extend([t async for t in values])
+        assert len(sent) == 20
+        assert sent[0] < start
+        # The subprocess blocked while the buffer was full.
+        # The timestamp of the third value was taken before send() blocked.
+        assert all(t >= start + 1.0 for t in sent[3:])
+
+    async def test_break(self):
+        async with contextlib.aclosing(iterate_subprocess(iterate_forever)) as values:
+            async for i in values:
+                if i == 100:
+                    break
+        assert i == 100
+
+    async def test_throw(self):
+        values: list[int] = []
+        try:
+            async for i in iterate_subprocess(iterate_throw):
+                values.append(i)
+            assert False
+        except ValueError:
+            assert values == [1]
+
+
+class SubprocessPoolTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_reuse_worker(self):
+        with SubprocessPool(max_workers=1, initializer=worker_initializer, initargs=("init",)) as pool:
+            pids: list[int] = []
+            pid1, state1 = await pool.run(subprocess_pid, pids.append)
+            pid2, state2 = await pool.run(subprocess_pid, pids.append)
+            assert pid1 == pid2
+            assert pids == [pid1, pid2]
+            # The initializer ran once in the worker process.
+            assert state1 == ["init"]
+            assert state2 == ["init"]
+
+    async def test_concurrent(self):
+        with SubprocessPool(max_workers=2) as pool:
+            results = await asyncio.gather(*(pool.run(subprocess_pid, callback_return) for _ in range(4)))
+            assert len({pid for pid, _ in results}) <= 2
+
+    async def test_throw(self):
+        with SubprocessPool(max_workers=1) as pool:
+            pid1, _ = await pool.run(subprocess_pid, callback_return)
+            try:
+                await pool.run(subprocess_throw, callback_return)
+                assert False
+            except ValueError:
+                assert True
+            # The worker survives an exception in the job.
+            pid2, _ = await pool.run(subprocess_pid, callback_return)
+            assert pid1 == pid2
+
+    async def test_cancel_replaces_worker(self):
+        with SubprocessPool(max_workers=1) as pool:
+            pid1, _ = await pool.run(subprocess_pid, callback_return)
+            y = asyncio.create_task(pool.run(subprocess_sleep, callback_return))
+            await asyncio.sleep(0.5)
+            y.cancel()
+            try:
+                await y
+                assert False
+            except asyncio.CancelledError:
+                assert True
+            pid2, _ = await pool.run(subprocess_pid, callback_return)
+            assert pid1 != pid2
+
+    async def test_unpicklable_replaces_worker(self):
+        with SubprocessPool(max_workers=1) as pool:
+            pid1, _ = await pool.run(subprocess_pid, callback_return)
+            try:
+                await pool.run(lambda _: None, callback_return)
+                assert False
+            except Exception:  # noqa: BLE001
+                assert True
+            # Only a worker which completed its job cleanly is reused.
+            pid2, _ = await pool.run(subprocess_pid, callback_return)
+            assert pid1 != pid2
+
+    async def test_exit_replaces_worker(self):
+        with SubprocessPool(max_workers=1) as pool:
+            try:
+                await pool.run(subprocess_exit, lambda _: None)
+                assert False
+            except multiprocessing.ProcessError:
+                assert True
+            assert "done" == await pool.run(subprocess_return, callback_return)
+
+    async def test_shutdown(self):
+        pool = SubprocessPool(max_workers=1)
+        await pool.run(subprocess_return, callback_return)
+        pool.shutdown()
+        try:
+            await pool.run(subprocess_return, callback_return)
+            assert False
+        except RuntimeError:
+            assert True
+
+    async def test_shutdown_running(self):
+        pool = SubprocessPool(max_workers=1)
+        y = asyncio.create_task(pool.run(subprocess_sleep, callback_return))
+        await asyncio.sleep(0.5)
+        pool.shutdown()
+        try:
+            await y
+            assert False
+        except multiprocessing.ProcessError:
+            assert True
+        # The terminated worker is not returned to the idle workers.
+        assert pool._idle == []
+        assert pool._workers == []
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+import typing
+import unittest
+
+from edifice import CancelToken, run_thread_with_callback
+
+
+def thread_return(callback: typing.Callable[[int], None], cancel: CancelToken) -> str:
+    callback(1)
+    callback(2)
+    return "done"
+
+
+def thread_throw(callback: typing.Callable[[int], None], cancel: CancelToken) -> str:
+    callback(1)
+    raise ValueError("interrupt the thread")
+
+
+class IntegrationTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_success(self):
+        values: list[int] = []
+        assert "done" == await run_thread_with_callback(thread_return, values.append)
+        # All of the callbacks ran before the result.
+        assert values == [1, 2]
+
+    async def test_callback_thread(self):
+        threads: list[threading.Thread] = []
+        await run_thread_with_callback(thread_return, lambda _: threads.append(threading.current_thread()))
+        assert threads == [threading.current_thread(), threading.current_thread()]
+
+    async def test_throw(self):
+        try:
+            await run_thread_with_callback(thread_throw, lambda _: None)
+            assert False
+        except ValueError:
+            assert True
+
+    async def test_callback_throw(self):
+        def callback_throw(x: int) -> None:
+            raise ValueError("interrupt the callback")
+
+        assert "done" == await run_thread_with_callback(thread_return, callback_throw)
+
+    async def test_cancel(self):
+        values: list[int] = []
+        cancelled = threading.Event()
+
+        def thread_cancel(callback: typing.Callable[[int], None], cancel: CancelToken) -> str:
+            i = 0
+            while not cancel.wait(0.01):
+                callback(i)
+                i += 1
+            cancelled.set()
+            return "cancelled"
+
+        y = asyncio.create_task(run_thread_with_callback(thread_cancel, values.append))
+        await asyncio.sleep(0.2)
+        y.cancel()
+        try:
+            await y
+            assert False
+        except asyncio.CancelledError:
+            assert True
+        # The thread sees the cancelled CancelToken.
+        assert await asyncio.to_thread(cancelled.wait, 1.0)
+        count = len(values)
+        assert count > 0
+        # No more callbacks after cancellation.
+        await asyncio.sleep(0.1)
+        assert len(values) == count
+
+    async def test_executor(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="test_executor") as executor:
+            name = await run_thread_with_callback(
+                lambda callback, cancel: threading.current_thread().name,
+                lambda: None,
+                executor,
+            )
+        assert name.startswith("test_executor")
+
+    async def test_raise_if_cancelled(self):
+        token = CancelToken()
+        token.raise_if_cancelled()
+        token.cancel()
+        assert token.cancelled
+        with self.assertRaises(asyncio.CancelledError):
+            token.raise_if_cancelled()
+        start = time.monotonic()
+        assert token.wait(10.0)
+        assert time.monotonic() - start < 1.0
+
+
+if __name__ == "__main__":
+    unittest.main()
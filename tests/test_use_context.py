@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 
 import edifice as ed
@@ -11,6 +12,54 @@ else:
 if QtWidgets.QApplication.instance() is None:
     app_obj = QtWidgets.QApplication(["-platform", "offscreen"])
 
+class ContextSelectTestCase(unittest.TestCase):
+    def test_use_context_select_batch(self):
+        """
+        Test that many context updates between renders evaluate each
+        selector once, and only re-render the components whose selected
+        value changed.
+        """
+
+        count = 200
+        renders: dict[int, int] = {}
+        selects: dict[int, int] = {}
+
+        @ed.component
+        def Item(self, i: int):
+            def selector(value: tuple[int, ...]) -> int:
+                selects[i] = selects.get(i, 0) + 1
+                return value[i]
+
+            selected = ed.use_context_select("items", selector)
+            renders[i] = renders.get(i, 0) + 1
+            ed.Label(text=str(selected))
+
+        @ed.component
+        def Wrapper(self):
+            _, items_set = ed.provide_context("items", (0,) * count)
+
+            async def update():
+                await asyncio.sleep(0.05)
+                for x in range(1, 11):
+                    items_set(lambda v, x=x: (x, *v[1:]))
+
+            ed.use_async(update, ())
+            with ed.Window():
+                with ed.VBoxView():
+                    for i in range(count):
+                        Item(i)
+
+        my_app = ed.App(Wrapper(), create_application=False)
+        with my_app.start_loop() as loop:
+            loop.call_later(0.3, my_app.stop)
+
+        # Only Item 0 re-rendered.
+        self.assertGreater(renders[0], 1)
+        self.assertEqual(sum(renders[i] for i in range(1, count)), count - 1)
+        # Ten updates, one selector evaluation before the render.
+        self.assertEqual(selects[1], 2)
+
+
 class IntegrationTestCase(unittest.TestCase):
     def test_use_context1(self):
         @ed.component